@@ -0,0 +1,96 @@
+import gc
+import math
+import os
+import sys
+import time
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src import ir
+from compiler.src.code_generator import CodeGenerator
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler, CompileResult
+from program_generator import ProgramGenerator
+
+# python Testcases/benchmark_codegen.py [RUNS]
+RUNS = 3
+if len(sys.argv) > 1:
+    RUNS = int(sys.argv[1])
+SIZES = [12500, 25000, 50000, 100000]
+# the code generation fails if its growth exponent exceeds this (linear is 1.0)
+MAX_EXPONENT = 1.25
+
+# the statements of a generated function are repeated to get programs of any size
+# (without parsing them, which would dominate the runtime)
+result = CompileResult()
+program = Compiler().front_end(ProgramGenerator(functions=1, statements=100).generate(),
+                               result, CompileStats(None, 'benchmark'))
+function, main_function = program.functions
+statements = function.body[:-1]
+
+
+def count_statements(body: list[ir.Node]) -> int:
+    count = 0
+    for statement in body:
+        count += 1
+        if isinstance(statement, ir.Block):
+            count += count_statements(statement.body)
+        elif isinstance(statement, ir.If):
+            count += count_statements(statement.then_body)
+            count += count_statements(statement.else_body or [])
+        elif isinstance(statement, ir.While):
+            count += count_statements(statement.body)
+    return count
+
+
+def scaled_program(size: int) -> tuple[int, ir.Program]:
+    copies = max(1, size // count_statements(statements))
+    body = statements * copies + function.body[-1:]
+    return count_statements(body), ir.Program([ir.Function(
+        function.symbol, body, function.has_return, function.locals_size, function.calls,
+        function.source, function.line, function.column), main_function])
+
+
+def measure(scaled: ir.Program) -> tuple[int, float]:
+    # the fastest run is the least disturbed one
+    best = math.inf
+    for _ in range(RUNS):
+        gc.collect()
+        start = time.perf_counter()
+        code_generator = CodeGenerator(result.symbol_table, 'Main', False)
+        code_generator.visit(scaled)
+        code = code_generator.code
+        best = min(best, time.perf_counter() - start)
+    return len(code), best
+
+
+def growth_exponent(sizes: list, times: list) -> float:
+    # slope of the least squares fit in the log-log plot: time ~ size ** exponent
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(time, 1e-7)) for time in times]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x-x_mean) * (y-y_mean) for x, y in zip(xs, ys)) / \
+        sum((x-x_mean) ** 2 for x in xs)
+
+
+print(f"{'statements':>10} {'characters':>12} {'time (ms)':>10} {'us/statement':>13}")
+sizes, times = [], []
+for size in SIZES:
+    statement_count, scaled = scaled_program(size)
+    characters, duration = measure(scaled)
+    sizes.append(statement_count)
+    times.append(duration)
+    print(f"{statement_count:>10} {characters:>12} {duration*1000:>10.1f} " + \
+        f"{duration/statement_count*1e6:>13.2f}")
+exponent = growth_exponent(sizes, times)
+print(f"growth exponent: {exponent:.2f}")
+
+print('-' * 40)
+if exponent > MAX_EXPONENT:
+    print(f"Code generation is not linear (exponent {exponent:.2f} > {MAX_EXPONENT}).")
+    sys.exit(1)
+print('All tests successfull.')
@@ -0,0 +1,68 @@
+import gc
+import os
+import sys
+import time
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+sys.path.insert(0, package_dir)
+
+from antlr4 import InputStream
+from compiler.src.CoBaLexer import CoBaLexer
+from compiler.src.regex_lexer import RegexLexer
+from program_generator import ProgramGenerator
+
+# python Testcases/benchmark_lexer.py [RUNS]
+RUNS = 5
+if len(sys.argv) > 1:
+    RUNS = int(sys.argv[1])
+
+corpus = ''
+for file in sorted(os.listdir(pos_path)):
+    if file[-3:] == '.jl':
+        with open(os.path.join(pos_path, file), 'r', encoding='utf-8') as f:
+            corpus += f.read()
+SOURCES = {
+    'corpus (pos)': corpus,
+    'generated (small)': ProgramGenerator(functions=8, statements=32).generate(),
+    'generated (large)': ProgramGenerator(functions=64, statements=128, expression_depth=2).generate(),
+}
+
+
+def lex_antlr(source: str) -> int:
+    lexer = CoBaLexer(InputStream(source))
+    return len(lexer.getAllTokens())
+
+
+def lex_regex(source: str) -> int:
+    lexer = RegexLexer(source)
+    tokens = 0
+    while lexer.nextToken().type != -1:
+        tokens += 1
+    return tokens
+
+
+def measure(lex, source: str) -> tuple[int, float]:
+    # the fastest run is the least disturbed one (the first run warms up the DFA)
+    lex(source)
+    best = float('inf')
+    for _ in range(RUNS):
+        gc.collect()
+        start = time.perf_counter()
+        tokens = lex(source)
+        best = min(best, time.perf_counter() - start)
+    return tokens, best
+
+
+print(f"{'source':<20} {'tokens':>8} {'antlr tokens/s':>16} {'regex tokens/s':>16} {'speedup':>8}")
+for name, source in SOURCES.items():
+    antlr_tokens, antlr_time = measure(lex_antlr, source)
+    regex_tokens, regex_time = measure(lex_regex, source)
+    if antlr_tokens != regex_tokens:
+        print(f"{name}: different number of tokens ({antlr_tokens} != {regex_tokens})")
+        sys.exit(1)
+    print(f"{name:<20} {antlr_tokens:>8} {antlr_tokens/antlr_time:>16,.0f} " + \
+        f"{regex_tokens/regex_time:>16,.0f} {antlr_time/regex_time:>7.1f}x")
@@ -0,0 +1,57 @@
+import gc
+import os
+import sys
+import tracemalloc
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler, CompileResult
+from program_generator import ProgramGenerator
+
+# python Testcases/benchmark_memory.py [FUNCTIONS]
+FUNCTIONS = 16
+if len(sys.argv) > 1:
+    FUNCTIONS = int(sys.argv[1])
+
+source = ProgramGenerator(functions=FUNCTIONS, statements=128, expression_depth=2).generate()
+compiler = Compiler()
+# warm up (the ATN/DFA of the Lexer/Parser is shared by all compilations)
+compiler.compile_source(source)
+
+
+def mib(size: int) -> str:
+    return f"{size / 1024 / 1024:8.1f} MiB"
+
+
+def traced(function, *args):
+    # the peak and the retained (allocated and not yet freed) memory of a call
+    gc.collect()
+    tracemalloc.start()
+    value = function(*args)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, retained, peak
+
+
+print(f"source: {len(source)} characters, {source.count(chr(10))} lines")
+for mode, compile_function in [('compile', compiler.compile_source),
+                               ('liveness', compiler.liveness_source)]:
+    _, _, peak = traced(compile_function, source)
+    print(f"{mode + ' (peak)':<24} {mib(peak)}")
+
+# the memory held by the parse tree (and tokens) and by the IR
+result = CompileResult()
+stats = CompileStats(None, 'memory')
+tree, tree_size, _ = traced(compiler.check_source, source, result, stats)
+program, ir_size, _ = traced(compiler.lower, tree, result, stats)
+del tree
+compiler.release()
+gc.collect()
+print(f"{'parse tree (retained)':<24} {mib(tree_size)}")
+print(f"{'IR (retained)':<24} {mib(ir_size)}")
@@ -0,0 +1,110 @@
+import gc
+import json
+import math
+import os
+import sys
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+baseline_file = os.path.join(script_dir, 'benchmark_phases.json')
+sys.path.insert(0, package_dir)
+sys.setrecursionlimit(10000)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler
+from program_generator import ProgramGenerator
+
+# python Testcases/benchmark_phases.py [-update] [RUNS]
+UPDATE = '-update' in sys.argv
+RUNS = 5
+if len(sys.argv) > 1 and sys.argv[-1] != '-update':
+    RUNS = int(sys.argv[-1])
+# a phase fails if its growth exponent exceeds the baseline by more than this
+TOLERANCE = 0.35
+
+PHASES = ['lexing', 'parsing', 'semantic_analysis', 'lowering', 'code_generation', 'liveness_cfg',
+          'liveness_interference', 'liveness_coloring']
+# every series grows a single knob of the generator (the other knobs are fixed)
+SERIES = {
+    'functions': ('functions', [4, 8, 16, 32], {'statements': 16}),
+    'statements': ('statements', [50, 100, 200, 400], {'functions': 1}),
+    'expression_length': ('expression_length', [2, 4, 8, 16], {'functions': 1,
+                                                                'statements': 20}),
+    'expression_depth': ('expression_depth', [4, 8, 16, 32], {'functions': 1, 'statements': 20,
+                                                              'expression_length': 1}),
+    'nesting': ('nesting', [4, 8, 16, 32], {'functions': 1, 'statements': 16}),
+    'variables': ('variables', [8, 16, 32, 64], {'functions': 1, 'statements': 40}),
+}
+
+compiler = Compiler()
+
+
+def measure(source: str) -> tuple[int, dict]:
+    # the fastest of all runs (per phase) is the least disturbed one
+    times = {}
+    for _ in range(RUNS):
+        gc.collect()
+        stats = CompileStats(None, 'benchmark')
+        if compiler.compile_source(source, 'Main', stats).exit_code != 0:
+            raise ValueError('generated program does not compile.')
+        liveness_stats = CompileStats(None, 'liveness')
+        compiler.liveness_source(source, liveness_stats)
+        for phase in PHASES:
+            phase_stats = stats.phases.get(phase) or liveness_stats.phases[phase]
+            times[phase] = min(times.get(phase, math.inf), phase_stats['wall'])
+    return stats.counters['tokens'], times
+
+
+def growth_exponent(sizes: list, times: list) -> float:
+    # slope of the least squares fit in the log-log plot: time ~ size ** exponent
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(time, 1e-7)) for time in times]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x-x_mean) * (y-y_mean) for x, y in zip(xs, ys)) / \
+        sum((x-x_mean) ** 2 for x in xs)
+
+
+baseline = {}
+if os.path.isfile(baseline_file):
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+exponents = {}
+failed = []
+
+for series, (knob, values, fixed) in SERIES.items():
+    print(f"\n{series} (time in ms, growth exponent relative to {knob}):")
+    print(f"{knob:>18} {'tokens':>8}" + ''.join(f" {phase[:12]:>12}" for phase in PHASES))
+    curves = {phase: [] for phase in PHASES}
+    for value in values:
+        source = ProgramGenerator(**fixed, **{knob: value}).generate()
+        tokens, times = measure(source)
+        for phase in PHASES:
+            curves[phase].append(times[phase])
+        print(f"{value:>18} {tokens:>8}" + \
+            ''.join(f" {times[phase]*1000:>12.2f}" for phase in PHASES))
+    exponents[series] = {phase: round(growth_exponent(values, curves[phase]), 2)
+                         for phase in PHASES}
+    print(f"{'exponent':>18} {'':>8}" + ''.join(f" {exponents[series][phase]:>12.2f}"
+                                                for phase in PHASES))
+    for phase in PHASES:
+        expected = baseline.get(series, {}).get(phase)
+        if not UPDATE and expected is not None and \
+            exponents[series][phase] > expected + TOLERANCE:
+            failed.append(f"{series}/{phase}")
+            print(f"{series}/{phase}: FAILED (exponent {exponents[series][phase]:.2f}, " + \
+                f"baseline {expected:.2f})")
+
+if UPDATE:
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        json.dump(exponents, f, indent=4)
+        f.write('\n')
+    print('\nBaseline updated:', baseline_file)
+
+print('-' * 40)
+if failed:
+    print('Regressed phases:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
@@ -0,0 +1,64 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+
+CMD_compiler = [sys.executable, '-m', 'compiler']
+RUNS = 10
+if len(sys.argv) > 1:
+    RUNS = int(sys.argv[1])
+
+# the empty program measures the startup (and not the compilation itself),
+# the largest program shows the effect of the persisted parser state
+EMPTY_PROGRAM = 'function main()\nend\nmain()\n'
+pos_files = [os.path.join(pos_path, file) for file in os.listdir(pos_path) if file[-3:] == '.jl']
+
+
+def measure(desc: str, args: list, env: dict, before_run=None) -> None:
+    times = []
+    for _ in range(RUNS):
+        if before_run is not None:
+            before_run()
+        start = time.perf_counter()
+        subprocess.run(CMD_compiler + args, cwd=package_dir, env=env,
+                       capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    print(f"{desc:<40} median {statistics.median(times)*1000:8.1f} ms" + \
+        f"   min {min(times)*1000:8.1f} ms")
+
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    # use an isolated (empty) compile cache
+    env = dict(os.environ, HOME=tmp_dir)
+    cache_dir = os.path.join(tmp_dir, '.cache', 'coba_compiler')
+    out_file = os.path.join(tmp_dir, 'out.j')
+    empty_file = os.path.join(tmp_dir, 'empty.jl')
+    with open(empty_file, 'w', encoding='utf-8') as f:
+        f.write(EMPTY_PROGRAM)
+    in_files = [empty_file, max(pos_files, key=os.path.getsize)]
+
+    def clear_results():
+        # keep the parser state, but remove all cached compile results
+        for file in os.listdir(cache_dir):
+            if file[-5:] == '.json':
+                os.remove(os.path.join(cache_dir, file))
+
+    print(f"Startup benchmark ({RUNS} runs)")
+    measure('-h', ['-h'], env)
+    for in_file in in_files:
+        print(in_file)
+        measure('-compile -no-cache', ['-compile', in_file, '-output', out_file, '-no-cache'], env)
+        # the first run creates the parser state
+        subprocess.run(CMD_compiler + ['-compile', in_file, '-output', out_file],
+                       cwd=package_dir, env=env, capture_output=True, check=True)
+        measure('-compile (parser state)', ['-compile', in_file, '-output', out_file],
+                env, clear_results)
+        measure('-compile (cached result)', ['-compile', in_file, '-output', out_file], env)
@@ -0,0 +1,14 @@
+function main()
+    x::Float64 = 0.1
+    # escape sequences inside of string constants
+    println("tab:\t|newline:\n|quote:\'|backslash:\\|octal:\101\60\7|unicode:éA")
+    println("non ascii: é ∑ 😀")
+    # float constants are stored with single precision (if possible)
+    println(x)
+    println(1.5 + 0.25)
+    println(340282356779733661637539395458142568448.0)
+    # integer constants are truncated to 32 bit
+    println(2147483647)
+    println(2147483648 + 1)
+end
+main()
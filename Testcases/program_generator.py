@@ -0,0 +1,125 @@
+import random
+import sys
+
+
+
+class ProgramGenerator:
+    """
+    generate valid (and terminating) CoBa programs of arbitrary size.
+    functions: number of functions (besides main)
+    statements: number of simple statements per function
+    expression_depth: nesting depth of parenthesized expressions
+    expression_length: number of operands per expression (level)
+    nesting: nesting depth of while/if structures
+    variables: number of variables per function, all of them are live until the end
+    """
+    def __init__(self, functions: int = 4, statements: int = 16, expression_depth: int = 1,
+                 expression_length: int = 3, nesting: int = 2, variables: int = 4,
+                 seed: int = 0) -> None:
+        self.functions: int = functions
+        self.statements: int = statements
+        self.expression_depth: int = expression_depth
+        self.expression_length: int = max(1, expression_length)
+        self.nesting: int = nesting
+        self.variables: int = max(1, variables)
+        self.random: random.Random = random.Random(seed)
+        self.lines: list[str] = []
+        # the functions callable from the current function
+        # (only main calls functions, so that the runtime stays linear)
+        self.callable: int = 0
+
+    def emit(self, level: int, line: str) -> None:
+        self.lines.append('    ' * level + line)
+
+    def operand(self) -> str:
+        choice: float = self.random.random()
+        if choice < 0.05 and self.callable > 0:
+            return f"f{self.random.randrange(self.callable)}({self.operand()}, " + \
+                f"{self.random.randrange(100)})"
+        if choice < 0.6:
+            return f"v{self.random.randrange(self.variables)}"
+        return str(self.random.randrange(1, 100))
+
+    def int_expression(self, depth: int) -> str:
+        operands: list[str] = []
+        for _ in range(self.expression_length):
+            if depth > 0:
+                operands.append(f"({self.int_expression(depth-1)})")
+            else:
+                operands.append(self.operand())
+        expression: str = operands[0]
+        for operand in operands[1:]:
+            operator: str = self.random.choice(['+', '-', '*', '%'])
+            # never divide by zero
+            if operator == '%':
+                operand = str(self.random.randrange(1, 100))
+            expression += f" {operator} {operand}"
+        return expression
+
+    def bool_expression(self) -> str:
+        comparison: str = self.random.choice(['<', '>', '<=', '>=', '==', '!='])
+        expression: str = f"{self.int_expression(self.expression_depth)} {comparison} " + \
+            f"{self.operand()}"
+        if self.random.random() < 0.3:
+            expression = f"{expression} && !(v0 == {self.random.randrange(100)})"
+        return expression
+
+    def simple_statement(self, level: int) -> None:
+        if self.random.random() < 0.2:
+            self.emit(level, f"println({self.int_expression(self.expression_depth)})")
+        else:
+            self.emit(level, f"v{self.random.randrange(self.variables)} = " + \
+                f"{self.int_expression(self.expression_depth)}")
+
+    def block(self, indent: int, depth: int, statements: int) -> None:
+        # the first structure of every block reaches the maximum nesting depth
+        if depth < self.nesting and statements > 0:
+            inner: int = max(1, statements // 2)
+            if depth % 2 == 0:
+                # every loop has its own counter, so that it terminates
+                self.emit(indent, f"i{depth} = 0")
+                self.emit(indent, f"while i{depth} < 2")
+                self.block(indent+1, depth+1, inner)
+                self.emit(indent+1, f"i{depth} = i{depth} + 1")
+                self.emit(indent, 'end')
+            else:
+                self.emit(indent, f"if {self.bool_expression()}")
+                self.block(indent+1, depth+1, inner)
+                self.emit(indent, 'else')
+                self.simple_statement(indent+1)
+                self.emit(indent, 'end')
+            statements -= inner
+        for _ in range(statements):
+            self.simple_statement(indent)
+
+    def function_body(self, first_value: str) -> None:
+        self.emit(1, f"v0::Integer = {first_value}")
+        for variable in range(1, self.variables):
+            self.emit(1, f"v{variable}::Integer = {self.random.randrange(100)}")
+        for depth in range(0, self.nesting, 2):
+            self.emit(1, f"i{depth}::Integer = 0")
+        self.block(1, 0, self.statements)
+
+    def generate(self) -> str:
+        self.lines = []
+        self.callable = 0
+        for function in range(self.functions):
+            self.emit(0, f"function f{function}(a::Integer, b::Integer)::Integer")
+            self.function_body('a + b')
+            self.emit(1, 'return ' + ' + '.join(f"v{v}" for v in range(self.variables)))
+            self.emit(0, 'end')
+            self.emit(0, '')
+        self.callable = self.functions
+        self.emit(0, 'function main()')
+        self.function_body(str(self.random.randrange(100)))
+        self.emit(1, 'println(' + ' + '.join(f"v{v}" for v in range(self.variables)) + ')')
+        self.emit(0, 'end')
+        self.emit(0, '')
+        self.emit(0, 'main()')
+        return '\n'.join(self.lines) + '\n'
+
+
+if __name__ == '__main__':
+    # python Testcases/program_generator.py [functions statements expression_depth
+    #                                       expression_length nesting variables seed]
+    print(ProgramGenerator(*map(int, sys.argv[1:])).generate(), end='')
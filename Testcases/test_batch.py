@@ -0,0 +1,69 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+
+CMD_compile = [sys.executable, '-m', 'compiler', '-compile']
+failed = []
+
+
+def batch(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(CMD_compile + [*args, '-batch', '-jobs', '2', '-no-cache'],
+                          cwd=package_dir, capture_output=True, text=True, check=False)
+
+
+def check(name: str, condition: bool) -> None:
+    if not condition:
+        failed.append(name)
+        print(f"{name}: FAILED")
+
+
+print('Testing', pos_path)
+with tempfile.TemporaryDirectory() as tmp_dir:
+    in_dir = os.path.join(tmp_dir, 'src')
+    out_dir = os.path.join(tmp_dir, 'out')
+    shutil.copytree(pos_path, in_dir, ignore=shutil.ignore_patterns('*.j'))
+    files = sorted(file[:-3] for file in os.listdir(in_dir) if file[-3:] == '.jl')
+
+    # every file is compiled into the output directory (like a single compilation)
+    sub = batch(in_dir, '-output', out_dir)
+    check('batch', sub.returncode == 0 and
+          f"Files: {len(files)}, Successful: {len(files)}, Failed: 0" in sub.stdout)
+    for file in files:
+        j_file = os.path.join(tmp_dir, file + '.j')
+        subprocess.run(CMD_compile + [os.path.join(in_dir, file + '.jl'), '-output', j_file,
+                                      '-no-cache'], cwd=package_dir, capture_output=True,
+                       check=False)
+        with open(j_file, 'rb') as f_expected, \
+            open(os.path.join(out_dir, file + '.j'), 'rb') as f_batch:
+            check(file + '.j', f_expected.read() == f_batch.read())
+
+    # files with the same name would overwrite each other in the output directory
+    dup_dir = os.path.join(tmp_dir, 'dup')
+    for sub_dir in ['a', 'b']:
+        os.makedirs(os.path.join(dup_dir, sub_dir))
+        shutil.copy(os.path.join(in_dir, files[0] + '.jl'),
+                    os.path.join(dup_dir, sub_dir, 't.jl'))
+    dup_out_dir = os.path.join(tmp_dir, 'dup_out')
+    sub = batch(dup_dir, '-output', dup_out_dir)
+    check('duplicate names', sub.returncode != 0 and 'Duplicate output file' in sub.stderr and
+          not os.path.exists(dup_out_dir))
+    # (next to their input files the names do not collide)
+    sub = batch(dup_dir)
+    check('duplicate names (no output directory)', sub.returncode == 0 and
+          'Files: 2, Successful: 2, Failed: 0' in sub.stdout and
+          all(os.path.isfile(os.path.join(dup_dir, sub_dir, 't.j')) for sub_dir in ['a', 'b']))
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
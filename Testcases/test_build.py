@@ -0,0 +1,88 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+
+CMD_compile = [sys.executable, '-m', 'compiler', '-compile']
+failed = []
+
+
+def build(in_dir: str, out_dir: str) -> str:
+    sub = subprocess.run(CMD_compile + [in_dir, '-build', '-output', out_dir, '-no-cache'],
+                         cwd=package_dir, capture_output=True, text=True, check=False)
+    if sub.returncode != 0:
+        failed.append(f"build ({sub.returncode})")
+        print(sub.stdout, sub.stderr)
+    return sub.stdout
+
+
+def mtimes(out_dir: str) -> dict:
+    return {file: os.stat(os.path.join(out_dir, file)).st_mtime_ns
+            for file in os.listdir(out_dir)}
+
+
+def check(name: str, condition: bool) -> None:
+    if not condition:
+        failed.append(name)
+        print(f"{name}: FAILED")
+
+
+print('Testing', pos_path)
+with tempfile.TemporaryDirectory() as tmp_dir:
+    in_dir = os.path.join(tmp_dir, 'src')
+    out_dir = os.path.join(tmp_dir, 'build')
+    shutil.copytree(pos_path, in_dir, ignore=shutil.ignore_patterns('*.j'))
+    files = sorted(file[:-3] for file in os.listdir(in_dir) if file[-3:] == '.jl')
+
+    # the first build compiles and assembles every file
+    out = build(in_dir, out_dir)
+    check('first build', f"Compiled: {len(files)}, Assembled: {len(files)}," in out)
+    for file in files:
+        j_file = os.path.join(tmp_dir, file + '.j')
+        subprocess.run(CMD_compile + [os.path.join(in_dir, file + '.jl'), '-output', j_file,
+                                      '-no-cache'], cwd=package_dir, capture_output=True,
+                       check=False)
+        with open(j_file, 'rb') as f_expected, \
+            open(os.path.join(out_dir, file + '.j'), 'rb') as f_build:
+            check(file + '.j', f_expected.read() == f_build.read())
+        check(file + '.class', os.path.isfile(os.path.join(out_dir, file + '.class')))
+    first_build = mtimes(out_dir)
+
+    # nothing changed -> nothing is written
+    out = build(in_dir, out_dir)
+    check('second build', f"Up to date: {len(files)}, Compiled: 0, Assembled: 0," in out)
+    check('second build (mtime)', first_build == mtimes(out_dir))
+
+    # a new comment changes the source, but not the generated code
+    with open(os.path.join(in_dir, files[0] + '.jl'), 'a', encoding='utf-8') as f:
+        f.write('# comment\n')
+    out = build(in_dir, out_dir)
+    check('comment build', 'Compiled: 1, Assembled: 0,' in out)
+    check('comment build (mtime)', {file: mtime for file, mtime in first_build.items()
+                                    if file != '.coba_build.json'} == \
+        {file: mtime for file, mtime in mtimes(out_dir).items() if file != '.coba_build.json'})
+
+    # a changed program is compiled and assembled again (on its own)
+    with open(os.path.join(in_dir, files[0] + '.jl'), 'r+', encoding='utf-8') as f:
+        source = f.read()
+        f.seek(0)
+        f.write('function unused()\nend\n' + source)
+    out = build(in_dir, out_dir)
+    check('changed build', 'Compiled: 1, Assembled: 1,' in out)
+    changed = {file for file, mtime in mtimes(out_dir).items() if first_build[file] != mtime}
+    check('changed build (mtime)', changed == {files[0] + '.j', files[0] + '.class',
+                                               '.coba_build.json'})
+
+print('-' * (len(pos_path)+8))
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
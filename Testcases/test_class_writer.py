@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+pos_files = sorted(os.listdir(pos_path))
+
+CMD_compile = [sys.executable, '-m', 'compiler', '-compile']
+CMD_jasmin = ['java', '-jar', os.path.join(package_dir, 'jasmin.jar')]
+# some programs never terminate (or overflow the stack)
+TIMEOUT = 4
+failed = []
+
+
+def run_class(class_dir: str, class_name: str) -> tuple:
+    try:
+        sub = subprocess.run(['java', '-Xss512k', '-cp', class_dir, class_name],
+                             capture_output=True, check=False, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired as timeout:
+        return 'timeout', timeout.stdout or b'', b''
+    # the first line of stderr names the exception (stack traces differ in the source file)
+    return sub.returncode, sub.stdout, sub.stderr.split(b'\n', 1)[0]
+
+
+def same_behaviour(run_a: tuple, run_b: tuple) -> bool:
+    if run_a[0] == 0:
+        return run_a == run_b
+    # aborted programs (e.g. StackOverflowError, timeout) only need to agree
+    # on the output both of them managed to print
+    common = min(len(run_a[1]), len(run_b[1]))
+    return (run_a[0], run_a[2], run_a[1][:common]) == (run_b[0], run_b[2], run_b[1][:common])
+
+
+# the class files written by the compiler must behave exactly like the class files
+# assembled by Jasmin
+print('Testing', pos_path)
+with tempfile.TemporaryDirectory() as tmp_dir:
+    jasmin_dir = os.path.join(tmp_dir, 'jasmin')
+    class_dir = os.path.join(tmp_dir, 'classfile')
+    os.makedirs(jasmin_dir)
+    os.makedirs(class_dir)
+    for file in pos_files:
+        if file[-3:] != '.jl':
+            continue
+        f_file = os.path.join(pos_path, file)
+        j_file = os.path.join(jasmin_dir, file[:-3] + '.j')
+        subprocess.run(CMD_compile + [f_file, '-output', j_file, '-no-cache'],
+                       cwd=package_dir, capture_output=True, check=True)
+        subprocess.run(CMD_jasmin + ['-d', jasmin_dir, j_file],
+                       cwd=package_dir, capture_output=True, check=True)
+        subprocess.run(CMD_compile + [f_file, '-output',
+                                      os.path.join(class_dir, file[:-3] + '.class'),
+                                      '-classfile', '-no-cache'],
+                       cwd=package_dir, capture_output=True, check=True)
+        if not same_behaviour(run_class(jasmin_dir, file[:-3]), run_class(class_dir, file[:-3])):
+            failed.append(file)
+            print(f"{file}: FAILED")
+
+print('-' * (len(pos_path)+8))
+if failed:
+    print('Failed files in pos:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
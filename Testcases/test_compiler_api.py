@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+neg_path = os.path.abspath(os.path.join(script_dir, 'neg'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compiler import Compiler
+
+CMD_compile = [sys.executable, '-m', 'compiler', '-compile']
+excepthook = sys.excepthook
+compiler = Compiler()
+failed = []
+
+# the in-memory compiler must behave exactly like the cli (output, errors and exit codes)
+with tempfile.TemporaryDirectory() as tmp_dir:
+    for kind_path in [pos_path, neg_path]:
+        print('Testing', kind_path)
+        for file in sorted(os.listdir(kind_path)):
+            if file[-3:] != '.jl':
+                continue
+            f_file = os.path.join(kind_path, file)
+            out_file = os.path.join(tmp_dir, file[:-3] + '.j')
+            sub = subprocess.run(CMD_compile + [f_file, '-output', out_file, '-no-cache'],
+                                 cwd=package_dir, capture_output=True, text=True, check=False)
+            ll_fallbacks = compiler.ll_fallbacks
+            with open(f_file, 'rb') as f:
+                result = compiler.compile_source(f.read(), file[:-3])
+            # only programs with syntax errors need to be parsed twice (SLL, then LL)
+            if (compiler.ll_fallbacks > ll_fallbacks) != (result.exit_code == 1):
+                failed.append(file + ' (SLL)')
+                print(f"{file}: FAILED (SLL/LL fallback)")
+            expected_code = None
+            if sub.returncode == 0:
+                with open(out_file, 'r', encoding='utf-8') as f:
+                    expected_code = f.read()
+            diagnostics = ''.join(f"{diagnostic}\n" for diagnostic in result.diagnostics)
+            if (result.exit_code, result.code, diagnostics) != \
+                (sub.returncode, expected_code, sub.stderr):
+                failed.append(file)
+                print(f"{file}: FAILED ({result.exit_code} != {sub.returncode})")
+
+if sys.excepthook is not excepthook:
+    failed.append('sys.excepthook')
+    print('sys.excepthook: FAILED')
+
+# throughput of the reused Lexer/Parser
+with open(os.path.join(pos_path, 'test01.jl'), 'r', encoding='utf-8') as f:
+    source = f.read()
+runs = 1000
+start = time.perf_counter()
+for _ in range(runs):
+    compiler.compile_source(source)
+print(f"\n{runs / (time.perf_counter() - start):.0f} compilations per second ({os.path.basename(f.name)})")
+
+print('-' * (len(pos_path)+8))
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
@@ -0,0 +1,107 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compiler import Compiler
+
+# t(x) prints x, so the output shows which operands are evaluated
+SOURCE = '''function t(x::Integer)::Bool
+    println(x)
+    return x > 1
+end
+function main()
+    a::Integer = 0
+    b::Float64 = 0.0 / 0.0
+    c::Bool = t(1) && t(2)
+    println(c)
+    println(t(3) || t(4))
+    println(!(t(0) || t(5)) && t(6))
+    if t(2) && (b < 1.0 || !(b >= 1.0))
+        println("nan")
+    end
+    if !(b == b)
+        println("not equal")
+    end
+    while a < 3 && t(a)
+        a = a + 1
+    end
+    while !(a > 10) || false
+        a = a + 4
+    end
+    println(a)
+    if a > 0 && false && t(7)
+        println("no")
+    end
+    if a < 0 || true || t(8)
+        println("yes")
+    end
+    println(t(9) && true)
+    println("x" == "x" && "x" != "y")
+end
+main()
+'''
+# a Bool value, that is only computed to be tested right away
+MATERIALISED_TEST = re.compile(r'\ticonst_1\nlabel_\d+_end:\n\tif')
+EXPECTED = '1\nfalse\n3\ntrue\n0\n5\nfalse\n2\nnot equal\n0\n12\nyes\n9\ntrue\ntrue\n'
+# the constant operand jumps over the rest of the condition (the code after the goto is
+# unreachable), the stack size must still fit the deeper stack of the following statement
+UNREACHABLE_SOURCE = '''function side(x::Integer)::Bool
+    println(x)
+    return x > 0
+end
+function main()
+    x::Float64 = 1.5
+    println(!(side(1) || true) && side(3))
+    if side(2)
+        x = x + 1.0
+    end
+    println(x - 0.5)
+end
+main()
+'''
+UNREACHABLE_EXPECTED = '1\nfalse\n2\n2.0\n'
+
+failed = []
+
+print('Testing conditions')
+with tempfile.TemporaryDirectory() as tmp_dir:
+    for disabled_optimizations in [{'constant_folding', 'peephole'}, {'peephole'}, set()]:
+        compiler = Compiler(disabled_optimizations=disabled_optimizations)
+        result = compiler.compile_source(SOURCE, 'Main', class_file=True)
+        name = f"without {', '.join(sorted(disabled_optimizations)) or 'nothing'}"
+        # && and || short-circuit, the headers of if/while branch on the comparison directly
+        if result.exit_code != 0 or '\tiand\n' in result.code or '\tior\n' in result.code or \
+            MATERIALISED_TEST.search(result.code) is not None:
+            failed.append(f"{name} (code)")
+            print(f"{name} (code): FAILED\n{result.code}")
+            continue
+        with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+            f.write(result.class_file)
+        process = subprocess.run(['java', '-cp', tmp_dir, 'Main'], capture_output=True,
+                                 text=True, timeout=10, check=False)
+        if process.returncode != 0 or process.stdout != EXPECTED:
+            failed.append(f"{name} (output)")
+            print(f"{name} (output): FAILED\n{process.stdout}{process.stderr}")
+        result = compiler.compile_source(UNREACHABLE_SOURCE, 'Main', class_file=True)
+        with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+            f.write(result.class_file)
+        process = subprocess.run(['java', '-cp', tmp_dir, 'Main'], capture_output=True,
+                                 text=True, timeout=10, check=False)
+        if process.returncode != 0 or process.stdout != UNREACHABLE_EXPECTED:
+            failed.append(f"{name} (unreachable code)")
+            print(f"{name} (unreachable code): FAILED\n{process.stdout}{process.stderr}")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
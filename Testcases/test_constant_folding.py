@@ -0,0 +1,124 @@
+import math
+import os
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler
+from compiler.src.constant_folding import constant_text, double_operation, integer_operation
+
+failed = []
+
+# constant expressions (printed by the generated program)
+EXPRESSIONS = [
+    '7 * (4 + 1)', '5/5+5*2 > 2', '2147483647 + 1', '0 - 2147483647 - 1', '65536 * 65536 * 3',
+    '-7 / 2', '-7 % 2', '7 % -3', '-(0 - 2147483647 - 1)', '(0 - 2147483647 - 1) / -1',
+    '(0 - 2147483647 - 1) % -1', '20 / 3 * 1.0', '20 / 3.0', '1 + 2.5', '0.1 + 0.2', '0.1 * 3',
+    '-0.0', '0.0 * -1', '1.0 / 0', '-1.0 / 0.0', '0.0 / 0.0', '5.5 % 2', '-5.5 % 2.0',
+    '1.0 % 0.0', '100000000000000000000.0 * 3', '0.0 / 0.0 == 0.0 / 0.0',
+    '0.0 / 0.0 != 0.0 / 0.0', '0.0 / 0.0 < 1.0', '0.0 / 0.0 > 1.0', '0.0 / 0.0 <= 1.0',
+    '0.0 / 0.0 >= 1.0', '1 == 1.0', '0.1 == 0.1', '!true || false', 'true && !false',
+    'true == false', '3 < 4 && 4.5 >= 4.5', '"a" == "a"',
+]
+# a function, whose variables are only assigned in their declaration
+PROPAGATION = '''function f(p::Integer)::Integer
+    a::Integer = 6
+    b::Float64 = a
+    c::Integer = a * 7
+    d::Integer = 0
+    d = d + c
+    if a > 5
+        println("kept")
+    else
+        println("removed")
+    end
+    while b < 1
+        println("removed")
+    end
+    return p + c + d
+end
+'''
+
+print('Testing constant folding')
+# the JVM semantics of the single operations
+for (operator, a, b), expected in [
+    (('+', 2147483647, 1), -2147483648), (('*', 65536, 65536), 0), (('/', -7, 2), -3),
+    (('%', -7, 2), -1), (('%', 7, -3), 1), (('/', -2147483648, -1), -2147483648),
+    (('%', -2147483648, -1), 0), (('/', 1, 0), None), (('%', 1, 0), None),
+]:
+    if integer_operation(operator, a, b) != expected:
+        failed.append(f"{a} {operator} {b}")
+        print(f"{a} {operator} {b}: FAILED")
+for (operator, a, b), expected in [
+    (('/', 1.0, 0.0), math.inf), (('/', 1.0, -0.0), -math.inf), (('/', 0.0, 0.0), math.nan),
+    (('%', -5.5, 2.0), -1.5), (('%', 1.0, 0.0), math.nan), (('%', math.inf, 2.0), math.nan),
+    (('%', 2.5, math.inf), 2.5), (('*', 1e308, 10.0), math.inf),
+]:
+    result = double_operation(operator, a, b)
+    if not (result == expected or math.isnan(result) and math.isnan(expected)):
+        failed.append(f"{a} {operator} {b}")
+        print(f"{a} {operator} {b}: FAILED ({result})")
+# only literals, that Jasmin loads exactly, are emitted
+for value, expected in [(3.0, '3.0'), (-0.0, '-0.0'), (1e-50, '1.0e-50'), (0.5, '0.5'),
+                        (0.1, None), (math.inf, None), (math.nan, None)]:
+    if constant_text(value, 'Float64') != expected:
+        failed.append(f"literal {value}")
+        print(f"literal {value}: FAILED ({constant_text(value, 'Float64')})")
+
+source = PROPAGATION + 'function main()\n' + \
+    ''.join(f"    println({expression})\n" for expression in EXPRESSIONS) + \
+    '    println(f(1))\nend\nmain()\n'
+folding_compiler = Compiler(disabled_optimizations={'slot_allocation', 'peephole'})
+compiler = Compiler(disabled_optimizations={'constant_folding', 'slot_allocation', 'peephole'})
+stats = CompileStats(None, 'constant_folding')
+folded = folding_compiler.compile_source(source, stats=stats)
+unfolded = compiler.compile_source(source)
+if folded.exit_code != 0 or 'removed' in folded.code or 'kept' not in folded.code or \
+    any(stats.counters[counter] == 0 for counter in
+        ['folded_expressions', 'propagated_variables', 'eliminated_branches']):
+    failed.append('folded code')
+    print(f"folded code: FAILED\n{stats.counters}")
+# the main method only computes the expressions, whose value has no exact literal
+main_method = folded.code[folded.code.index('main('):]
+# (0.1 + 0.2, 0.1 * 3, 20 / 3.0, 1.0 / 0, -1.0 / 0.0, 0.0 / 0.0, 1.0 % 0.0)
+instructions = {instruction: main_method.count(f"\t{instruction}\n") for instruction in
+                ['iadd', 'isub', 'imul', 'idiv', 'irem', 'ineg', 'iand', 'ior', 'ixor',
+                 'dadd', 'dsub', 'dmul', 'ddiv', 'drem', 'dneg', 'dcmpg']}
+if instructions != {'iadd': 0, 'isub': 0, 'imul': 0, 'idiv': 0, 'irem': 0, 'ineg': 0,
+                    'iand': 0, 'ior': 0, 'ixor': 0, 'dadd': 1, 'dsub': 0, 'dmul': 1,
+                    'ddiv': 4, 'drem': 1, 'dneg': 0, 'dcmpg': 0}:
+    failed.append('main method')
+    print(f"main method: FAILED\n{main_method}")
+# the variable, that is assigned twice, is not propagated
+f_method = folded.code[:folded.code.index('main(')]
+if 'iload 5' not in f_method or 'iload 1' in f_method or 'dload 2' in f_method:
+    failed.append('propagation')
+    print(f"propagation: FAILED\n{f_method}")
+
+# both programs print the same
+with tempfile.TemporaryDirectory() as tmp_dir:
+    outputs = []
+    for compiler_ in [compiler, folding_compiler]:
+        result = compiler_.compile_source(source, 'Main', class_file=True)
+        with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+            f.write(result.class_file)
+        process = subprocess.run(['java', '-cp', tmp_dir, 'Main'], capture_output=True,
+                                 text=True, timeout=10, check=False)
+        outputs.append((process.returncode, process.stdout))
+    if outputs[0] != outputs[1] or outputs[0][0] != 0:
+        failed.append('output')
+        print(f"output: FAILED\n{outputs}")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
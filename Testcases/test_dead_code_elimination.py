@@ -0,0 +1,118 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler
+
+SOURCE = '''function f(p::Integer, q::Integer)::Integer
+    a::Integer = 6
+    b::Integer = p * 2
+    c::Integer = 0
+    d::Integer = p / q
+    e::Integer = g(p)
+    c = b + 1
+    c = 3
+    if p > 1
+        return c
+        println("unreachable")
+        c = 4
+    else
+        begin
+            return p + d
+        end
+        println("unreachable")
+    end
+    println("unreachable")
+    return 1
+end
+function g(n::Integer)::Integer
+    println("called")
+    return n
+end
+function sq(x::Integer)::Integer
+    x = x * x
+    return x
+end
+function main()
+    x::Float64 = 1.5
+    y::Integer = 0
+    while y < 3
+        y = y + 1
+        x = 2.5
+    end
+    println(f(3, 2))
+    println(f(1, 5))
+    println(sq(7))
+end
+main()
+'''
+
+failed = []
+
+print('Testing dead code elimination')
+# (the calls are not inlined)
+compiler = Compiler(disabled_optimizations={'inlining', 'dead_code_elimination'})
+eliminating_compiler = Compiler(disabled_optimizations={'inlining'})
+stats = CompileStats(None, 'dead_code_elimination')
+result = eliminating_compiler.compile_source(SOURCE, stats=stats)
+f_method = result.code[:result.code.index('main(')]
+sq_method = result.code[result.code.index('sq(I)I'):result.code.index('main(')]
+main_method = result.code[result.code.index('main('):]
+# the unreachable statements and the stores without side effects are removed
+# (the stores of b only become dead, after the dead stores of c are removed)
+if result.exit_code != 0 or 'unreachable' in result.code or \
+    stats.counters['unreachable_statements'] != 5 or stats.counters['dead_stores'] != 7 or \
+    re.search(r'\t(bipush 6|iconst_2\n\timul|iconst_4|ldc2_w 2\.5)\n', result.code):
+    failed.append('eliminated code')
+    print(f"eliminated code: FAILED ({stats.counters})\n{result.code}")
+# the division (may throw) and the function call are kept
+if '\tidiv\n' not in f_method or 'invokestatic Main/g(I)I' not in f_method or \
+    'iconst_1\n\tiadd\n' not in main_method:
+    failed.append('kept code')
+    print(f"kept code: FAILED\n{result.code}")
+# a store of the returned variable is replaced by returning the expression
+if 'istore' in sq_method or '\timul\n\tireturn\n' not in sq_method:
+    failed.append('returned store')
+    print(f"returned store: FAILED\n{sq_method}")
+
+# the debug info reports the removed code of every method
+result = Compiler(debug=True, disabled_optimizations={'inlining'}).compile_source(SOURCE)
+if result.code.count('; DEBUG: dead code elimination; ') != 4 or \
+    '; DEBUG: dead code elimination; 5 unreachable statements and 4 dead stores ' + \
+    '(a, c, c, b) removed\n' not in result.code or \
+    '; DEBUG: dead code elimination; 0 unreachable statements and 2 dead stores ' + \
+    '(x, x) removed\n' not in result.code or \
+    '; DEBUG: dead code elimination; 0 unreachable statements and 1 dead stores ' + \
+    '(x) removed\n' not in result.code:
+    failed.append('debug info')
+    print(f"debug info: FAILED\n{result.code}")
+
+# both programs print the same (and the class files are valid)
+with tempfile.TemporaryDirectory() as tmp_dir:
+    outputs = []
+    for compiler_ in [compiler, eliminating_compiler]:
+        result = compiler_.compile_source(SOURCE, 'Main', class_file=True)
+        with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+            f.write(result.class_file)
+        process = subprocess.run(['java', '-cp', tmp_dir, 'Main'], capture_output=True,
+                                 text=True, timeout=10, check=False)
+        outputs.append((process.returncode, process.stdout))
+    if outputs[0] != outputs[1] or outputs[0] != (0, 'called\n3\ncalled\n1\n49\n'):
+        failed.append('output')
+        print(f"output: FAILED\n{outputs}")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compiler import Compiler
+
+# python Testcases/test_deep_nesting.py [DEPTH]
+DEPTH = 10**4
+# (other arguments, e.g. of a test runner collecting this file, are ignored)
+if len(sys.argv) > 1 and sys.argv[1].isdigit():
+    DEPTH = int(sys.argv[1])
+
+
+def program(body: str) -> str:
+    return f"function main()\nx::Integer = 1\n{body}println(x)\nend\nmain()\n"
+
+
+# every program nests (or chains) DEPTH expressions or control structures
+PROGRAMS = {
+    'operator chain': program('x = ' + ' + '.join(['x'] * DEPTH) + '\n'),
+    'parentheses': program('x = ' + '(' * DEPTH + 'x' + ')' * DEPTH + '\n'),
+    'unary operators': program('x = ' + '-' * DEPTH + 'x\n'),
+    'boolean chain': program('if ' + ' && '.join(['x < 2'] * DEPTH) + '\nx = 2\nend\n'),
+    'begin blocks': program('begin\n' * DEPTH + 'x = x + 1\n' + 'end\n' * DEPTH),
+    'if structures': program('if x < 2\n' * DEPTH + 'x = x + 1\n' + 'end\n' * DEPTH),
+    'while structures': program('while x < 2\n' * DEPTH + 'x = x + 1\n' + 'end\n' * DEPTH),
+    'statements': program('x = x + 1\n' * DEPTH),
+}
+
+compiler = Compiler()
+recursion_limit = sys.getrecursionlimit()
+failed = []
+
+print('Testing depth', DEPTH)
+for name, source in PROGRAMS.items():
+    start = time.perf_counter()
+    try:
+        result = compiler.compile_source(source, 'Main')
+        liveness_result = compiler.liveness_source(source)
+        exit_codes = (result.exit_code, liveness_result.exit_code)
+    except RecursionError:
+        exit_codes = 'RecursionError'
+    print(f"{name:<20} {time.perf_counter() - start:8.2f}s")
+    if exit_codes != (0, 0):
+        failed.append(name)
+        print(f"{name}: FAILED ({exit_codes})")
+
+# syntax errors are reported (in full LL mode) at any depth
+source = program('if x < 2\n' * DEPTH + 'x = x +\n' + 'end\n' * DEPTH)
+result = compiler.compile_source(source, 'Main')
+if result.exit_code != 1 or result.diagnostics[0].line != DEPTH + 3:
+    failed.append('syntax error')
+    print('syntax error: FAILED')
+
+# the recursion limit is only raised temporarily
+if sys.getrecursionlimit() != recursion_limit:
+    failed.append('recursion limit')
+    print('recursion limit: FAILED')
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
@@ -0,0 +1,170 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler
+
+SOURCE = '''function half()::Float64
+    return 0.5
+end
+function mix(a::Float64, b::Integer)::Float64
+    c::Float64 = a * b
+    d::Integer = b + 1
+    return c + d + half()
+end
+function say(s::String, n::Integer)
+    println(s)
+    println(n)
+end
+function add(a::Integer, b::Integer)::Integer
+    return a + b
+end
+function twice(n::Integer)::Integer
+    return add(n, n)
+end
+function positive(n::Integer)::Bool
+    return n > 0
+end
+function fact(n::Integer)::Integer
+    if n < 2
+        return 1
+    end
+    return n * fact(n - 1)
+end
+function big(n::Integer)::Integer
+    a::Integer = n * n + n * 2 + n * 3 + n * 4
+    return a + n * 5 + n * 6 + n * 7 + n * 8
+end
+function main()
+    x::Float64 = 1.5
+    k::Integer = 3
+    while positive(k)
+        say("k", twice(k) + add(k, 1))
+        x = mix(x, k) + mix(0.25, twice(k))
+        k = k - 1
+    end
+    println(x)
+    println(fact(5))
+    println(big(2))
+end
+main()
+'''
+EXPECTED = 'k\n10\nk\n7\nk\n4\n52.5\n120\n74\n'
+# the calls inlined into the arguments of an inlined call (and next to each other)
+# keep their own variables
+NESTED_SOURCE = '''function first(a::Integer, b::Integer)::Integer
+    return a
+end
+function sq(x::Integer)::Integer
+    x = x * x
+    return x
+end
+function swapsub(a::Integer, b::Integer)::Integer
+    return b - a
+end
+function main()
+    println(first(30, first(22, 49)))
+    println(swapsub(sq(2), sq(3)))
+end
+main()
+'''
+NESTED_EXPECTED = '30\n5\n'
+
+failed = []
+
+
+def invocations(code: str) -> dict[str, int]:
+    main_method = code[code.index('main('):]
+    return {name: len(re.findall(rf"\tinvokestatic Main/{name}\(", main_method))
+            for name in ['half', 'mix', 'say', 'add', 'twice', 'positive', 'fact', 'big']}
+
+
+print('Testing inlining')
+compiler = Compiler(disabled_optimizations={'inlining'})
+inlining_compiler = Compiler()
+stats = CompileStats(None, 'inlining')
+result = inlining_compiler.compile_source(SOURCE, stats=stats)
+# the small functions are inlined (into main and into twice and mix),
+# the recursive and the big function are not
+if result.exit_code != 0 or stats.counters['inlined_calls'] != 9 or \
+    invocations(result.code) != {'half': 0, 'mix': 0, 'say': 0, 'add': 0, 'twice': 0,
+                                 'positive': 0, 'fact': 1, 'big': 1} or \
+    '\tinvokestatic Main/add(II)I' in result.code:
+    failed.append('inlined calls')
+    print(f"inlined calls: FAILED ({stats.counters})\n{result.code}")
+
+# the size limit is configurable
+stats = CompileStats(None, 'inlining')
+result = Compiler(inline_size=3).compile_source(SOURCE, stats=stats)
+if result.exit_code != 0 or stats.counters['inlined_calls'] != 5 or \
+    invocations(result.code) != {'half': 0, 'mix': 2, 'say': 0, 'add': 0, 'twice': 2,
+                                 'positive': 0, 'fact': 1, 'big': 1}:
+    failed.append('inline size')
+    print(f"inline size: FAILED ({stats.counters})\n{result.code}")
+stats = CompileStats(None, 'inlining')
+result = Compiler(inline_size=0).compile_source(SOURCE, stats=stats)
+if result.exit_code != 0 or stats.counters['inlined_calls'] != 0:
+    failed.append('no inlining')
+    print(f"no inlining: FAILED ({stats.counters})")
+
+# functions, that can call themselves through main, are not inlined
+result = inlining_compiler.compile_source(
+    'function again(n::Integer)\n    println(n)\n    main()\nend\n' + \
+    'function main()\n    again(1)\nend\nmain()\n')
+if result.exit_code != 0 or '\tinvokestatic Main/again(I)V' not in result.code:
+    failed.append('recursion through main')
+    print(f"recursion through main: FAILED\n{result.code}")
+
+# the parallel mode inlines the same calls
+for debug in [False, True]:
+    expected = Compiler(debug).compile_source(SOURCE).code
+    if Compiler(debug).compile_source(SOURCE, jobs=2).code != expected:
+        failed.append(f"parallel{' (debug)' if debug else ''}")
+        print(f"parallel{' (debug)' if debug else ''}: FAILED")
+
+# the programs print the same (and the class files are valid),
+# the variables of the inlined calls also work without the other optimizations
+with tempfile.TemporaryDirectory() as tmp_dir:
+    outputs = []
+    for compiler_ in [compiler, inlining_compiler, Compiler(disabled_optimizations={
+            'constant_folding', 'dead_code_elimination', 'slot_allocation', 'peephole'})]:
+        result = compiler_.compile_source(SOURCE, 'Main', class_file=True)
+        with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+            f.write(result.class_file)
+        process = subprocess.run(['java', '-cp', tmp_dir, 'Main'], capture_output=True,
+                                 text=True, timeout=10, check=False)
+        outputs.append((process.returncode, process.stdout, process.stderr))
+    if outputs != [(0, EXPECTED, '')] * 3:
+        failed.append('output')
+        print(f"output: FAILED\n{outputs}")
+    outputs = []
+    for compiler_ in [inlining_compiler, Compiler(disabled_optimizations={
+            'dead_code_elimination', 'slot_allocation', 'peephole'})]:
+        result = compiler_.compile_source(NESTED_SOURCE, 'Main', class_file=True)
+        if result.exit_code != 0 or '\tinvokestatic Main/' in result.code:
+            outputs.append(('not inlined', result.code))
+            continue
+        with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+            f.write(result.class_file)
+        process = subprocess.run(['java', '-cp', tmp_dir, 'Main'], capture_output=True,
+                                 text=True, timeout=10, check=False)
+        outputs.append((process.returncode, process.stdout, process.stderr))
+    if outputs != [(0, NESTED_EXPECTED, '')] * 2:
+        failed.append('nested output')
+        print(f"nested output: FAILED\n{outputs}")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+neg_path = os.path.abspath(os.path.join(script_dir, 'neg'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compiler import Compiler
+from program_generator import ProgramGenerator
+
+
+def function(name: str, body: str, header: str = '()') -> str:
+    return f"function {name}{header}\n{body}end\n"
+
+
+# the corpus, generated programs and programs with errors in several functions
+sources = {}
+for kind_path in [pos_path, neg_path]:
+    for file in sorted(os.listdir(kind_path)):
+        if file[-3:] == '.jl':
+            with open(os.path.join(kind_path, file), 'r', encoding='utf-8') as f:
+                sources[os.path.join(os.path.basename(kind_path), file)] = f.read()
+for seed in range(3):
+    sources[f"generated {seed}"] = ProgramGenerator(functions=12, nesting=3, seed=seed).generate()
+MAIN = 'main()\n'
+sources.update({
+    'type errors in several functions': function('f', 'x::Integer = true\nreturn 1.5\n',
+                                                 '()::Integer') + \
+        function('main', 'y::Bool = 1\nprintln(f(1))\n') + \
+        '#= comment =# ' + function('g', 'if 1 < 2.5 || a\nend\n', '(a::Integer)') + MAIN,
+    'symbol table errors': function('f', 'println(z)\n') + function('main', 'f()\n') + MAIN,
+    'nested comments and positions': '#= a #= nested =# comment =#\n' + \
+        function('f', 'return a  #= c =# + 1\n', '(a::Integer)::Integer') + '\n\n' + \
+        function('main', 'println(f(1)) # comment\n') + MAIN,
+})
+
+failed = []
+
+
+def compare(name: str, compiler: Compiler, source: str) -> None:
+    expected = compiler.compile_source(source)
+    result = compiler.compile_source(source, jobs=2)
+    if (result.exit_code, [str(d) for d in result.diagnostics], result.code) != \
+        (expected.exit_code, [str(d) for d in expected.diagnostics], expected.code):
+        failed.append(name)
+        print(f"{name}: FAILED ({result.exit_code}, {expected.exit_code})")
+
+
+# the parallel mode must produce the same code, errors and exit codes
+print('Testing parallel compilation')
+for lexer in ['antlr', 'regex']:
+    for debug in [False, True]:
+        compiler = Compiler(debug, lexer=lexer)
+        for name, source in sources.items():
+            compare(f"{name} ({lexer}{', debug' if debug else ''})", compiler, source)
+
+# the command line output is the same as well
+stups_compiler = os.path.join(package_dir, 'compiler', 'stups_compiler.py')
+with tempfile.TemporaryDirectory() as tmp_dir:
+    in_file = os.path.join(tmp_dir, 'Main.jl')
+    with open(in_file, 'w', encoding='utf-8') as f:
+        f.write(sources['generated 0'])
+    outputs = []
+    for args in [[], ['-parallel', '-jobs', '3']]:
+        out_file = os.path.join(tmp_dir, f"Main{len(outputs)}.j")
+        process = subprocess.run([sys.executable, stups_compiler, '-compile', in_file,
+                                  '-output', out_file, '-no-cache', *args],
+                                 capture_output=True, text=True, check=False)
+        with open(out_file, 'r', encoding='utf-8') as f:
+            code = f.read().replace(f"Main{len(outputs)}", 'Main')
+        outputs.append((process.returncode, process.stdout.replace(out_file, ''),
+                        process.stderr, code))
+    if outputs[0] != outputs[1]:
+        failed.append('command line')
+        print('command line: FAILED')
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
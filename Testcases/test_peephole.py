@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler
+from compiler.src.peephole import PeepholeOptimizer, max_stack_size
+
+failed = []
+
+
+def lines(code: str) -> list[str]:
+    return [f"{line}\n" for line in code.strip('\n').split('\n')]
+
+
+# (rule, code, optimized code)
+CASES = [
+    ('constants', '\tldc 5\n\tldc -1\n\tldc 100\n\tldc -129\n\tldc 40000\n\tldc "7"\n',
+     '\ticonst_5\n\ticonst_m1\n\tbipush 100\n\tsipush -129\n\tldc 40000\n\tldc "7"\n'),
+    ('constants', '\tldc2_w 0.0\n\tldc2_w 1.0\n\tldc2_w -0.0\n\tldc2_w 2.0\n',
+     '\tdconst_0\n\tdconst_1\n\tldc2_w -0.0\n\tldc2_w 2.0\n'),
+    ('store_load', '\tistore 1\n\n\tiload 1\n\tdstore 2\n\tdload 2\n\tastore 1\n\taload 2\n',
+     '\n\tdup\n\tistore 1\n\tdup2\n\tdstore 2\n\tastore 1\n\taload 2\n'),
+    ('boolean_branch', '\tif_icmplt label_1_if\n\ticonst_0\n\tgoto label_1_end\n' + \
+        'label_1_if:\n\ticonst_1\nlabel_1_end:\n\tifeq label_0_end\n\treturn\nlabel_0_end:\n',
+     '\tif_icmpge label_0_end\n\treturn\nlabel_0_end:\n'),
+    ('negation', '\tiload 0\n\ticonst_1\n\tixor\n\tifne label_0_if\nlabel_0_if:\n',
+     '\tiload 0\n\tifeq label_0_if\nlabel_0_if:\n'),
+    ('constant_branch', 'label_0:\n\ticonst_1\n\tifeq label_1\n\ticonst_0\n\tifeq label_0\n' + \
+        'label_1:\n', 'label_0:\n\tgoto label_0\n'),
+    ('branch_over_goto', '\tiload 0\n\tifne label_0_if\n\tgoto label_0_end\nlabel_0_if:\n' + \
+        '\treturn\nlabel_0_end:\n', '\tiload 0\n\tifeq label_0_end\n\treturn\nlabel_0_end:\n'),
+    ('goto_next', '\tgoto label_0_end\n; DEBUG: comment\nlabel_0_end:\n\treturn\n',
+     '; DEBUG: comment\n\treturn\n'),
+    # a label, that is jumped to from elsewhere, is kept
+    ('goto_next', '\tiload 0\n\tifeq label_0\n\tpop\n\tgoto label_0\nlabel_0:\n',
+     '\tiload 0\n\tifeq label_0\n\tpop\nlabel_0:\n'),
+    # the code after a goto/return is removed up to the next label, that is jumped to
+    ('unreachable', 'label_0:\n\tiload 0\n\tifeq label_1\n\tiload 1\n\tistore 0\n' + \
+        '\tgoto label_0\n\ticonst_0\n\tireturn\nlabel_1:\n\treturn\n',
+     'label_0:\n\tiload 0\n\tifeq label_1\n\tiload 1\n\tistore 0\n\tgoto label_0\n' + \
+        'label_1:\n\treturn\n'),
+    # (a label, that is only jumped to from unreachable code, is unreachable aswell)
+    ('unreachable', '\treturn\n\tgoto label_0\n; DEBUG: comment\nlabel_0:\n\treturn\n',
+     '\treturn\n; DEBUG: comment\n'),
+]
+
+print('Testing peephole rules')
+for rule, code, expected in CASES:
+    optimizer = PeepholeOptimizer()
+    optimized = ''.join(optimizer.optimize(lines(code)))
+    if optimized != expected or optimizer.hits[rule] == 0:
+        failed.append(rule)
+        print(f"{rule}: FAILED\n{optimized}")
+
+# the stack size of the optimized code
+for code, expected in [
+    ('\tiload 0\n\tdup\n\tistore 0\n\tdup\n\tistore 1\n\tiload 1\n\tiadd\n\tireturn\n', 2),
+    ('\tdload 0\n\tdup2\n\tdstore 2\n\tinvokestatic Main/f(DI[Ljava/lang/String;)D\n' + \
+        '\tdreturn\n', 4),
+    ('\tiload 0\n\tifeq label_0\n\tdconst_1\n\tgoto label_1\nlabel_0:\n\tdconst_0\n' + \
+        'label_1:\n\tdreturn\n', 2),
+    # (unreachable code is not counted)
+    ('\tgoto label_0\n\tdconst_0\n\tdconst_0\n\tgoto label_0\nlabel_0:\n\treturn\n', 0),
+]:
+    if max_stack_size(lines(code)) != expected:
+        failed.append('stack size')
+        print(f"stack size: FAILED ({max_stack_size(lines(code))} != {expected})\n{code}")
+
+# the corpus is optimized and the rules are counted
+print('Testing', pos_path)
+optimized_compiler = Compiler()
+compiler = Compiler(disabled_optimizations={'peephole'})
+sources = {}
+for file in sorted(os.listdir(pos_path)):
+    if file[-3:] != '.jl':
+        continue
+    with open(os.path.join(pos_path, file), 'r', encoding='utf-8') as f:
+        sources[file] = f.read()
+    stats = CompileStats(None, file)
+    optimized = optimized_compiler.compile_source(sources[file], stats=stats)
+    unoptimized = compiler.compile_source(sources[file], stats=CompileStats(None, file))
+    if optimized.exit_code != 0 or 'ldc 1\n' in optimized.code or \
+        'ldc 1\n' in unoptimized.code and stats.counters['peephole_constants'] == 0:
+        failed.append(file)
+        print(f"{file}: FAILED")
+
+# both programs print the same (and the class files are valid)
+with tempfile.TemporaryDirectory() as tmp_dir:
+    for file, source in sources.items():
+        outputs = []
+        for compiler_ in [compiler, optimized_compiler]:
+            result = compiler_.compile_source(source, 'Main', class_file=True)
+            with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+                f.write(result.class_file)
+            try:
+                process = subprocess.run(['java', '-Xss512k', '-cp', tmp_dir, 'Main'],
+                                         capture_output=True, text=True, timeout=10, check=False)
+                # (the output of a program, that overflows the stack, depends on the frame sizes)
+                outputs.append((process.returncode,
+                                process.stdout if process.returncode == 0 else ''))
+            except subprocess.TimeoutExpired:
+                outputs.append('timeout')
+        if outputs[0] != outputs[1]:
+            failed.append(f"{file} (output)")
+            print(f"{file} (output): FAILED")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
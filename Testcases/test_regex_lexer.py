@@ -0,0 +1,89 @@
+import os
+import random
+import sys
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+neg_path = os.path.abspath(os.path.join(script_dir, 'neg'))
+sys.path.insert(0, package_dir)
+
+from antlr4 import InputStream
+from compiler.src.CoBaLexer import CoBaLexer
+from compiler.src.compiler import Compiler
+from compiler.src.regex_lexer import RegexLexer
+from program_generator import ProgramGenerator
+
+
+def tokens(lexer) -> list[tuple]:
+    result = []
+    while True:
+        token = lexer.nextToken()
+        result.append((token.type, token.text, token.line, token.column,
+                       token.start, token.stop, token.channel))
+        if token.type == token.EOF:
+            return result
+
+
+def antlr_tokens(source: str) -> list[tuple]:
+    lexer = CoBaLexer(InputStream(source))
+    lexer.removeErrorListeners()
+    return tokens(lexer)
+
+
+# the corpus, generated programs and edge cases of the lexer rules
+sources = {}
+for kind_path in [pos_path, neg_path]:
+    for file in sorted(os.listdir(kind_path)):
+        if file[-3:] == '.jl':
+            with open(os.path.join(kind_path, file), 'r', encoding='utf-8') as f:
+                sources[os.path.join(os.path.basename(kind_path), file)] = f.read()
+for seed in range(5):
+    sources[f"generated {seed}"] = ProgramGenerator(functions=3, statements=12, expression_depth=2,
+                                                    nesting=4, seed=seed).generate()
+EDGE_CASES = [
+    '', '\n', '\r\n\r\n', 'a\rb', 'x\t\f y', 'main main2 end_ _end $x ifelse Integer64',
+    '1.05 0123 00.00 1. .5 1.2.3 10.01', '"abc" "" "a\nb" "unterminated\n"x"',
+    '# comment\nx', '#\nx', '#\r\nx', '#', '#=', '#=#', '#==#x', '#= a =# =# b',
+    '#= a #= b =# c =# d\nx', '#= a =# #= =# =#\nx', '#=#= =#', '#= \n\n =#\n y',
+    ':: : & | && || ! != = == < <= > >= ( ) , + - * / %', 'ä €   \U0001f600 x',
+]
+for i, source in enumerate(EDGE_CASES):
+    sources[f"edge case {i}"] = source
+# random sources using the characters of comments, operators and numbers
+random_ = random.Random(0)
+for i in range(500):
+    sources[f"random {i}"] = ''.join(random_.choice('#= a\n1.0"') for _ in range(20))
+
+failed = []
+
+print('Testing tokens')
+regex_lexer = RegexLexer()
+for name, source in sources.items():
+    regex_lexer.reset(source)
+    if tokens(regex_lexer) != antlr_tokens(source):
+        failed.append(name)
+        print(f"{name}: FAILED ({source!r})")
+
+# both backends must produce the same results (code, diagnostics and exit codes)
+print('Testing compilation')
+antlr_compiler = Compiler()
+regex_compiler = Compiler(lexer='regex')
+for name, source in sources.items():
+    if name.startswith('random'):
+        continue
+    expected = antlr_compiler.compile_source(source, 'Main')
+    result = regex_compiler.compile_source(source, 'Main')
+    if (result.exit_code, result.code, [str(d) for d in result.diagnostics]) != \
+        (expected.exit_code, expected.code, [str(d) for d in expected.diagnostics]):
+        failed.append(f"compile {name}")
+        print(f"compile {name}: FAILED")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
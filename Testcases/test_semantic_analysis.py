@@ -0,0 +1,87 @@
+import os
+import sys
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+pos_path = os.path.abspath(os.path.join(script_dir, 'pos'))
+neg_path = os.path.abspath(os.path.join(script_dir, 'neg'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler, CompileResult
+from program_generator import ProgramGenerator
+
+
+def function(name: str, body: str, header: str = '()') -> str:
+    return f"function {name}{header}\n{body}end\n"
+
+
+# the corpus, generated programs and programs with symbol table- and type errors
+sources = {}
+for kind_path in [pos_path, neg_path]:
+    for file in sorted(os.listdir(kind_path)):
+        if file[-3:] == '.jl':
+            with open(os.path.join(kind_path, file), 'r', encoding='utf-8') as f:
+                sources[os.path.join(os.path.basename(kind_path), file)] = f.read()
+for seed in range(3):
+    sources[f"generated {seed}"] = ProgramGenerator(functions=4, nesting=3, seed=seed).generate()
+MAIN = 'main()\n'
+sources.update({
+    'call of a later function': function('main', 'println(f(1, 2.5))\n') + \
+        function('f', 'return a\n', '(a::Integer, b::Float64)::Integer') + MAIN,
+    'wrong arguments of a later function': function('main', 'println(f(1.5, 2))\nf(1)\n') + \
+        function('f', 'return a\n', '(a::Integer, b::Float64)::Integer') + MAIN,
+    'unknown function': function('main', 'g()\n') + MAIN,
+    'duplicate functions': function('f', 'b::Integer = a\n', '(a::Integer)') + \
+        function('f', 'c::Integer = b\n', '(b::Integer)') + function('main', 'f(1)\n') + MAIN,
+    'duplicate parameters': function('f', '', '(a::Integer, a::Bool)') + \
+        function('main', 'f(1, true)\n') + MAIN,
+    'use before declaration': function('main', 'x::Integer = y\ny::Integer = x\n') + MAIN,
+    'symbol table and type errors': function('main', 'x::Integer = true\nprintln(z)\n') + MAIN,
+    'type errors only': function('main', 'x::Integer = true\nx = 1.5\nif x\nend\n') + \
+        function('f', 'return true\n', '()::Integer') + function('g', '', '()::Bool') + MAIN,
+    'recursion': function('f', 'if n > 0\nreturn f(n - 1)\nend\nreturn 0\n',
+                          '(n::Integer)::Integer') + function('main', 'println(f(3))\n') + MAIN,
+})
+
+compiler = Compiler()
+failed = []
+
+
+def symbols(result: CompileResult) -> list[str]:
+    if result.symbol_table is None:
+        return None
+    return [str(f_symbol) for f_symbol in result.symbol_table.functions.values()]
+
+
+def separate_passes(source: str) -> CompileResult:
+    result = CompileResult()
+    stats = CompileStats(None, 'separate')
+    tree = compiler.parse(source, result, stats)
+    if result.success:
+        compiler.gen_symbol_table(tree, result, stats)
+    if result.success:
+        compiler.type_check(tree, result, stats)
+    return result
+
+
+# the fused pass must produce the same symbol table, errors and exit codes
+print('Testing semantic analysis')
+for name, source in sources.items():
+    expected = separate_passes(source)
+    result = CompileResult()
+    compiler.check_source(source, result, CompileStats(None, 'fused'))
+    if (result.exit_code, [str(d) for d in result.diagnostics], symbols(result)) != \
+        (expected.exit_code, [str(d) for d in expected.diagnostics],
+         symbols(expected)):
+        failed.append(name)
+        print(f"{name}: FAILED ({result.exit_code}, {expected.exit_code})")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
@@ -0,0 +1,79 @@
+import os
+import sys
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compiler import Compiler
+
+TYPES = ['Integer', 'Float64', 'Bool', 'String']
+VALUES = {'Integer': '1', 'Float64': '1.5', 'Bool': 'true', 'String': '"s"'}
+DESCRIPTORS = {'Integer': 'I', 'Float64': 'D', 'Bool': 'I', 'String': 'Ljava/lang/String;'}
+
+
+def wide_program(parameters: int, calls: int, arguments: list[str] = None) -> str:
+    # a helper with many parameters (of all types), called many times
+    header = ', '.join(f"p{i}::{TYPES[i % 4]}" for i in range(parameters))
+    if arguments is None:
+        arguments = [VALUES[TYPES[i % 4]] for i in range(parameters)]
+    call = f"x = x + f({', '.join(arguments)})\n"
+    return f"function f({header})::Integer\nreturn p0\nend\n" + \
+        "function g()::Float64\nreturn 1.5\nend\n" + \
+        f"function main()\nx::Integer = 0\n{call * calls}println(x)\ng()\nend\nmain()\n"
+
+
+# (f is not inlined, so that its calls show the descriptor)
+compiler = Compiler(disabled_optimizations={'inlining'})
+failed = []
+
+print('Testing signatures')
+result = compiler.compile_source(wide_program(64, 32))
+signature = result.symbol_table.get_function('f').signature
+descriptor = '(' + ''.join(DESCRIPTORS[TYPES[i % 4]] for i in range(64)) + ')I'
+expected = {
+    'f': (tuple(TYPES[i % 4] for i in range(64)), 'Integer', descriptor, 64 + 16, 1),
+    'g': ((), 'Float64', '()D', 0, 2),
+    'main': ((), None, '([Ljava/lang/String;)V', 0, 0),
+}
+for f_name, expected_signature in expected.items():
+    if tuple(result.symbol_table.get_function(f_name).signature) != expected_signature:
+        failed.append(f"signature {f_name}")
+        print(f"signature {f_name}: FAILED")
+if result.exit_code != 0 or result.code.count(f"invokestatic Main/f{descriptor}") != 32 or \
+    f".method public static f{descriptor}" not in result.code or \
+    '\tinvokestatic Main/g()D' not in result.code:
+    failed.append('descriptors')
+    print('descriptors: FAILED')
+# the signature is computed again after adding a parameter
+f_symbol = result.symbol_table.get_function('g')
+f_symbol.add_parameter('a', 'Float64')
+if f_symbol.signature.descriptor != '(D)D' or f_symbol.signature.argument_width != 2:
+    failed.append('changed signature')
+    print('changed signature: FAILED')
+
+# wrong arguments are still reported at the correct position (the first error)
+arguments = [VALUES[TYPES[i % 4]] for i in range(8)]
+arguments[5] = '"wrong"'
+for name, source, diagnostics in [
+    ('wrong argument', wide_program(8, 1, arguments),
+     ["line 9:32 wrong argument type: 'String', expected: 'Float64'."]),
+    ('too few arguments', wide_program(8, 1, arguments[:7]),
+     ["line 9:8 too few arguments provided at function call: 'f'."]),
+    ('too many arguments', wide_program(8, 1, arguments + ['1']),
+     ["line 9:8 too many arguments provided at function call: 'f'."]),
+]:
+    result = compiler.compile_source(source)
+    # (the call itself is not typed, further errors may follow)
+    if result.exit_code != 3 or [str(d) for d in result.diagnostics[:1]] != diagnostics:
+        failed.append(name)
+        print(f"{name}: FAILED {[str(d) for d in result.diagnostics]}")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
@@ -0,0 +1,118 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler
+
+SOURCE = '''function g(p::Float64, q::Integer)::Float64
+    a::Integer = q * 2
+    b::Float64 = p + a
+    c::Integer = 3
+    d::Float64 = 0.5
+    e::String = "s"
+    unused::Integer = q
+    println(b)
+    c = c + q
+    println(c)
+    while c < 10
+        d = d + 1
+        c = c + 1
+    end
+    println(d)
+    println(e)
+    return d
+end
+function f(y::Integer)::Bool
+    return y > 0
+end
+function h(n::Integer, m::Float64)::Integer
+    dead::Float64 = m * 2
+    return n
+end
+function main()
+    i::Integer = 0
+    x::Float64 = 1.5
+    k::Integer = 4
+    j::Integer = 1
+    z::Float64 = 0.0
+    println(g(x, 2))
+    while f(k)
+        i = i + 1
+        k = k - 1
+        z = z + 0.5
+    end
+    println(i)
+    println(z)
+    while j < 100
+        j = j * 3
+    end
+    println(j)
+    println(h(7, 2.5))
+end
+main()
+'''
+# method -> expected '.limit locals' (with the slot allocation)
+LIMITS = {'g': 8, 'f': 1, 'h': 3, 'main': 6}
+
+failed = []
+
+
+def limits(code: str) -> dict[str, int]:
+    return {name: int(limit) for name, limit in re.findall(
+        r'\.method public static (\w+)\(.*\n\t\.limit locals (\d+)', code)}
+
+
+print('Testing slot allocation')
+# (the dead stores are kept to test their interference, the calls are not inlined)
+compiler = Compiler(disabled_optimizations={'inlining', 'dead_code_elimination',
+                                            'slot_allocation'})
+allocating_compiler = Compiler(disabled_optimizations={'inlining', 'dead_code_elimination'})
+stats = CompileStats(None, 'slot_allocation')
+result = allocating_compiler.compile_source(SOURCE, stats=stats)
+unallocated = compiler.compile_source(SOURCE)
+main_method = result.code[result.code.index('main('):]
+# the parameters keep their slots, the String[] of main is never overwritten
+if limits(result.code) != LIMITS or stats.counters['locals_saved'] != \
+    sum(limits(unallocated.code).values()) - sum(LIMITS.values()) or \
+    re.search(r'\t[ida]store 0\n', main_method) or 'iload 1\n\tinvokestatic Main/h' in \
+    result.code or 'iload 0\n\tireturn' not in result.code:
+    failed.append('slots')
+    print(f"slots: FAILED ({limits(result.code)}, {stats.counters})\n{result.code}")
+
+# the debug info reports the saved slots of every method
+result = Compiler(debug=True, disabled_optimizations={'inlining', 'dead_code_elimination'}
+                  ).compile_source(SOURCE)
+if result.code.count('; DEBUG: slot allocation; ') != 4 or \
+    '; DEBUG: slot allocation; 3 of 11 locals saved\n' not in result.code:
+    failed.append('debug info')
+    print('debug info: FAILED')
+
+# both programs print the same (and the class files are valid)
+with tempfile.TemporaryDirectory() as tmp_dir:
+    outputs = []
+    for compiler_ in [compiler, allocating_compiler]:
+        result = compiler_.compile_source(SOURCE, 'Main', class_file=True)
+        with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+            f.write(result.class_file)
+        process = subprocess.run(['java', '-cp', tmp_dir, 'Main'], capture_output=True,
+                                 text=True, timeout=10, check=False)
+        outputs.append((process.returncode, process.stdout, process.stderr))
+    if outputs[0] != outputs[1] or outputs[0][0] != 0:
+        failed.append('output')
+        print(f"output: FAILED\n{outputs}")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
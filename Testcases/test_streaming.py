@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler, CompileResult
+from compiler.stups_compiler import AtomicOutput
+from program_generator import ProgramGenerator
+
+stups_compiler = os.path.join(package_dir, 'compiler', 'stups_compiler.py')
+TYPE_ERROR = 'function main()\nx::Integer = 0\nprintln(x)\nend\n' + \
+    'function f()\ny::Bool = 1\nend\nmain()\n'
+
+failed = []
+
+
+def generate(source: str, debug: bool, streamed: bool) -> tuple[str, int]:
+    # the generated code and the peak memory of the code generation
+    compiler = Compiler(debug)
+    result, stats = CompileResult(), CompileStats(None, 'streaming')
+    program = compiler.front_end(source, result, stats)
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as out_file:
+        tracemalloc.start()
+        code = compiler.generate(program, result, 'Main', stats,
+                                 out_file if streamed else None)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        out_file.seek(0)
+        return (out_file.read() if streamed else code), peak
+
+
+def run(in_file: str, out_file: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, stups_compiler, '-compile', in_file,
+                           '-output', out_file, '-no-cache', *args],
+                          capture_output=True, text=True, check=False)
+
+
+# the streamed code is the same, but only one method is kept in memory
+print('Testing streaming')
+source = ProgramGenerator(functions=200, statements=20, seed=1).generate()
+for debug in [False, True]:
+    (expected, peak), (code, streamed_peak) = generate(source, debug, False), \
+        generate(source, debug, True)
+    if code != expected:
+        failed.append(f"streamed code{' (debug)' if debug else ''}")
+        print(f"streamed code{' (debug)' if debug else ''}: FAILED")
+    if streamed_peak * 4 > peak:
+        failed.append(f"memory{' (debug)' if debug else ''}")
+        print(f"memory{' (debug)' if debug else ''}: FAILED ({streamed_peak} of {peak} bytes)")
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    in_file = os.path.join(tmp_dir, 'Main.jl')
+    with open(in_file, 'w', encoding='utf-8') as f:
+        f.write(source)
+    # the same output on the command line (serially and in parallel)
+    outputs = []
+    for args in [[], ['-stream'], ['-stream', '-parallel', '-jobs', '2']]:
+        out_file = os.path.join(tmp_dir, f"Main{len(outputs)}.j")
+        process = run(in_file, out_file, *args)
+        with open(out_file, 'r', encoding='utf-8') as f:
+            code = f.read().replace(f"Main{len(outputs)}", 'Main')
+        outputs.append((process.returncode, code))
+    if outputs[1] != outputs[0] or outputs[2] != outputs[0]:
+        failed.append('command line')
+        print('command line: FAILED')
+
+    # a failed compilation leaves neither a (truncated) output file nor a temporary file
+    with open(in_file, 'w', encoding='utf-8') as f:
+        f.write(TYPE_ERROR)
+    for args in [[], ['-stream'], ['-stream', '-parallel', '-jobs', '2']]:
+        out_file = os.path.join(tmp_dir, 'Error.j')
+        process = run(in_file, out_file, *args)
+        if process.returncode != 3 or os.path.exists(out_file) or \
+            any(file.endswith('.tmp') for file in os.listdir(tmp_dir)):
+            failed.append(f"failed compilation {args}")
+            print(f"failed compilation {args}: FAILED")
+    # an existing output file is only replaced once the new one is complete
+    out_file = os.path.join(tmp_dir, 'Main0.j')
+    with open(out_file, 'r', encoding='utf-8') as f:
+        existing = f.read()
+    process = run(in_file, out_file, '-stream')
+    with open(out_file, 'r', encoding='utf-8') as f:
+        if process.returncode != 3 or f.read() != existing:
+            failed.append('existing output')
+            print('existing output: FAILED')
+    # (also if the writing fails with an exception)
+    try:
+        with AtomicOutput(Path(out_file)) as output:
+            output.file.write('truncated')
+            raise OSError('disk full')
+    except OSError:
+        pass
+    with open(out_file, 'r', encoding='utf-8') as f:
+        if f.read() != existing or any(file.endswith('.tmp') for file in os.listdir(tmp_dir)):
+            failed.append('exception')
+            print('exception: FAILED')
+
+    # -stream only writes Jasmin files
+    process = run(in_file, out_file, '-stream', '-classfile')
+    if process.returncode != 1 or "'-stream'" not in process.stderr:
+        failed.append('invalid arguments')
+        print('invalid arguments: FAILED')
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
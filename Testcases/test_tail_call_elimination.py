@@ -0,0 +1,118 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+
+
+script_dir = os.path.dirname(__file__)
+package_dir = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, package_dir)
+
+from compiler.src.compile_stats import CompileStats
+from compiler.src.compiler import Compiler
+
+SOURCE = '''function count(n::Integer, acc::Integer)::Integer
+    if n == 0
+        return acc
+    end
+    return count(n - 1, acc + 1)
+end
+function gcd(a::Integer, b::Integer)::Integer
+    if b == 0
+        return a
+    end
+    return gcd(b, a % b)
+end
+function down(n::Integer, x::Float64)
+    if n > 0
+        down(n - 1, x / 2)
+    else
+        println(x)
+    end
+end
+function fact(n::Integer)::Integer
+    if n < 2
+        return 1
+    end
+    return n * fact(n - 1)
+end
+function show(n::Integer)
+    if n > 0
+        show(n - 1)
+    end
+    println(n)
+end
+function main()
+    println(count(1000000, 0))
+    println(gcd(1071, 462))
+    down(1000000, 1.0)
+    println(fact(5))
+    show(2)
+end
+main()
+'''
+EXPECTED = '1000000\n21\n0.0\n120\n0\n1\n2\n'
+
+failed = []
+
+
+def method(code: str, name: str) -> str:
+    start = code.index(f".method public static {name}(")
+    return code[start:code.index('.end method', start)]
+
+
+print('Testing tail call elimination')
+compiler = Compiler(disabled_optimizations={'tail_call_elimination'})
+eliminating_compiler = Compiler()
+stats = CompileStats(None, 'tail_call_elimination')
+result = eliminating_compiler.compile_source(SOURCE, stats=stats)
+# the calls in tail position become jumps to the start of the method,
+# the calls, whose result is used (or that are followed by other statements), are kept
+if result.exit_code != 0 or stats.counters['tail_calls'] != 3 or \
+    any(f"invokestatic Main/{name}(" in method(result.code, name)
+        for name in ['count', 'gcd', 'down']) or \
+    any(not re.search(r"\tgoto label_\d+_entry\n", method(result.code, name))
+        for name in ['count', 'gcd', 'down']) or \
+    'invokestatic Main/fact(I)I' not in method(result.code, 'fact') or \
+    'invokestatic Main/show(I)V' not in method(result.code, 'show'):
+    failed.append('tail calls')
+    print(f"tail calls: FAILED ({stats.counters})\n{result.code}")
+
+# the debug info reports the tail calls of every method
+result = Compiler(debug=True).compile_source(SOURCE)
+if result.code.count('; DEBUG: tail call elimination; ') != 6 or \
+    result.code.count('; DEBUG: tail call elimination; 1 tail calls replaced\n') != 3:
+    failed.append('debug info')
+    print(f"debug info: FAILED\n{result.code}")
+
+# the parallel mode replaces the same calls
+if Compiler().compile_source(SOURCE, jobs=2).code != eliminating_compiler.compile_source(
+        SOURCE).code:
+    failed.append('parallel')
+    print('parallel: FAILED')
+
+# the recursion does not need a frame per call anymore
+# (the arguments are evaluated before the parameters are stored, e.g. gcd(b, a % b))
+with tempfile.TemporaryDirectory() as tmp_dir:
+    outputs = []
+    for compiler_ in [compiler, eliminating_compiler, Compiler(disabled_optimizations={
+            'constant_folding', 'dead_code_elimination', 'slot_allocation', 'peephole'})]:
+        result = compiler_.compile_source(SOURCE, 'Main', class_file=True)
+        with open(os.path.join(tmp_dir, 'Main.class'), 'wb') as f:
+            f.write(result.class_file)
+        process = subprocess.run(['java', '-cp', tmp_dir, 'Main'], capture_output=True,
+                                 text=True, timeout=10, check=False)
+        outputs.append((process.returncode, process.stdout,
+                        'StackOverflowError' in process.stderr))
+    if outputs[0][0] == 0 or not outputs[0][2] or outputs[1:] != [(0, EXPECTED, False)] * 2:
+        failed.append('output')
+        print(f"output: FAILED\n{outputs}")
+
+print('-' * 40)
+if failed:
+    print('Failed:')
+    print(failed)
+    sys.exit(1)
+print('All tests successfull.')
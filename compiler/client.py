@@ -0,0 +1,55 @@
+"""
+client for the persistent compile server (python -m compiler -server).
+
+python -m compiler.client [-socket SOCKET] -compile IN_FILE [...]
+accepts the same arguments as the compiler itself and returns the same
+stdout, stderr and exit code.
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+DEFAULT_SOCKET: Path = Path(tempfile.gettempdir()) / 'coba_compiler.sock'
+
+
+def request(socket_path: Path, args: list[str]) -> tuple[int, str, str]:
+    """
+    send the arguments to the compile server and wait for the result.
+    """
+    message: bytes = json.dumps({'args': args, 'cwd': os.getcwd()}).encode('utf-8') + b'\n'
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(message)
+        client.shutdown(socket.SHUT_WR)
+        response: bytes = b''
+        while chunk := client.recv(65536):
+            response += chunk
+    result: dict = json.loads(response.decode('utf-8'))
+    return result['exit_code'], result['stdout'], result['stderr']
+
+
+def entry_point() -> int:
+    """
+    forward the console arguments to the compile server.
+    """
+    args: list[str] = sys.argv[1:]
+    socket_path: Path = DEFAULT_SOCKET
+    if args[:1] == ['-socket'] and len(args) > 1:
+        socket_path = Path(args[1]).absolute()
+        args = args[2:]
+    try:
+        exit_code, out, err = request(socket_path, args)
+    except OSError as exception:
+        print('could not connect to the compile server:', socket_path, file=sys.stderr)
+        print(exception, file=sys.stderr)
+        return 1
+    print(out, end='', file=sys.stdout, flush=True)
+    print(err, end='', file=sys.stderr, flush=True)
+    return exit_code
+
+if __name__ == '__main__':
+    sys.exit(entry_point())
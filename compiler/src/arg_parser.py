@@ -8,8 +8,54 @@ from pathlib import Path
 
 try:
     from compiler import __doc__
+    from compiler.client import DEFAULT_SOCKET
+    from compiler.src.constants import INLINE_SIZE, OPTIMIZATIONS
 except ModuleNotFoundError:
     from __init__ import __doc__
+    from client import DEFAULT_SOCKET
+    from .constants import INLINE_SIZE, OPTIMIZATIONS
+
+
+class CompileOptions:
+    """
+    define the options of a single compilation
+    (passed on to the worker processes in batch/server mode)
+    """
+    def __init__(self, compile_: bool = True, debug: bool = False,
+                 use_cache: bool = True, stats_file: Path = None,
+                 class_file: bool = False, lexer: str = 'antlr',
+                 parallel_jobs: int = None, stream: bool = False,
+                 disabled_optimizations: frozenset[str] = frozenset(),
+                 inline_size: int = INLINE_SIZE) -> None:
+        # True -> Compile
+        # False -> Liveness
+        self.compile: bool = compile_
+        self.debug: bool = debug
+        self.use_cache: bool = use_cache
+        self.stats_file: Path = stats_file
+        # True -> .class file
+        # False -> Jasmin code
+        self.class_file: bool = class_file
+        # 'antlr' -> generated CoBaLexer
+        # 'regex' -> RegexLexer
+        self.lexer: str = lexer
+        # number of worker processes typechecking and generating the functions
+        # None -> serial
+        self.parallel_jobs: int = parallel_jobs
+        # True -> write every method as soon as it is generated
+        self.stream: bool = stream
+        # the optimizations, that are not applied (see OPTIMIZATIONS)
+        self.disabled_optimizations: frozenset[str] = disabled_optimizations
+        # the functions with at most this number of operands are inlined
+        self.inline_size: int = inline_size
+
+    @property
+    def output_suffix(self) -> str:
+        """
+        get the default extension of generated files.
+        """
+        return '.class' if self.class_file else '.j'
+
 
 class ArgParser:
     """
@@ -18,56 +64,161 @@ class ArgParser:
     def __init__(self) -> None:
         self.parser = ArgumentParser(description=__doc__)
         self.input_file: Path = None
+        self.input_files: list[Path] = []
         self.output_file: Path = None
         self.debug: bool = False
+        self.batch: bool = False
+        self.build: bool = False
+        self.parallel: bool = False
+        self.jobs: int = None
+        self.use_cache: bool = True
+        self.stats_file: Path = None
+        self.server: Path = None
+        self.queue_size: int = None
+        self.class_file: bool = False
+        self.stream: bool = False
+        self.disabled_optimizations: frozenset[str] = frozenset()
+        self.inline_size: int = INLINE_SIZE
+        self.lexer: str = 'antlr'
         # True -> Compile
         # False -> Liveness
         self.compile: bool = True
 
+    def get_options(self) -> CompileOptions:
+        """
+        get the options of a single compilation
+        """
+        return CompileOptions(self.compile, self.debug, self.use_cache, self.stats_file,
+                              self.class_file, self.lexer,
+                              (self.jobs or os.cpu_count() or 1) if self.parallel else None,
+                              self.stream, self.disabled_optimizations, self.inline_size)
 
-    def parse(self) -> None:
+    def parse(self, args: list[str] = None) -> None:
         """
-        parse the given arguments
+        parse the given arguments (default is sys.argv)
         """
         self.parser.add_argument('-compile', type=lambda p: Path(p).absolute(),
-                                 metavar='IN_FILE',
+                                 nargs='+', metavar='IN_FILE',
                                  help='compile the given Julia IN_FILE into Jasmin-Bytecode.')
         self.parser.add_argument('-liveness', type=lambda p: Path(p).absolute(),
-                                 metavar='IN_FILE',
+                                 nargs='+', metavar='IN_FILE',
                                  help='generate a register interference graph for the given IN_FILE.')
         self.parser.add_argument('-output', type=lambda p: Path(p).absolute(),
                                  metavar='OUT_FILE',
                                  help='specify the output OUT_FILE used for compilation.')
+        self.parser.add_argument('-classfile', action='store_true',
+                                 help='generate a .class file directly (without Jasmin).')
+        self.parser.add_argument('-stream', action='store_true',
+                                 help='write the Jasmin code method by method while ' + \
+                                     'generating it (bounded memory).')
+        self.parser.add_argument('-lexer', choices=['antlr', 'regex'], default='antlr',
+                                 help='choose the lexer backend (the generated ANTLR lexer ' + \
+                                     'or the faster regular expression lexer).')
+        self.parser.add_argument('-no-optimize', choices=OPTIMIZATIONS, nargs='*',
+                                 metavar='PASS',
+                                 help='disable the given optimization passes ' + \
+                                     f"({', '.join(OPTIMIZATIONS)}, default is all).")
+        self.parser.add_argument('-inline-size', type=int, default=INLINE_SIZE, metavar='N',
+                                 help='inline the functions with at most N operands ' + \
+                                     f"(default is {INLINE_SIZE}).")
         self.parser.add_argument('-debug', action='store_true',
                                  help='show additional debug information.')
-        params = self.parser.parse_args()
+        self.parser.add_argument('-stats', type=lambda p: Path(p).absolute(),
+                                 metavar='STATS_FILE',
+                                 help='append the time of every phase and work counters ' + \
+                                     'as json to the STATS_FILE.')
+        self.parser.add_argument('-no-cache', action='store_true',
+                                 help='do not use (or update) the compile cache.')
+        self.parser.add_argument('-batch', action='store_true',
+                                 help='process multiple files, directories or glob patterns ' + \
+                                     'using a pool of worker processes.')
+        self.parser.add_argument('-build', action='store_true',
+                                 help='compile and assemble multiple files into the output ' + \
+                                     'directory, skipping files that did not change.')
+        self.parser.add_argument('-parallel', action='store_true',
+                                 help='typecheck and generate the functions of the IN_FILE ' + \
+                                     'using a pool of worker processes.')
+        self.parser.add_argument('-jobs', type=int, metavar='N',
+                                 help='specify the number of worker processes used in batch ' + \
+                                     '(or parallel) mode.')
+        self.parser.add_argument('-server', type=lambda p: Path(p).absolute(),
+                                 nargs='?', const=DEFAULT_SOCKET, metavar='SOCKET',
+                                 help='run a persistent compile server listening on the ' + \
+                                     'given unix domain SOCKET.')
+        self.parser.add_argument('-queue', type=int, metavar='N',
+                                 help='specify the maximum number of waiting server requests.')
+        params = self.parser.parse_args(args)
 
-        compile_file: Path = getattr(params, 'compile')
-        liveness_file: Path = getattr(params, 'liveness')
+        compile_files: list[Path] = getattr(params, 'compile')
+        liveness_files: list[Path] = getattr(params, 'liveness')
         self.output_file = getattr(params, 'output')
         self.debug = getattr(params, 'debug')
+        self.class_file = getattr(params, 'classfile')
+        self.stream = getattr(params, 'stream')
+        no_optimize: list[str] = getattr(params, 'no_optimize')
+        if no_optimize is not None:
+            self.disabled_optimizations = frozenset(no_optimize or OPTIMIZATIONS)
+        self.inline_size = getattr(params, 'inline_size')
+        self.lexer = getattr(params, 'lexer')
+        self.use_cache = not getattr(params, 'no_cache')
+        self.stats_file = getattr(params, 'stats')
+        self.batch = getattr(params, 'batch')
+        self.build = getattr(params, 'build')
+        self.parallel = getattr(params, 'parallel')
+        self.jobs = getattr(params, 'jobs')
+        self.server = getattr(params, 'server')
+        self.queue_size = getattr(params, 'queue')
 
-        self.compile = compile_file is not None
-        liveness: bool = liveness_file is not None
+        if self.jobs is not None and self.jobs < 1:
+            raise ValueError('Specified number of jobs must be positive.')
+        if self.queue_size is not None and self.queue_size < 1:
+            raise ValueError('Specified queue size must be positive.')
+        if self.inline_size < 0:
+            raise ValueError('Specified inline size must not be negative.')
+
+        if self.server is not None:
+            if compile_files is not None or liveness_files is not None:
+                raise ValueError("'-server' can not be combined with '-compile' or '-liveness'.")
+            return
+
+        self.compile = compile_files is not None
+        liveness: bool = liveness_files is not None
 
         if self.compile == liveness:
             raise ValueError("Please choose between '-compile' and '-liveness'.")
 
-        self.input_file = compile_file if compile_file is not None else liveness_file
+        self.input_files = compile_files if compile_files is not None else liveness_files
+        self.input_file = self.input_files[0]
+
+        if self.build and not self.compile:
+            raise ValueError("'-build' can only be combined with '-compile'.")
+        if self.parallel and (not self.compile or self.batch or self.build):
+            raise ValueError("'-parallel' can only be combined with '-compile' (of a single file).")
+        if self.stream and (not self.compile or self.class_file or self.build):
+            raise ValueError("'-stream' can only be combined with '-compile' " + \
+                "(without '-classfile' or '-build').")
+        if self.batch or self.build:
+            # the output (if given) is the directory for all generated files
+            if self.output_file is not None and os.path.isfile(self.output_file):
+                raise ValueError('Specified output directory is not a directory.')
+            return
+        if len(self.input_files) > 1:
+            raise ValueError("Please use '-batch' or '-build' to process multiple files.")
 
         f_path, f_ext = os.path.splitext(self.input_file)
         if f_ext != '.jl':
             print("Warning: Input File is not of type '.jl'.")
 
         if self.compile:
+            output_suffix: str = self.get_options().output_suffix
             if self.output_file is None:
-                self.output_file = Path(f_path + '.j')
+                self.output_file = Path(f_path + output_suffix)
             if os.path.isdir(self.output_file):
                 raise ValueError('Specified output file is not a file.')
             if os.path.exists(self.output_file):
                 from time import sleep
                 print('Warning: Specified output file will be overwritten:', self.output_file)
-                if self.output_file.suffix != '.j' or self.output_file == self.input_file:
+                if self.output_file.suffix != output_suffix or self.output_file == self.input_file:
                     print('continuing in: ')
                     for i in range(3, -1, -1):
                         print(f"{i}...", end='', flush=True)
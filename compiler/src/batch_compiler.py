@@ -0,0 +1,165 @@
+"""
+define the BatchCompiler
+"""
+
+import glob
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from time import perf_counter
+
+try:
+    from compiler.src.arg_parser import CompileOptions
+except ModuleNotFoundError:
+    from .arg_parser import CompileOptions
+
+# the compiler module of the current worker process
+stups_compiler = None
+
+
+def init_worker() -> None:
+    """
+    import the compiler (and therefor the generated Lexer and Parser)
+    once per worker process.
+    """
+    global stups_compiler
+    try: # package import (python -m compiler ...)
+        from compiler import stups_compiler
+    except ModuleNotFoundError: # default import (python ./compiler/stups_compiler.py ...)
+        import stups_compiler
+    stups_compiler.preload()
+
+
+def compile_job(input_file: Path, output_file: Path,
+                options: CompileOptions) -> tuple[Path, int, str, str, float]:
+    """
+    compile a single file inside a worker process.
+    the output of the compiler is captured and returned together with the exit code.
+    """
+    if stups_compiler is None:
+        init_worker()
+    out, err = io.StringIO(), io.StringIO()
+    start: float = perf_counter()
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            exit_code: int = stups_compiler.compile_file(input_file, output_file, options)
+        except Exception as exception:
+            # behave like the custom exception handler (ignore traceback)
+            print(exception, file=sys.stderr)
+            exit_code = 1
+    return input_file, exit_code, out.getvalue(), err.getvalue(), perf_counter()-start
+
+
+class BatchCompiler:
+    """
+    compile (or analyse) multiple files using a pool of worker processes.
+    """
+    SUMMARY_TITLE: str = 'Batch Summary:'
+
+    def __init__(self, in_paths: list[Path], out_dir: Path,
+                 options: CompileOptions, jobs: int = None) -> None:
+        self.input_files: list[Path] = self.collect_input_files(in_paths)
+        self.out_dir: Path = out_dir
+        self.options: CompileOptions = options
+        self.jobs: int = jobs or os.cpu_count() or 1
+        self.results: dict[Path, int] = {}
+
+    @staticmethod
+    def collect_input_files(in_paths: list[Path]) -> list[Path]:
+        """
+        expand directories and glob patterns to the contained '.jl' files.
+        the order is kept and duplicates are removed.
+        """
+        input_files: dict[Path, None] = {}
+        for in_path in in_paths:
+            if in_path.is_dir():
+                matches = sorted(in_path.rglob('*.jl'))
+            elif in_path.is_file():
+                matches = [in_path]
+            else:
+                matches = sorted(Path(match).absolute() for match in glob.glob(
+                    str(in_path), recursive=True) if os.path.isfile(match))
+                if not matches:
+                    print('Warning: no input file found matching:', in_path)
+            for match in matches:
+                input_files[match] = None
+        return list(input_files)
+
+    def get_output_file(self, input_file: Path) -> Path:
+        """
+        get the output file of an input file.
+        default is the input-file with a .j (or .class) extension.
+        """
+        if not self.options.compile:
+            return None
+        if self.out_dir is None:
+            return input_file.with_suffix(self.options.output_suffix)
+        return self.out_dir / input_file.with_suffix(self.options.output_suffix).name
+
+    def check_output_files(self) -> None:
+        """
+        the files are compiled into the same output directory, therefor the names must be unique.
+        """
+        output_files: dict[Path, Path] = {}
+        for input_file in self.input_files:
+            output_file: Path = self.get_output_file(input_file)
+            if output_file is None:
+                return
+            if output_file in output_files:
+                raise ValueError(f"Duplicate output file '{output_file}': " + \
+                    f"{output_files[output_file]}, {input_file}")
+            output_files[output_file] = input_file
+
+    def run(self) -> int:
+        """
+        compile all files and print an aggregate summary.
+        returns the highest exit code of all files.
+        """
+        if not self.input_files:
+            raise ValueError('No input files found.')
+        if self.out_dir is not None:
+            self.check_output_files()
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+
+        jobs = [(input_file, self.get_output_file(input_file), self.options)
+                for input_file in self.input_files]
+        self.jobs = min(self.jobs, len(jobs))
+        start: float = perf_counter()
+        with ProcessPoolExecutor(max_workers=self.jobs,
+                                 initializer=init_worker) as executor:
+            # map keeps the order of the input files
+            for input_file, exit_code, out, err, _ in executor.map(compile_job, *zip(*jobs)):
+                print(out, end='', flush=True)
+                print(err, end='', file=sys.stderr, flush=True)
+                self.results[input_file] = exit_code
+        self.print_summary(perf_counter()-start)
+        return max(self.results.values())
+
+    def print_summary(self, duration: float) -> None:
+        """
+        print the aggregate summary of all processed files.
+        """
+        failed: dict[Path, int] = {input_file: exit_code for input_file, exit_code in
+                                   self.results.items() if exit_code != 0}
+        print(f"\n{self.SUMMARY_TITLE}")
+        print('-------------------------')
+        print(f"Files: {len(self.results)}, Successful: {len(self.results)-len(failed)}, " + \
+            f"Failed: {len(failed)}")
+        print(f"Parser Errors (1): {sum(code == 1 for code in failed.values())}, " + \
+            f"Symbol Table Errors (2): {sum(code == 2 for code in failed.values())}, " + \
+            f"Type Errors (3): {sum(code == 3 for code in failed.values())}")
+        for input_file, exit_code in failed.items():
+            print(f"{exit_code}: {input_file}")
+        for line in self.summary_details():
+            print(line)
+        print(f"Time: {duration:.3f}s ({self.jobs} jobs)")
+        print('-------------------------')
+
+    def summary_details(self) -> list[str]:
+        """
+        additional lines of the aggregate summary.
+        """
+        return []
@@ -0,0 +1,232 @@
+"""
+define the BuildCompiler
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+try:
+    from compiler.src.arg_parser import CompileOptions
+    from compiler.src.batch_compiler import BatchCompiler
+    from compiler.src.compile_cache import CompileCache, compiler_fingerprint
+    from compiler.src.compile_stats import CompileStats
+except ModuleNotFoundError:
+    from .arg_parser import CompileOptions
+    from .batch_compiler import BatchCompiler
+    from .compile_cache import CompileCache, compiler_fingerprint
+    from .compile_stats import CompileStats
+
+JASMIN_JAR: Path = Path(__file__).absolute().parents[2] / 'jasmin.jar'
+MANIFEST_NAME: str = '.coba_build.json'
+ASSEMBLER_ERROR: int = 4
+
+# the in-memory compiler of the current worker process
+compiler = None
+
+
+def init_build_worker(options: CompileOptions) -> None:
+    """
+    create the Compiler (and therefor the Lexer and Parser) once per worker process.
+    """
+    global compiler
+    try:
+        from compiler.src.compiler import Compiler
+    except ModuleNotFoundError:
+        from .compiler import Compiler
+    compiler = Compiler(options.debug, CompileCache() if options.use_cache else None,
+                        lexer=options.lexer,
+                        disabled_optimizations=options.disabled_optimizations,
+                        inline_size=options.inline_size)
+
+
+def build_job(input_file: Path, class_name: str, options: CompileOptions
+              ) -> tuple[Path, int, str, bytes, str, float]:
+    """
+    compile a single file in memory inside a worker process.
+    returns the Jasmin code (and the class file if requested) instead of writing them.
+    """
+    if compiler is None:
+        init_build_worker(options)
+    start: float = perf_counter()
+    stats: CompileStats = CompileStats(input_file, 'compile')
+    exit_code: int = 1
+    try:
+        result = compiler.compile_source(input_file.read_bytes(), class_name, stats)
+        if result.success and options.class_file:
+            compiler.assemble(result, input_file.name, stats)
+        exit_code = result.exit_code
+        err: str = ''.join(f"{input_file}: {diagnostic}\n" for diagnostic in result.diagnostics)
+        return input_file, exit_code, result.code, result.class_file, err, perf_counter()-start
+    except Exception as exception:
+        return input_file, exit_code, None, None, f"{input_file}: {exception}\n", \
+            perf_counter()-start
+    finally:
+        if options.stats_file is not None:
+            stats.write(options.stats_file, exit_code)
+
+
+def write_if_changed(out_file: Path, content: bytes) -> bool:
+    """
+    write a file only if its content changed (the mtime stays stable otherwise).
+    """
+    try:
+        if out_file.read_bytes() == content:
+            return False
+    except OSError:
+        pass
+    tmp_file: Path = out_file.with_name(f".{out_file.name}.{os.getpid()}.tmp")
+    tmp_file.write_bytes(content)
+    os.replace(tmp_file, out_file)
+    return True
+
+
+class BuildCompiler(BatchCompiler):
+    """
+    build class files from multiple files in one step:
+    compile all changed files using a pool of worker processes and assemble
+    all changed Jasmin files using a single Jasmin invocation (or the ClassWriter).
+    unchanged files are detected by the hash of their content.
+    """
+    SUMMARY_TITLE: str = 'Build Summary:'
+
+    def __init__(self, in_paths: list[Path], out_dir: Path,
+                 options: CompileOptions, jobs: int = None) -> None:
+        super().__init__(in_paths, out_dir or Path('build').absolute(), options, jobs)
+        self.manifest_file: Path = self.out_dir / MANIFEST_NAME
+        self.manifest: dict[str, dict[str, str]] = {}
+        self.up_to_date: int = 0
+        self.assembled: int = 0
+
+    def source_hash(self, input_file: Path, source: bytes) -> str:
+        """
+        hash everything the generated class depends on.
+        """
+        sha = hashlib.sha256(compiler_fingerprint().encode('utf-8'))
+        sha.update(f"{self.options.debug}:{self.options.class_file}:{input_file.stem}".encode())
+        sha.update(','.join(sorted(self.options.disabled_optimizations)).encode())
+        sha.update(f":{self.options.inline_size}".encode())
+        sha.update(b'\0' + source)
+        return sha.hexdigest()
+
+    def load_manifest(self) -> None:
+        """
+        load the hashes of the previous build.
+        """
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def save_manifest(self) -> None:
+        """
+        save the hashes of the current build.
+        """
+        write_if_changed(self.manifest_file,
+                         json.dumps(self.manifest, indent=1, sort_keys=True).encode('utf-8'))
+
+    def check_class_names(self) -> None:
+        """
+        every file becomes a class named after the file, therefor the names must be unique.
+        """
+        class_names: dict[str, Path] = {}
+        for input_file in self.input_files:
+            if input_file.stem in class_names:
+                raise ValueError(f"Duplicate class name '{input_file.stem}': " + \
+                    f"{class_names[input_file.stem]}, {input_file}")
+            class_names[input_file.stem] = input_file
+
+    def assemble(self, j_files: list[Path]) -> set[Path]:
+        """
+        assemble all given Jasmin files using a single JVM.
+        returns the Jasmin files that could not be assembled.
+        """
+        if not j_files:
+            return set()
+        for j_file in j_files:
+            j_file.with_suffix('.class').unlink(missing_ok=True)
+        try:
+            jasmin = subprocess.run(['java', '-jar', str(JASMIN_JAR), '-d', str(self.out_dir),
+                                     *map(str, j_files)], capture_output=True, text=True,
+                                    check=False)
+            # Jasmin reports errors on stdout
+            for line in (jasmin.stdout + jasmin.stderr).splitlines():
+                if not line.startswith('Generated: '):
+                    print(line, file=sys.stderr)
+        except OSError as exception:
+            print('could not run Jasmin:', exception, file=sys.stderr)
+        return {j_file for j_file in j_files if not j_file.with_suffix('.class').exists()}
+
+    def run(self) -> int:
+        """
+        build all files and print an aggregate summary.
+        returns the highest exit code of all files.
+        """
+        if not self.input_files:
+            raise ValueError('No input files found.')
+        self.check_class_names()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.load_manifest()
+        start: float = perf_counter()
+
+        jobs: list[tuple[Path, str, CompileOptions]] = []
+        source_hashes: dict[Path, str] = {}
+        for input_file in self.input_files:
+            source_hashes[input_file] = self.source_hash(input_file, input_file.read_bytes())
+            entry: dict[str, str] = self.manifest.get(input_file.stem, {})
+            if entry.get('source') == source_hashes[input_file] and \
+                (self.out_dir / f"{input_file.stem}.class").exists():
+                self.results[input_file] = 0
+                self.up_to_date += 1
+                continue
+            jobs.append((input_file, input_file.stem, self.options))
+
+        to_assemble: list[Path] = []
+        self.jobs = min(self.jobs, len(jobs))
+        if jobs:
+            with ProcessPoolExecutor(max_workers=self.jobs, initializer=init_build_worker,
+                                     initargs=(self.options,)) as executor:
+                for input_file, exit_code, code, class_file, err, _ in executor.map(
+                    build_job, *zip(*jobs)):
+                    print(err, end='', file=sys.stderr, flush=True)
+                    self.results[input_file] = exit_code
+                    self.manifest.pop(input_file.stem, None)
+                    if exit_code != 0:
+                        continue
+                    self.manifest[input_file.stem] = {'input': str(input_file),
+                                                      'source': source_hashes[input_file]}
+                    out_file: Path = self.out_dir / f"{input_file.stem}.class"
+                    if self.options.class_file:
+                        self.assembled += write_if_changed(out_file, class_file)
+                        continue
+                    j_file: Path = out_file.with_suffix('.j')
+                    # unchanged Jasmin code does not need to be assembled again
+                    if write_if_changed(j_file, code.encode('utf-8')) or not out_file.exists():
+                        to_assemble.append(j_file)
+
+        for j_file in self.assemble(to_assemble):
+            input_file: Path = next(input_file for input_file in self.input_files
+                                    if input_file.stem == j_file.stem)
+            self.results[input_file] = ASSEMBLER_ERROR
+            self.manifest.pop(input_file.stem, None)
+        self.assembled += sum(self.results[input_file] == 0 for input_file in self.input_files
+                              if self.out_dir / f"{input_file.stem}.j" in to_assemble)
+        self.save_manifest()
+        self.print_summary(perf_counter()-start)
+        return max(self.results.values())
+
+    def summary_details(self) -> list[str]:
+        """
+        additional lines of the aggregate summary.
+        """
+        failed: list[int] = [exit_code for exit_code in self.results.values() if exit_code != 0]
+        return [f"Up to date: {self.up_to_date}, " + \
+            f"Compiled: {len(self.results)-self.up_to_date}, Assembled: {self.assembled}, " + \
+            f"Assembler Errors ({ASSEMBLER_ERROR}): {failed.count(ASSEMBLER_ERROR)}",
+                f"Output: {self.out_dir}"]
@@ -0,0 +1,462 @@
+"""
+define the ClassWriter
+"""
+
+import struct
+
+FLOAT_MAX: float = struct.unpack('>f', b'\x7f\x7f\xff\xff')[0]
+FLOAT_MIN: float = struct.unpack('>f', b'\x00\x00\x00\x01')[0]
+
+ACCESS_FLAGS: dict[str, int] = {
+    'public': 0x0001, 'private': 0x0002, 'protected': 0x0004, 'static': 0x0008,
+    'final': 0x0010, 'synchronized': 0x0020, 'volatile': 0x0040, 'transient': 0x0080,
+    'native': 0x0100, 'interface': 0x0200, 'abstract': 0x0400, 'strict': 0x0800,
+}
+ACC_SUPER: int = 0x0020
+
+NEWARRAY_TYPES: dict[str, int] = {
+    'boolean': 4, 'char': 5, 'float': 6, 'double': 7,
+    'byte': 8, 'short': 9, 'int': 10, 'long': 11,
+}
+
+# instruction -> (opcode, operand kind)
+INSTRUCTIONS: dict[str, tuple[int, str]] = {}
+for opcode, names in enumerate([
+    'nop', 'aconst_null', 'iconst_m1', 'iconst_0', 'iconst_1', 'iconst_2', 'iconst_3',
+    'iconst_4', 'iconst_5', 'lconst_0', 'lconst_1', 'fconst_0', 'fconst_1', 'fconst_2',
+    'dconst_0', 'dconst_1']):
+    INSTRUCTIONS[names] = (opcode, 'none')
+INSTRUCTIONS.update({
+    'bipush': (0x10, 'byte'), 'sipush': (0x11, 'short'),
+    'ldc': (0x12, 'ldc'), 'ldc_w': (0x13, 'ldc_w'), 'ldc2_w': (0x14, 'ldc2_w'),
+    'iinc': (0x84, 'iinc'),
+    'newarray': (0xbc, 'newarray'), 'multianewarray': (0xc5, 'multianewarray'),
+    'goto_w': (0xc8, 'branch_w'), 'jsr_w': (0xc9, 'branch_w'), 'ret': (0xa9, 'local'),
+})
+for opcode, names in [(0x15, 'iload lload fload dload aload'),
+                      (0x36, 'istore lstore fstore dstore astore')]:
+    for i, name in enumerate(names.split()):
+        INSTRUCTIONS[name] = (opcode + i, 'local')
+        for n in range(4):
+            INSTRUCTIONS[f"{name}_{n}"] = (opcode + 5 + i * 4 + n, 'none')
+for opcode, names in [
+    (0x2e, 'iaload laload faload daload aaload baload caload saload'),
+    (0x4f, 'iastore lastore fastore dastore aastore bastore castore sastore pop pop2 dup ' + \
+        'dup_x1 dup_x2 dup2 dup2_x1 dup2_x2 swap iadd ladd fadd dadd isub lsub fsub dsub ' + \
+        'imul lmul fmul dmul idiv ldiv fdiv ddiv irem lrem frem drem ineg lneg fneg dneg ' + \
+        'ishl lshl ishr lshr iushr lushr iand land ior lor ixor lxor'),
+    (0x85, 'i2l i2f i2d l2i l2f l2d f2i f2l f2d d2i d2l d2f i2b i2c i2s lcmp fcmpl fcmpg ' + \
+        'dcmpl dcmpg'),
+    (0xac, 'ireturn lreturn freturn dreturn areturn return'),
+    (0xbe, 'arraylength athrow'), (0xc2, 'monitorenter monitorexit')]:
+    for i, name in enumerate(names.split()):
+        INSTRUCTIONS[name] = (opcode + i, 'none')
+for opcode, names in [(0x99, 'ifeq ifne iflt ifge ifgt ifle if_icmpeq if_icmpne if_icmplt ' + \
+                              'if_icmpge if_icmpgt if_icmple if_acmpeq if_acmpne goto jsr'),
+                      (0xc6, 'ifnull ifnonnull')]:
+    for i, name in enumerate(names.split()):
+        INSTRUCTIONS[name] = (opcode + i, 'branch')
+for opcode, names, kind in [(0xb2, 'getstatic putstatic getfield putfield', 'field'),
+                            (0xb6, 'invokevirtual invokespecial invokestatic', 'method'),
+                            (0xbb, 'new', 'class'), (0xbd, 'anewarray', 'class'),
+                            (0xc0, 'checkcast instanceof', 'class')]:
+    for i, name in enumerate(names.split()):
+        INSTRUCTIONS[name] = (opcode + i, kind)
+INSTRUCTIONS['invokenonvirtual'] = INSTRUCTIONS['invokespecial']
+INSTRUCTIONS['invokeinterface'] = (0xb9, 'interface')
+WIDE: int = 0xc4
+
+
+def modified_utf8(code_units: list[int]) -> bytes:
+    """
+    encode utf-16 code units as (java) modified utf-8.
+    """
+    encoded: bytearray = bytearray()
+    for unit in code_units:
+        if 0 < unit < 0x80:
+            encoded.append(unit)
+        elif unit < 0x800:
+            encoded += bytes([0xc0 | unit >> 6, 0x80 | unit & 0x3f])
+        else:
+            encoded += bytes([0xe0 | unit >> 12, 0x80 | unit >> 6 & 0x3f, 0x80 | unit & 0x3f])
+    return bytes(encoded)
+
+
+def utf16_units(text: str) -> list[int]:
+    """
+    get the utf-16 code units of a string.
+    """
+    encoded: bytes = text.encode('utf-16-be', 'surrogatepass')
+    return list(struct.unpack(f">{len(encoded) // 2}H", encoded))
+
+
+def parse_string(literal: str) -> list[int]:
+    """
+    parse a quoted string literal (with the escape sequences supported by Jasmin)
+    into utf-16 code units.
+    """
+    if len(literal) < 2 or literal[0] != '"' or literal[-1] != '"':
+        raise ValueError(f"invalid string constant: {literal}")
+    escapes: dict[str, str] = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f',
+                               '"': '"', "'": "'", '\\': '\\'}
+    text: str = literal[1:-1]
+    units: list[int] = []
+    i: int = 0
+    while i < len(text):
+        char: str = text[i]
+        i += 1
+        if char == '"':
+            raise ValueError(f"invalid string constant: {literal}")
+        if char != '\\':
+            units.extend(utf16_units(char))
+            continue
+        char = text[i] if i < len(text) else ''
+        i += 1
+        if char in escapes:
+            units.append(ord(escapes[char]))
+        elif char == 'u' and len(text[i:i+4]) == 4 and \
+            all(c in '0123456789abcdefABCDEF' for c in text[i:i+4]):
+            units.append(int(text[i:i+4], 16))
+            i += 4
+        elif char in '01234567':
+            # octal escapes: \7, \77 or \377
+            digits: str = char
+            max_digits: int = 3 if char in '0123' else 2
+            while len(digits) < max_digits and i < len(text) and text[i] in '01234567':
+                digits += text[i]
+                i += 1
+            units.append(int(digits, 8))
+        else:
+            raise ValueError(f"bad backslash escape sequence in string constant: {literal}")
+    return units
+
+
+def parse_number(literal: str) -> tuple[str, int | float]:
+    """
+    parse a numeric constant the way Jasmin does.
+    returns the constant pool type ('Float', 'Long' or 'Double') and the value.
+    """
+    if any(c in literal for c in '.eE') and not literal.lower().startswith(('0x', '-0x')):
+        value: float = float(literal)
+        # Jasmin prefers single precision (if the value is in range)
+        if value == 0.0 or FLOAT_MIN <= abs(value) <= FLOAT_MAX:
+            return 'Float', struct.unpack('>f', struct.pack('>f', value))[0]
+        return 'Double', value
+    value: int = int(literal, 16 if literal.lower().lstrip('-').startswith('0x') else 10)
+    if not -2**63 <= value < 2**63:
+        raise ValueError(f"number out of range: {literal}")
+    return 'Long', value
+
+
+class ConstantPool:
+    """
+    define the constant pool of a class file.
+    equal constants are only stored once.
+    """
+    def __init__(self) -> None:
+        self.entries: list[bytes] = []
+        self.indices: dict[tuple, int] = {}
+        # index 0 is not used
+        self.count: int = 1
+
+    def add(self, key: tuple, entry: bytes, slots: int = 1) -> int:
+        """
+        add an entry (if not already present) and return its index.
+        """
+        if key not in self.indices:
+            self.indices[key] = self.count
+            self.entries.append(entry)
+            self.count += slots
+            if self.count > 0xffff:
+                raise ValueError('too many constants in constant pool.')
+        return self.indices[key]
+
+    def utf8(self, text: str | list[int]) -> int:
+        """
+        add a CONSTANT_Utf8 (text or utf-16 code units).
+        """
+        units: list[int] = utf16_units(text) if isinstance(text, str) else text
+        encoded: bytes = modified_utf8(units)
+        if len(encoded) > 0xffff:
+            raise ValueError('string constant too long.')
+        return self.add(('Utf8', encoded), struct.pack('>BH', 1, len(encoded)) + encoded)
+
+    def class_(self, name: str) -> int:
+        """
+        add a CONSTANT_Class.
+        """
+        return self.add(('Class', name), struct.pack('>BH', 7, self.utf8(name)))
+
+    def string(self, units: list[int]) -> int:
+        """
+        add a CONSTANT_String.
+        """
+        return self.add(('String', tuple(units)), struct.pack('>BH', 8, self.utf8(units)))
+
+    def number(self, c_type: str, value: int | float) -> int:
+        """
+        add a CONSTANT_Integer, CONSTANT_Float, CONSTANT_Long or CONSTANT_Double.
+        """
+        tag, fmt, slots = {'Integer': (3, '>Bi', 1), 'Float': (4, '>Bf', 1),
+                           'Long': (5, '>Bq', 2), 'Double': (6, '>Bd', 2)}[c_type]
+        entry: bytes = struct.pack(fmt, tag, value)
+        # compare floats by their bit pattern (0.0 != -0.0, nan)
+        return self.add((c_type, entry), entry, slots)
+
+    def name_and_type(self, name: str, descriptor: str) -> int:
+        """
+        add a CONSTANT_NameAndType.
+        """
+        return self.add(('NameAndType', name, descriptor),
+                        struct.pack('>BHH', 12, self.utf8(name), self.utf8(descriptor)))
+
+    def member_ref(self, tag: int, owner: str, name: str, descriptor: str) -> int:
+        """
+        add a CONSTANT_Fieldref (9), CONSTANT_Methodref (10)
+        or CONSTANT_InterfaceMethodref (11).
+        """
+        return self.add((tag, owner, name, descriptor),
+                        struct.pack('>BHH', tag, self.class_(owner),
+                                    self.name_and_type(name, descriptor)))
+
+    def to_bytes(self) -> bytes:
+        """
+        get the encoded constant pool (including the count).
+        """
+        return struct.pack('>H', self.count) + b''.join(self.entries)
+
+
+class MethodWriter:
+    """
+    assemble the instructions of a single method.
+    labels are resolved to branch offsets after all instructions are known.
+    """
+    def __init__(self, constant_pool: ConstantPool, access_flags: int,
+                 name: str, descriptor: str) -> None:
+        self.constant_pool: ConstantPool = constant_pool
+        self.access_flags: int = access_flags
+        self.name: str = name
+        self.descriptor: str = descriptor
+        # defaults of Jasmin (if there is no .limit directive)
+        self.max_stack: int = 1
+        self.max_locals: int = 1
+        # (pc, encoded instruction or None, opcode, label) in order
+        self.instructions: list[tuple[int, bytes, int, str]] = []
+        self.labels: dict[str, int] = {}
+        self.pc: int = 0
+
+    def add_label(self, label: str) -> None:
+        """
+        define a label at the current position.
+        """
+        if label in self.labels:
+            raise ValueError(f"duplicate label: {label}")
+        self.labels[label] = self.pc
+
+    def emit(self, encoded: bytes, opcode: int = None, label: str = None) -> None:
+        """
+        append an encoded instruction (or a branch to a label).
+        """
+        self.instructions.append((self.pc, encoded, opcode, label))
+        self.pc += len(encoded) if label is None else (5 if opcode >= 0xc8 else 3)
+
+    def add_instruction(self, name: str, operand: str) -> None:
+        """
+        encode a single Jasmin instruction.
+        """
+        if name not in INSTRUCTIONS:
+            raise ValueError(f"unsupported instruction: {name}")
+        opcode, kind = INSTRUCTIONS[name]
+        args: list[str] = operand.split()
+        constant_pool: ConstantPool = self.constant_pool
+        if kind == 'none':
+            self.emit(bytes([opcode]))
+        elif kind == 'local':
+            index: int = int(args[0])
+            if index <= 0xff:
+                self.emit(bytes([opcode, index]))
+            else:
+                self.emit(struct.pack('>BBH', WIDE, opcode, index))
+        elif kind == 'iinc':
+            index, const = int(args[0]), int(args[1])
+            if index <= 0xff and -128 <= const <= 127:
+                self.emit(struct.pack('>BBb', opcode, index, const))
+            else:
+                self.emit(struct.pack('>BBHh', WIDE, opcode, index, const))
+        elif kind == 'byte':
+            self.emit(struct.pack('>Bb', opcode, int(args[0])))
+        elif kind == 'short':
+            self.emit(struct.pack('>Bh', opcode, int(args[0])))
+        elif kind in ['branch', 'branch_w']:
+            self.emit(b'', opcode, args[0])
+        elif kind in ['ldc', 'ldc_w', 'ldc2_w']:
+            if operand.startswith('"'):
+                index: int = constant_pool.string(parse_string(operand))
+            else:
+                c_type, value = parse_number(operand)
+                if kind == 'ldc2_w':
+                    # ldc2_w always loads a (two word) long or double
+                    c_type = 'Double' if c_type == 'Float' else c_type
+                elif c_type == 'Long':
+                    # Jasmin truncates the long to an int
+                    c_type, value = 'Integer', (value + 2**31) % 2**32 - 2**31
+                elif c_type == 'Double':
+                    raise ValueError(f"ldc can not load a double: {operand}")
+                index: int = constant_pool.number(c_type, value)
+            if kind == 'ldc' and index <= 0xff:
+                self.emit(bytes([opcode, index]))
+            else:
+                self.emit(struct.pack('>BH', opcode if kind == 'ldc2_w' else 0x13, index))
+        elif kind in ['method', 'interface']:
+            owner_name, descriptor = args[0].split('(', 1)
+            owner, name_ = owner_name.rsplit('/', 1)
+            if kind == 'method':
+                self.emit(struct.pack('>BH', opcode, constant_pool.member_ref(
+                    10, owner, name_, '(' + descriptor)))
+            else:
+                self.emit(struct.pack('>BHBB', opcode, constant_pool.member_ref(
+                    11, owner, name_, '(' + descriptor), int(args[1]), 0))
+        elif kind == 'field':
+            owner, name_ = args[0].rsplit('/', 1)
+            self.emit(struct.pack('>BH', opcode, constant_pool.member_ref(9, owner, name_,
+                                                                           args[1])))
+        elif kind == 'class':
+            self.emit(struct.pack('>BH', opcode, constant_pool.class_(args[0])))
+        elif kind == 'newarray':
+            self.emit(bytes([opcode, NEWARRAY_TYPES[args[0]]]))
+        elif kind == 'multianewarray':
+            self.emit(struct.pack('>BHB', opcode, constant_pool.class_(args[0]), int(args[1])))
+
+    def assemble_code(self) -> bytes:
+        """
+        resolve the labels and get the bytecode of the method.
+        """
+        code: bytearray = bytearray()
+        for pc, encoded, opcode, label in self.instructions:
+            if label is None:
+                code += encoded
+                continue
+            if label not in self.labels:
+                raise ValueError(f"undefined label: {label}")
+            offset: int = self.labels[label] - pc
+            if opcode >= 0xc8:
+                code += struct.pack('>Bi', opcode, offset)
+            elif -2**15 <= offset < 2**15:
+                code += struct.pack('>Bh', opcode, offset)
+            else:
+                raise ValueError(f"branch offset too large in method: {self.name}")
+        if len(code) >= 2**16:
+            raise ValueError(f"code too large in method: {self.name}")
+        return bytes(code)
+
+    def to_bytes(self) -> bytes:
+        """
+        get the encoded method_info (including the Code attribute).
+        """
+        code: bytes = self.assemble_code()
+        code_attribute: bytes = struct.pack('>HHI', self.max_stack, self.max_locals,
+                                            len(code)) + code + struct.pack('>HH', 0, 0)
+        return struct.pack('>HHHH', self.access_flags, self.constant_pool.utf8(self.name),
+                           self.constant_pool.utf8(self.descriptor), 1) + \
+            struct.pack('>HI', self.constant_pool.utf8('Code'), len(code_attribute)) + \
+            code_attribute
+
+
+class ClassWriter:
+    """
+    assemble the Jasmin code generated by the CodeGenerator into a class file,
+    without starting a JVM for the Jasmin assembler.
+    """
+    def __init__(self, source_file: str = None) -> None:
+        self.source_file: str = source_file
+        self.constant_pool: ConstantPool = ConstantPool()
+        self.version: tuple[int, int] = (45, 3)
+        self.access_flags: int = 0
+        self.class_name: str = None
+        self.super_name: str = 'java/lang/Object'
+        self.methods: list[MethodWriter] = []
+
+    @staticmethod
+    def split_line(line: str) -> tuple[str, str]:
+        """
+        split a line into its first word and the (uncommented) remainder.
+        """
+        line = line.strip()
+        if not line or line.startswith(';'):
+            return '', ''
+        parts: list[str] = line.split(None, 1)
+        operand: str = parts[1] if len(parts) > 1 else ''
+        if not operand.startswith('"'):
+            # comments start with a ';' after whitespace
+            operand = ' '.join(operand.replace('\t', ' ').split(' ;', 1)[0].split())
+        return parts[0], operand
+
+    def assemble(self, code: str) -> bytes:
+        """
+        assemble the Jasmin code into the bytes of a class file.
+        """
+        method: MethodWriter = None
+        for line_number, line in enumerate(code.split('\n'), start=1):
+            try:
+                word, operand = self.split_line(line)
+                if not word:
+                    continue
+                if word == '.bytecode':
+                    major, minor = (operand.split('.') + ['0'])[:2]
+                    self.version = (int(major), int(minor))
+                elif word == '.class':
+                    *flags, self.class_name = operand.split()
+                    self.access_flags = ACC_SUPER
+                    for flag in flags:
+                        self.access_flags |= ACCESS_FLAGS[flag]
+                elif word == '.super':
+                    self.super_name = operand
+                elif word == '.source':
+                    self.source_file = operand
+                elif word == '.method':
+                    *flags, signature = operand.split()
+                    access_flags: int = 0
+                    for flag in flags:
+                        access_flags |= ACCESS_FLAGS[flag]
+                    name, descriptor = signature.split('(', 1)
+                    method = MethodWriter(self.constant_pool, access_flags, name,
+                                          '(' + descriptor)
+                elif word == '.limit':
+                    kind, value = operand.split()
+                    if kind == 'stack':
+                        method.max_stack = int(value)
+                    elif kind == 'locals':
+                        method.max_locals = int(value)
+                elif word == '.end':
+                    self.methods.append(method)
+                    method = None
+                elif word.endswith(':') and not operand:
+                    method.add_label(word[:-1])
+                elif method is not None:
+                    method.add_instruction(word, operand)
+                else:
+                    raise ValueError(f"unexpected statement: {word}")
+            except (ValueError, KeyError, IndexError, AttributeError, struct.error) as exception:
+                raise ValueError(f"line {line_number}: {exception}") from exception
+        if self.class_name is None:
+            raise ValueError('missing class name.')
+        return self.to_bytes()
+
+    def to_bytes(self) -> bytes:
+        """
+        get the encoded class file.
+        """
+        constant_pool: ConstantPool = self.constant_pool
+        this_class: int = constant_pool.class_(self.class_name)
+        super_class: int = constant_pool.class_(self.super_name)
+        methods: bytes = b''.join(method.to_bytes() for method in self.methods)
+        attributes: bytes = struct.pack('>H', 0)
+        if self.source_file is not None:
+            attributes = struct.pack('>HHIH', 1, constant_pool.utf8('SourceFile'), 2,
+                                     constant_pool.utf8(self.source_file))
+        # the constant pool is complete after all other parts are encoded
+        return struct.pack('>IHH', 0xcafebabe, self.version[1], self.version[0]) + \
+            constant_pool.to_bytes() + \
+            struct.pack('>HHHHHH', self.access_flags, this_class, super_class, 0, 0,
+                        len(self.methods)) + \
+            methods + attributes
@@ -2,16 +2,57 @@
 define the CodeGenerator
 """
 
-from antlr4.ParserRuleContext import ParserRuleContext
+from typing import TextIO
 
 try:
-    from compiler.src.CoBaParser import CoBaParser
-    from compiler.src.CoBaParserVisitor import CoBaParserVisitor
-    from compiler.src.type_checker_helper import ValidTypes, SymbolTable, FunctionSymbol
+    from compiler.src import ir
+    from compiler.src.compile_cache import CompileCache
+    from compiler.src.constant_folding import ConstantFolding
+    from compiler.src.constants import INLINE_SIZE
+    from compiler.src.dead_code_elimination import DeadCodeElimination
+    from compiler.src.graphs import CFGraph
+    from compiler.src.inliner import Inliner
+    from compiler.src.peephole import PeepholeOptimizer, max_stack_size
+    from compiler.src.slot_allocation import SlotAllocation
+    from compiler.src.tail_call_elimination import TailCallElimination
+    from compiler.src.tree_walker import IterativeVisitor
+    from compiler.src.type_checker_helper import ValidTypes, SymbolTable, FunctionSymbol, \
+        FunctionSignature
 except ModuleNotFoundError:
-    from .CoBaParser import CoBaParser
-    from .CoBaParserVisitor import CoBaParserVisitor
-    from .type_checker_helper import ValidTypes, SymbolTable, FunctionSymbol
+    from . import ir
+    from .compile_cache import CompileCache
+    from .constant_folding import ConstantFolding
+    from .constants import INLINE_SIZE
+    from .dead_code_elimination import DeadCodeElimination
+    from .graphs import CFGraph
+    from .inliner import Inliner
+    from .peephole import PeepholeOptimizer, max_stack_size
+    from .slot_allocation import SlotAllocation
+    from .tail_call_elimination import TailCallElimination
+    from .tree_walker import IterativeVisitor
+    from .type_checker_helper import ValidTypes, SymbolTable, FunctionSymbol, FunctionSignature
+
+
+# operator -> instruction (without the type prefix 'i'/'d')
+ARITHMETIC_OPERATIONS: dict[str, str] = {'*': 'mul', '/': 'div', '%': 'rem', '+': 'add', '-': 'sub'}
+# operator -> condition of the branch instruction
+COMPARISON_CONDITIONS: dict[str, str] = {'!=': 'ne', '==': 'eq', '<': 'lt', '>': 'gt',
+                                         '<=': 'le', '>=': 'ge'}
+# comparison operator -> negated comparison operator
+NEGATED_OPERATORS: dict[str, str] = {'!=': '==', '==': '!=', '<': '>=', '>': '<=',
+                                     '<=': '>', '>=': '<'}
+# return type -> return instruction
+RETURN_INSTRUCTIONS: dict[str, str] = {ValidTypes.Integer: 'ireturn', ValidTypes.Boolean: 'ireturn',
+                                       ValidTypes.Float64: 'dreturn', ValidTypes.String: 'areturn',
+                                       None: 'return'}
+
+
+def count_instructions(code: str) -> int:
+    """
+    count the instructions of Jasmin code (without labels and directives).
+    """
+    return sum(line.startswith('\t') and not line.startswith('\t.')
+               for line in code.split('\n'))
 
 
 def gen_next_label_id() -> str:
@@ -24,6 +65,22 @@ def gen_next_label_id() -> str:
         id_ += 1
 
 
+class Condition:
+    """
+    define a Bool expression, that is compiled as a jump to the label
+    (if its value is jump_if, otherwise the code falls through).
+    """
+    __slots__ = ('node', 'label', 'jump_if')
+
+    def __init__(self, node: ir.Node, label: str, jump_if: bool) -> None:
+        self.node: ir.Node = node
+        self.label: str = label
+        self.jump_if: bool = jump_if
+
+    def accept(self, visitor):
+        return visitor.visitCondition(self)
+
+
 class StackSize:
     """
     define an object to calculate the stack size
@@ -59,270 +116,371 @@ class StackSize:
         """
         return self.max_stack_size
 
-class CodeGenerator(CoBaParserVisitor):
+class CodeGenerator(IterativeVisitor):
     """
-    generate Jasmin ByteCode.
+    generate Jasmin ByteCode from the IR.
+    children are visited by yielding them (see IterativeVisitor).
+    the code of the current method is collected as a list of lines,
+    every finished method is joined once (the whole code only when it is needed).
+    if an out_file is given, every finished method is written to it right away instead
+    (streaming), so only the current method is kept in memory.
+    the small functions are inlined at their call sites by the Inliner (unless 'inlining'
+    is disabled, see inline_size), the calls of a function to itself in tail position
+    become jumps by the TailCallElimination (unless 'tail_call_elimination' is disabled),
+    the IR of every function is optimized by the ConstantFolding (unless 'constant_folding'
+    is disabled) and the DeadCodeElimination (unless 'dead_code_elimination' is disabled),
+    its variables share slots by the SlotAllocation (unless 'slot_allocation' is disabled)
+    and every method is optimized by the PeepholeOptimizer (unless 'peephole' is disabled).
     """
-    def __init__(self, symbol_table: SymbolTable, file_name: str, debug: bool) -> None:
+    def __init__(self, symbol_table: SymbolTable, file_name: str, debug: bool,
+                 cache: CompileCache = None, out_file: TextIO = None,
+                 disabled_optimizations: frozenset[str] = frozenset(),
+                 inline_size: int = INLINE_SIZE) -> None:
         self.symbol_table: SymbolTable = symbol_table
         self.file_name: str = file_name
         self.debug: bool = debug
+        self.cache: CompileCache = cache
+        self.out_file: TextIO = out_file
+        self.disabled_optimizations: frozenset[str] = disabled_optimizations
+        self.inline_size: int = inline_size
+        self.inliner: Inliner = None
+        if 'inlining' not in disabled_optimizations:
+            self.inliner = Inliner(symbol_table, inline_size)
+        self.tail_call_elimination: TailCallElimination = None
+        if 'tail_call_elimination' not in disabled_optimizations:
+            self.tail_call_elimination = TailCallElimination()
+        self.constant_folding: ConstantFolding = None
+        if 'constant_folding' not in disabled_optimizations:
+            self.constant_folding = ConstantFolding()
+        self.dead_code_elimination: DeadCodeElimination = None
+        if 'dead_code_elimination' not in disabled_optimizations:
+            self.dead_code_elimination = DeadCodeElimination(symbol_table)
+        self.slot_allocation: SlotAllocation = None
+        if 'slot_allocation' not in disabled_optimizations:
+            self.slot_allocation = SlotAllocation(symbol_table)
+        self.peephole: PeepholeOptimizer = None
+        if 'peephole' not in disabled_optimizations:
+            self.peephole = PeepholeOptimizer()
 
         self.label_gen = gen_next_label_id()
 
         self.current_function: FunctionSymbol = None
-        self.variable_ids: dict[str, int] = {}
-        self.code: str = ''
+        # the class header and the finished methods
+        self.methods: list[str] = []
+        # the lines of the current method
+        self.method: list[str] = []
+        # the index of the '.limit stack' line of the current method (known at the end)
+        self.limit_stack_index: int = None
+        # the label at the start of the current method (the target of the tail calls)
+        self.entry_label: str = None
+        self.instructions: int = 0
 
         self.stack_size = StackSize()
 
+    @property
+    def code(self) -> str:
+        """
+        get the generated code of the class (None if it was streamed to the out_file).
+        """
+        if self.out_file is not None:
+            return None
+        return ''.join(self.methods)
+
     def generate(self, out_file: str) -> None:
         """
         write the bytecode to a file.
         """
         with open(out_file, 'w', encoding='utf-8') as f:
-            f.write(self.code)
-
-    def set_var_ids(self, f_vars: dict[str, str]) -> int:
-        """
-        assign each local variable a distinguishable number/id
-        """
-        self.variable_ids.clear()
-        c_id: int = 0
-        for v_name, v_type in f_vars.items():
-            self.variable_ids[v_name] = c_id
-            # float64 needs two variable spaces
-            c_id += 1 + (v_type == ValidTypes.Float64)
-        # return number of variables to generate '.limit locals'
-        return c_id
-
-    def debug_info(self, ctx: ParserRuleContext, info: str = '', ctx_text: bool = True) -> None:
-        """
-        add additional info to the generated output
-        """
-        if not self.debug:
-            return
-        last_line: int = self.code.rfind('\n')+1
-        debug_info = f"; DEBUG: {ctx.start.line}:{ctx.start.column}"
-        debug_info += f"-{ctx.stop.line}:{ctx.stop.column}"
-        if info:
-            debug_info += f"; {info}"
-        if ctx_text:
-            debug_info += f"; txt = {ctx.getText()}"
-        debug_info += '\n'
-        self.code = self.code[:last_line] + debug_info + self.code[last_line:]
-
-    def visitMain(self, ctx: CoBaParser.MainContext):
-        # generate skeleton code
-        self.code += '.bytecode 50.0\n'
-        self.code += f".class public {self.file_name}\n"
-        self.code += '.super java/lang/Object\n\n'
-        self.code += '.method public <init>()V\n'
-        self.code += '\taload_0\n'
-        self.code += '\tinvokenonvirtual java/lang/Object/<init>()V\n'
-        self.code += '\treturn\n'
-        self.code += '.end method\n\n'
-        self.visitChildren(ctx)
-
-    def visitMain_function(self, ctx:CoBaParser.Main_functionContext):
-        # compute a new stack
-        self.stack_size.reset_stack()
-        self.visitChildren(ctx)
-        # set the actually needed stack size
-        self.code = self.code.replace('.limit stack -',
-                                      f".limit stack {self.stack_size.get_stack_size()}")
-        self.code += '.end method\n\n'
-
-    def visitMain_function_header(self, ctx: CoBaParser.Main_function_headerContext):
-        current_function_name: str = ctx.K_MAIN().getText()
-        self.current_function = self.symbol_table.get_function(current_function_name)
-        # main methods have always the same structure in this project
-        self.code += '.method public static main([Ljava/lang/String;)V\n'
-        local_var_count: int = self.set_var_ids(self.current_function.local_variables)
-        self.code += f"\t.limit locals {local_var_count}\n"
-        # this line will be replaced later with an actual value:
-        self.code += '\t.limit stack -\n\n'
+            f.writelines(self.methods)
+
+    def count_instructions(self) -> int:
+        """
+        count the generated instructions (without labels and directives).
+        """
+        return self.instructions
+
+    def optimization_counters(self) -> dict[str, int]:
+        """
+        get the work counters of the optimizations (e.g. the hits of every peephole rule).
+        """
+        counters: dict[str, int] = {}
+        if self.inliner is not None:
+            counters.update(self.inliner.counters)
+        if self.tail_call_elimination is not None:
+            counters.update(self.tail_call_elimination.counters)
+        if self.constant_folding is not None:
+            counters.update(self.constant_folding.counters)
+        if self.dead_code_elimination is not None:
+            counters.update(self.dead_code_elimination.counters)
+        if self.slot_allocation is not None:
+            counters.update(self.slot_allocation.counters)
+        if self.peephole is not None:
+            counters.update({f"peephole_{rule}": hits for rule, hits in self.peephole.hits.items()})
+        return counters
+
+    def add_method(self, method: str) -> None:
+        """
+        add a finished method (or the class header) to the code or write it to the out_file.
+        """
+        self.instructions += count_instructions(method)
+        if self.out_file is not None:
+            self.out_file.write(method)
+        else:
+            self.methods.append(method)
 
-    def visitFunction(self, ctx: CoBaParser.FunctionContext):
+    def emit(self, code: str) -> None:
+        """
+        add (whole) lines of code to the current method.
+        """
+        self.method.append(code)
+
+    def method_cache_key(self, function: ir.Function) -> str:
+        """
+        generate the cache key of a (main-)function. the generated method only depends on
+        the function text, the class name, the signatures of the called functions
+        and the text of the functions, that can be inlined into it.
+        """
+        if self.cache is None:
+            return None
+        key_parts: list[str] = [self.file_name, function.source]
+        if self.debug:
+            # the debug info contains the position of every instruction
+            key_parts.append(f"{function.line}:{function.column}")
+        for f_table in function.calls:
+            key_parts.append(f"{f_table.f_name}{f_table.signature}")
+        if self.inliner is not None:
+            key_parts.append(str(self.inline_size))
+            for f_name in self.inliner.dependencies(function.name):
+                inlined: ir.Function = self.inliner.functions.get(f_name)
+                key_parts.append(f"{f_name}:{None if inlined is None else inlined.source}")
+        return self.cache.key('method', self.debug, ','.join(sorted(self.disabled_optimizations)),
+                              *key_parts)
+
+    def debug_info(self, node: ir.Node) -> None:
+        """
+        add additional info to the generated output (before the code of the node)
+        """
+        if node.debug is not None:
+            self.method.append(node.debug)
+
+    def gen_class_header(self) -> str:
+        """
+        generate the skeleton code of the class (followed by the methods)
+        """
+        code: str = '.bytecode 50.0\n'
+        code += f".class public {self.file_name}\n"
+        code += '.super java/lang/Object\n\n'
+        code += '.method public <init>()V\n'
+        code += '\taload_0\n'
+        code += '\tinvokenonvirtual java/lang/Object/<init>()V\n'
+        code += '\treturn\n'
+        code += '.end method\n\n'
+        return code
+
+    def visitProgram(self, program: ir.Program):
+        # generate skeleton code
+        self.add_method(self.gen_class_header())
+        if self.inliner is not None:
+            for function in program.functions:
+                self.inliner.add_function(function)
+        for i, function in enumerate(program.functions):
+            yield function
+            if self.out_file is not None:
+                # the IR of a streamed method is not needed anymore
+                program.functions[i] = None
+
+    def visitFunction(self, function: ir.Function):
+        # generate a method for a (main-)function or reuse the cached method.
+        cache_key: str = self.method_cache_key(function)
+        if cache_key is not None:
+            cache_entry: dict = self.cache.get(cache_key)
+            if cache_entry is not None:
+                self.add_method(cache_entry['code'])
+                return
+        inlined_calls: int = 0
+        if self.inliner is not None:
+            inlined_calls = self.inliner.inline(function)
+        tail_calls: int = 0
+        if self.tail_call_elimination is not None:
+            tail_calls = self.tail_call_elimination.eliminate(function)
+        if self.constant_folding is not None:
+            self.constant_folding.visit(function)
+        cf_graph: CFGraph = None
+        if self.dead_code_elimination is not None:
+            cf_graph = self.dead_code_elimination.eliminate(function)
+        if self.slot_allocation is not None:
+            self.slot_allocation.allocate(function, cf_graph)
+        self.method = []
         # compute a new stack
         self.stack_size.reset_stack()
-        self.visitChildren(ctx)
-        # set the actually needed stack size
-        self.code = self.code.replace('.limit stack -',
-                                      f".limit stack {self.stack_size.get_stack_size()}")
-        self.code += '.end method\n\n'
-
-    def visitFunction_header(self, ctx: CoBaParser.Function_headerContext):
-        current_function_name: str = ctx.IDENTIFIER().getText()
-        self.current_function = self.symbol_table.get_function(current_function_name)
-        self.code += f".method public static {current_function_name}("
-        # generate the code for parameters
-        for p_type in self.current_function.parameters.values():
-            if p_type in [ValidTypes.Integer, ValidTypes.Boolean]:
-                self.code += 'I'
-            elif p_type == ValidTypes.Float64:
-                self.code += 'D'
-            elif p_type == ValidTypes.String:
-                self.code += 'Ljava/lang/String;'
-        self.code += ')'
-        # generate the code for return type
-        f_type: str = self.current_function.f_type
-        if f_type in [ValidTypes.Integer, ValidTypes.Boolean]:
-            self.code += 'I'
-        elif f_type == ValidTypes.Float64:
-            self.code += 'D'
-        elif f_type == ValidTypes.String:
-            self.code += 'Ljava/lang/String;'
-        else:
-            self.code += 'V'
-        self.code += '\n'
-        local_var_count: int = self.set_var_ids(self.current_function.local_variables)
-        self.code += f"\t.limit locals {local_var_count}\n"
+        # labels are local to a method, so every method numbers its labels from 0
+        # (the method does not depend on the other methods)
+        self.label_gen = gen_next_label_id()
+        self.current_function = function.symbol
+        # the descriptor of main methods always is '([Ljava/lang/String;)V' in this project
+        self.emit(f".method public static {function.name}{function.symbol.signature.descriptor}\n")
+        self.emit(f"\t.limit locals {function.locals_size}\n")
+        if self.debug and self.inliner is not None:
+            self.emit(f"; DEBUG: inlining; {inlined_calls} calls inlined\n")
+        if self.debug and self.tail_call_elimination is not None:
+            self.emit(f"; DEBUG: tail call elimination; {tail_calls} tail calls replaced\n")
+        if self.debug and self.dead_code_elimination is not None:
+            unreachable, dead_stores = self.dead_code_elimination.eliminated[function.name]
+            self.emit(f"; DEBUG: dead code elimination; {unreachable} unreachable statements " + \
+                f"and {len(dead_stores)} dead stores ({', '.join(dead_stores)}) removed\n")
+        if self.debug and self.slot_allocation is not None:
+            locals_size: int = self.slot_allocation.locals_sizes[function.name][0]
+            self.emit(f"; DEBUG: slot allocation; {locals_size - function.locals_size} " + \
+                f"of {locals_size} locals saved\n")
         # this line will be replaced later with an actual value:
-        self.code += '\t.limit stack -\n\n'
-
-    def visitFunction_body(self, ctx: CoBaParser.Function_bodyContext):
-        self.visitChildren(ctx)
+        self.limit_stack_index = len(self.method)
+        self.emit(None)
+        self.entry_label = None
+        if tail_calls:
+            self.entry_label = f"label_{next(self.label_gen)}_entry"
+            self.emit(f"{self.entry_label}:\n")
+        for statement in function.body:
+            yield statement
         # in case the function does not have a return statement, we just add one.
         # technically only void functions are allowed to not have one ...
         # but these cases should be cought by the type checker
-        if ctx.return_statement() is None:
-            self.code += '\treturn\n'
-
-    def visitReturn_statement(self, ctx: CoBaParser.Return_statementContext):
-        self.debug_info(ctx, 'return')
-        self.visitChildren(ctx)
+        if not function.has_return:
+            self.emit('\treturn\n')
+        # set the actually needed stack size
+        stack_size: int = self.stack_size.get_stack_size()
+        if self.peephole is not None:
+            body_start: int = self.limit_stack_index + 1
+            self.method[body_start:] = self.peephole.optimize(self.method[body_start:])
+            # the optimized code may need a different stack size
+            stack_size = max_stack_size(self.method[body_start:])
+        self.method[self.limit_stack_index] = f"\t.limit stack {stack_size}\n\n"
+        self.emit('.end method\n\n')
+        method: str = ''.join(self.method)
+        self.add_method(method)
+        self.method = []
+        if cache_key is not None:
+            self.cache.put(cache_key, {'code': method})
+
+    def visitReturn(self, node: ir.Return):
+        self.debug_info(node)
+        if node.value is not None:
+            yield node.value
         # generate code of the return statement based on the function return type
-        f_type = self.current_function.f_type
-        if f_type in [ValidTypes.Integer, ValidTypes.Boolean]:
-            self.code += '\tireturn\n'
-            self.stack_size.decrease_stack(1)
-        elif f_type == ValidTypes.Float64:
-            self.code += '\tdreturn\n'
-            self.stack_size.decrease_stack(2)
-        elif f_type == ValidTypes.String:
-            self.code += '\tareturn\n'
-            self.stack_size.decrease_stack(1)
-        else:
-            self.code += '\treturn\n'
-
-    def visitFunction_call(self, ctx: CoBaParser.Function_callContext):
-        self.debug_info(ctx, 'function_call')
-        self.visitChildren(ctx)
-        if ctx.IDENTIFIER() is not None:
-            f_table: FunctionSymbol = self.symbol_table.get_function(ctx.IDENTIFIER().getText())
-            # generate the parameters for the function
-            self.code += f"\tinvokestatic {self.file_name}/{f_table.f_name}("
-            for p_type in f_table.parameters.values():
-                if p_type in [ValidTypes.Integer, ValidTypes.Boolean]:
-                    self.code += 'I'
-                    self.stack_size.decrease_stack(1)
-                elif p_type == ValidTypes.Float64:
-                    self.code += 'D'
-                    self.stack_size.decrease_stack(2)
-                elif p_type == ValidTypes.String:
-                    self.code += 'Ljava/lang/String;'
-                    self.stack_size.decrease_stack(1)
-            self.code += ')'
-            # generate the return type
-            if f_table.f_type in [ValidTypes.Integer, ValidTypes.Boolean]:
-                self.code += 'I'
-                self.stack_size.increase_stack(1)
-            elif f_table.f_type == ValidTypes.Float64:
-                self.code += 'D'
-                self.stack_size.increase_stack(2)
-            elif f_table.f_type == ValidTypes.String:
-                self.code += 'Ljava/lang/String;'
-                self.stack_size.increase_stack(1)
-            else:
-                self.code += 'V'
-            self.code += '\n\n'
+        signature: FunctionSignature = self.current_function.signature
+        self.emit(f"\t{RETURN_INSTRUCTIONS[signature.return_type]}\n")
+        self.stack_size.decrease_stack(signature.return_width)
+
+    def visitTailCall(self, node: ir.TailCall):
+        # the arguments are evaluated onto the stack before any parameter is stored
+        # (the last argument is on top), then the method starts again
+        self.debug_info(node)
+        for argument in node.arguments:
+            yield argument
+        for parameter in reversed(node.parameters):
+            self.store(parameter.type, parameter.type, parameter.slot)
+        self.emit(f"\tgoto {self.entry_label}\n")
+
+    def visitCall(self, node: ir.Call):
+        self.debug_info(node)
+        for argument in node.arguments:
+            yield argument
+        f_table: FunctionSymbol = node.function
+        if f_table.f_name != 'main':
+            signature: FunctionSignature = f_table.signature
+            self.emit(f"\tinvokestatic {self.file_name}/{f_table.f_name}{signature.descriptor}\n\n")
+            # the arguments are replaced by the return value
+            self.stack_size.decrease_stack(signature.argument_width)
+            self.stack_size.increase_stack(signature.return_width)
             return f_table.f_type
-        elif ctx.K_MAIN() is not None:
-            # in case the main method gets called recursively we need to create a new
-            # (empty) String array
-            f_name: str = ctx.K_MAIN().getText()
-            self.code += '\ticonst_0\n\tanewarray java/lang/String\n'
-            self.code += f"\tinvokestatic {self.file_name}/{f_name}([Ljava/lang/String;)V\n\n"
-            self.stack_size.increase_stack(1)
-            self.stack_size.decrease_stack(1)
-            return None
+        # in case the main method gets called recursively we need to create a new
+        # (empty) String array
+        self.emit('\ticonst_0\n\tanewarray java/lang/String\n')
+        self.emit(f"\tinvokestatic {self.file_name}/{f_table.f_name}" + \
+            f"{f_table.signature.descriptor}\n\n")
+        self.stack_size.increase_stack(1)
+        self.stack_size.decrease_stack(1)
+        return None
 
-    def visitDeclaration(self, ctx: CoBaParser.DeclarationContext):
-        self.debug_info(ctx, 'declaration')
-        e_type: str = self.visit(ctx.expression())
-        v_name = ctx.IDENTIFIER().getText()
-        v_type = self.current_function.local_variables[v_name]
-        v_id = self.variable_ids[v_name]
-        # generate the code based on the data type of the variable
-        # to store in and the expression to store
-        if v_type in [ValidTypes.Integer, ValidTypes.Boolean]:
-            self.code += f"\tistore {v_id}\n\n"
-            self.stack_size.decrease_stack(1)
-        elif v_type == ValidTypes.Float64:
-            if e_type == ValidTypes.Integer:
-                self.code += '\ti2d\n'
-                self.stack_size.increase_stack(1)
-            self.code += f"\tdstore {v_id}\n\n"
-            self.stack_size.decrease_stack(2)
-        elif v_type == ValidTypes.String:
-            self.code += f"\tastore {v_id}\n\n"
-            self.stack_size.decrease_stack(1)
+    def visitInline(self, node: ir.Inline):
+        yield from self.gen_inline_body(node)
+        if node.value is not None:
+            yield node.value
+        return node.type
 
-    def visitAssignement(self, ctx: CoBaParser.AssignementContext):
-        self.debug_info(ctx, 'assignement')
-        e_type: str = self.visit(ctx.expression())
-        v_name = ctx.IDENTIFIER().getText()
-        v_type = self.current_function.local_variables[v_name]
-        v_id = self.variable_ids[v_name]
+    def gen_inline_body(self, node: ir.Inline):
+        """
+        generate an inlined call without its value: the arguments are stored into the
+        parameters (the last argument is on top), then the body is generated.
+        """
+        self.debug_info(node)
+        for argument in node.arguments:
+            yield argument
+        for parameter in reversed(node.parameters):
+            self.store(parameter.type, parameter.type, parameter.slot)
+        for statement in node.body:
+            yield statement
+
+    def visitAssignment(self, node: ir.Assignment):
+        self.debug_info(node)
+        e_type: str = yield node.value
+        self.store(node.type, e_type, node.slot)
+
+    def store(self, v_type: str, e_type: str, v_id: int) -> None:
+        """
+        store the value on top of the stack (of type e_type) into a variable.
+        """
         # generate the code based on the data type of the variable
         # to store in and the expression to store
         if v_type in [ValidTypes.Integer, ValidTypes.Boolean]:
-            self.code += f"\tistore {v_id}\n\n"
+            self.emit(f"\tistore {v_id}\n\n")
             self.stack_size.decrease_stack(1)
         elif v_type == ValidTypes.Float64:
             if e_type == ValidTypes.Integer:
-                self.code += '\ti2d\n'
+                self.emit('\ti2d\n')
                 self.stack_size.increase_stack(1)
-            self.code += f"\tdstore {v_id}\n\n"
+            self.emit(f"\tdstore {v_id}\n\n")
             self.stack_size.decrease_stack(2)
         elif v_type == ValidTypes.String:
-            self.code += f"\tastore {v_id}\n\n"
+            self.emit(f"\tastore {v_id}\n\n")
             self.stack_size.decrease_stack(1)
 
-    def visitPrint(self, ctx: CoBaParser.PrintContext):
-        self.debug_info(ctx, 'println')
+    def visitPrint(self, node: ir.Print):
+        self.debug_info(node)
         # get the PrintStream on the stack
-        self.code += '\tgetstatic java/lang/System/out Ljava/io/PrintStream;\n'
+        self.emit('\tgetstatic java/lang/System/out Ljava/io/PrintStream;\n')
         self.stack_size.increase_stack(1)
         # generate the argument type for the statement
-        if ctx.expression() is not None:
-            e_type = self.visit(ctx.expression())
-            # convert boolean to literal 'true'/'false'
-            if e_type == ValidTypes.Boolean:
+        p_type: str = ''
+        if node.value is not None:
+            if node.value.type == ValidTypes.Boolean:
+                # convert boolean to literal 'true'/'false' (by jumping on the condition)
                 l_id: str = next(self.label_gen)
-                self.code += f"\tifne label_{l_id}_if\n"
-                self.code += '\tldc "false"\n'
-                self.code += f"\tgoto label_{l_id}_end\nlabel_{l_id}_if:\n"
-                self.code += '\tldc "true"\n'
-                self.code += f"label_{l_id}_end:\n\n"
-            self.code += '\tinvokevirtual java/io/PrintStream/println('
+                yield Condition(node.value, f"label_{l_id}_if", True)
+                e_type: str = ValidTypes.Boolean
+                self.stack_size.increase_stack(1)
+                self.emit('\tldc "false"\n')
+                self.emit(f"\tgoto label_{l_id}_end\nlabel_{l_id}_if:\n")
+                self.emit('\tldc "true"\n')
+                self.emit(f"label_{l_id}_end:\n\n")
+            else:
+                e_type = yield node.value
             if e_type == ValidTypes.Integer:
-                self.code += 'I'
+                p_type = 'I'
                 self.stack_size.decrease_stack(1)
             elif e_type == ValidTypes.Float64:
-                self.code += 'D'
+                p_type = 'D'
                 self.stack_size.decrease_stack(2)
             elif e_type in [ValidTypes.Boolean, ValidTypes.String]:
-                self.code += 'Ljava/lang/String;'
+                p_type = 'Ljava/lang/String;'
                 self.stack_size.decrease_stack(1)
-        else:
-            self.code += '\tinvokevirtual java/io/PrintStream/println('
-        self.code += ')V\n\n'
+        self.emit(f"\tinvokevirtual java/io/PrintStream/println({p_type})V\n\n")
         self.stack_size.decrease_stack(1)
 
-    def visitIf_structure(self, ctx: CoBaParser.If_structureContext):
-        self.visit(ctx.bool_expression())
+    def visitBlock(self, node: ir.Block):
+        for statement in node.body:
+            yield statement
+
+    def visitIf(self, node: ir.If):
         # generate the following structure:
         #   header true -> label_if
         #   else_branch()
@@ -331,17 +489,16 @@ class CodeGenerator(CoBaParserVisitor):
         #   if_branch()
         # label_end:
         l_id: str = next(self.label_gen)
-        self.code += f"\tifne label_{l_id}_if\n"
-        self.stack_size.decrease_stack(1)
-        if ctx.else_branch() is not None:
-            for instruction in ctx.else_branch().instruction():
-                self.visit(instruction)
-        self.code += f"\tgoto label_{l_id}_end\nlabel_{l_id}_if:\n"
-        for instruction in ctx.then_branch().instruction():
-            self.visit(instruction)
-        self.code += f"label_{l_id}_end:\n\n"
-
-    def visitWhile_structure(self, ctx: CoBaParser.While_structureContext):
+        yield Condition(node.condition, f"label_{l_id}_if", True)
+        if node.else_body is not None:
+            for statement in node.else_body:
+                yield statement
+        self.emit(f"\tgoto label_{l_id}_end\nlabel_{l_id}_if:\n")
+        for statement in node.then_body:
+            yield statement
+        self.emit(f"label_{l_id}_end:\n\n")
+
+    def visitWhile(self, node: ir.While):
         # generate the following structure:
         # label_while:
         #   header false -> label_end
@@ -349,185 +506,164 @@ class CodeGenerator(CoBaParserVisitor):
         #   -> label_while
         # label_end:
         l_id: str = next(self.label_gen)
-        self.code += f"label_{l_id}_while:\n"
-        self.visit(ctx.bool_expression())
-        self.code += f"\tifeq label_{l_id}_end\n"
-        self.stack_size.decrease_stack(1)
-        for instruction in ctx.instruction():
-            self.visit(instruction)
-        self.code += f"\tgoto label_{l_id}_while\n"
-        self.code += f"label_{l_id}_end:\n"
-
-    def visitExpression(self, ctx: CoBaParser.ExpressionContext) -> str:
-        self.debug_info(ctx, 'expression')
-        if ctx.UNARY is not None:
-            e_type = self.visit(ctx.RIGHT)
-            if ctx.T_PLUS() is not None:
-                # unary + does not do anything ...
-                return e_type
-            if ctx.T_MINUS() is not None:
-                # unary - does not change stack but depends on data type
-                if e_type == ValidTypes.Integer:
-                    self.code += '\tineg\n'
-                    return ValidTypes.Integer
-                if e_type == ValidTypes.Float64:
-                    self.code += '\tdneg\n'
-                    return ValidTypes.Float64
-            if ctx.T_EXCLAMATION() is not None:
-                # !-op negates the value. can be implemented using xor with value 1
-                self.code += '\ticonst_1\n\tixor\n'
-                self.stack_size.increase_stack(1)
-                self.stack_size.decrease_stack(1)
-                return ValidTypes.Boolean
-        if (ctx.LEFT or ctx.RIGHT) is not None:
-            e_type_l = self.visit(ctx.LEFT)
-            e_type_r = self.visit(ctx.RIGHT)
-            r_type = e_type_l
-            if e_type_l == ValidTypes.Integer and e_type_r == ValidTypes.Float64:
-                # if a Float lays above an Integer we need to convert the Integer to a Float
-                # some copying and moving around is needed since the Float uses 2 stack spaces
-                self.code += '\tdup2_x1\n\tpop2\n\ti2d\n\tdup2_x2\n\tpop2\n'
-                self.stack_size.increase_stack(3)
-                self.stack_size.decrease_stack(2)
-                r_type = ValidTypes.Float64
-            elif e_type_l == ValidTypes.Float64 and e_type_r == ValidTypes.Integer:
-                # if an Integer lays above a Float we can simply convert it to a Float
-                self.code += '\ti2d\n'
-                self.stack_size.increase_stack(1)
-                r_type = ValidTypes.Float64
-            if ctx.T_STAR() is not None:
-                # * op depends on data type
-                self.code += '\t' + ('i' if r_type == ValidTypes.Integer else 'd') + 'mul\n'
-                self.stack_size.decrease_stack(1 if r_type == ValidTypes.Integer else 2)
-                return r_type
-            if ctx.T_SLASH() is not None:
-                # / op depends on data type
-                self.code += '\t' + ('i' if r_type == ValidTypes.Integer else 'd') + 'div\n'
-                self.stack_size.decrease_stack(1 if r_type == ValidTypes.Integer else 2)
-                return r_type
-            if ctx.T_PERCENT() is not None:
-                # % op depends on data type
-                self.code += '\t' + ('i' if r_type == ValidTypes.Integer else 'd') + 'rem\n'
-                self.stack_size.decrease_stack(1 if r_type == ValidTypes.Integer else 2)
-                return r_type
-            if ctx.T_PLUS() is not None:
-                # + op depends on data type
-                self.code += '\t' + ('i' if r_type == ValidTypes.Integer else 'd') + 'add\n'
-                self.stack_size.decrease_stack(1 if r_type == ValidTypes.Integer else 2)
-                return r_type
-            if ctx.T_MINUS() is not None:
-                # - op depends on data type
-                self.code += '\t' + ('i' if r_type == ValidTypes.Integer else 'd') + 'sub\n'
-                self.stack_size.decrease_stack(1 if r_type == ValidTypes.Integer else 2)
-                return r_type
-            if ctx.T_D_AND() is not None:
-                # && op only works for Bool
-                self.code += '\tiand\n'
-                self.stack_size.decrease_stack(1)
-                return ValidTypes.Boolean
-            if ctx.T_D_VBAR() is not None:
-                # || op only works for Bool
-                self.code += '\tior\n'
-                self.stack_size.decrease_stack(1)
-                return ValidTypes.Boolean
-            # comparison:
+        self.emit(f"label_{l_id}_while:\n")
+        yield Condition(node.condition, f"label_{l_id}_end", False)
+        for statement in node.body:
+            yield statement
+        self.emit(f"\tgoto label_{l_id}_while\n")
+        self.emit(f"label_{l_id}_end:\n")
+
+    def visitUnary(self, node: ir.Unary) -> str:
+        self.debug_info(node)
+        e_type = yield node.operand
+        if node.operator == '+':
+            # unary + does not do anything ...
+            return e_type
+        if node.operator == '-':
+            # unary - does not change stack but depends on data type
+            if e_type == ValidTypes.Integer:
+                self.emit('\tineg\n')
+                return ValidTypes.Integer
+            if e_type == ValidTypes.Float64:
+                self.emit('\tdneg\n')
+                return ValidTypes.Float64
+        if node.operator == '!':
+            # !-op negates the value. can be implemented using xor with value 1
+            self.emit('\ticonst_1\n\tixor\n')
+            self.stack_size.increase_stack(1)
+            self.stack_size.decrease_stack(1)
+            return ValidTypes.Boolean
+
+    def gen_operands(self, node: ir.Binary):
+        """
+        generate the operands of a binary operation (an Integer is converted, if the other
+        operand is a Float64) and return the type of the operation.
+        """
+        e_type_l = yield node.left
+        e_type_r = yield node.right
+        r_type = e_type_l
+        if e_type_l == ValidTypes.Integer and e_type_r == ValidTypes.Float64:
+            # if a Float lays above an Integer we need to convert the Integer to a Float
+            # some copying and moving around is needed since the Float uses 2 stack spaces
+            self.emit('\tdup2_x1\n\tpop2\n\ti2d\n\tdup2_x2\n\tpop2\n')
+            self.stack_size.increase_stack(3)
+            self.stack_size.decrease_stack(2)
+            r_type = ValidTypes.Float64
+        elif e_type_l == ValidTypes.Float64 and e_type_r == ValidTypes.Integer:
+            # if an Integer lays above a Float we can simply convert it to a Float
+            self.emit('\ti2d\n')
+            self.stack_size.increase_stack(1)
+            r_type = ValidTypes.Float64
+        return r_type
+
+    def visitBinary(self, node: ir.Binary) -> str:
+        if node.operator not in ARITHMETIC_OPERATIONS:
+            # comparisons and boolean operations:
             # the goal is to have either 0 or 1 on the stack depending
             # if the statement is false or true
             l_id: str = next(self.label_gen)
+            yield Condition(node, f"label_{l_id}_if", True)
+            self.emit(f"\ticonst_0\n\tgoto label_{l_id}_end\nlabel_{l_id}_if:\n")
+            self.emit(f"\ticonst_1\nlabel_{l_id}_end:\n")
+            self.stack_size.increase_stack(1)
+            return ValidTypes.Boolean
+        self.debug_info(node)
+        r_type: str = yield from self.gen_operands(node)
+        # arithmetic ops depend on data type
+        self.emit('\t' + ('i' if r_type == ValidTypes.Integer else 'd') + \
+            ARITHMETIC_OPERATIONS[node.operator] + '\n')
+        self.stack_size.decrease_stack(1 if r_type == ValidTypes.Integer else 2)
+        return r_type
+
+    def visitCondition(self, condition: Condition):
+        # generate a jump to the label, if the value of the Bool expression is jump_if.
+        # && and || only evaluate their right operand, if the left one does not decide
+        # the value already (short-circuit)
+        node: ir.Node = condition.node
+        label: str = condition.label
+        jump_if: bool = condition.jump_if
+        if isinstance(node, ir.Binary) and node.operator in ['&&', '||']:
+            self.debug_info(node)
+            if jump_if == (node.operator == '||'):
+                # a || b: the left operand decides the jump already, if it is true
+                yield Condition(node.left, label, jump_if)
+                yield Condition(node.right, label, jump_if)
+            else:
+                # a && b: the left operand decides the fall through already, if it is false
+                l_id: str = next(self.label_gen)
+                skip_label: str = f"label_{l_id}_{'and' if node.operator == '&&' else 'or'}"
+                yield Condition(node.left, skip_label, not jump_if)
+                yield Condition(node.right, label, jump_if)
+                self.emit(f"{skip_label}:\n")
+        elif isinstance(node, ir.Binary):
+            # comparison
+            self.debug_info(node)
+            r_type: str = yield from self.gen_operands(node)
+            condition_: str = COMPARISON_CONDITIONS[node.operator]
+            if not jump_if:
+                condition_ = COMPARISON_CONDITIONS[NEGATED_OPERATORS[node.operator]]
             if r_type in [ValidTypes.Integer, ValidTypes.Boolean]:
                 # for Integer there already exists useful Bytecode instructions
-                if ctx.T_NOTEQUAL() is not None:
-                    self.code += '\tif_icmpne'
-                elif ctx.T_D_EQUAL() is not None:
-                    self.code += '\tif_icmpeq'
-                elif ctx.T_LESS() is not None:
-                    self.code += '\tif_icmplt'
-                elif ctx.T_GREATER() is not None:
-                    self.code += '\tif_icmpgt'
-                elif ctx.T_LESSEQUAL() is not None:
-                    self.code += '\tif_icmple'
-                elif ctx.T_GREATEREQUAL() is not None:
-                    self.code += '\tif_icmpge'
+                branch: str = f"\tif_icmp{condition_}"
                 self.stack_size.decrease_stack(2)
             elif r_type == ValidTypes.Float64:
                 # Floats need to be compared differently using dcmpg
-                # after that we implement a simple if statement
-                self.code += '\tdcmpg\n'
-                if ctx.T_NOTEQUAL() is not None:
-                    self.code += '\tifne'
-                elif ctx.T_D_EQUAL() is not None:
-                    self.code += '\tifeq'
-                elif ctx.T_LESS() is not None:
-                    self.code += '\tiflt'
-                elif ctx.T_GREATER() is not None:
-                    self.code += '\tifgt'
-                elif ctx.T_LESSEQUAL() is not None:
-                    self.code += '\tifle'
-                elif ctx.T_GREATEREQUAL() is not None:
-                    self.code += '\tifge'
+                # (NaN compares as greater, the negated condition stays exact)
+                self.emit('\tdcmpg\n')
+                branch = f"\tif{condition_}"
                 self.stack_size.decrease_stack(4)
             elif r_type == ValidTypes.String:
                 # Strings can only be compared on equality
-                if ctx.T_NOTEQUAL() is not None:
-                    self.code += '\tif_acmpne'
-                elif ctx.T_D_EQUAL() is not None:
-                    self.code += '\tif_acmpeq'
+                branch = f"\tif_acmp{condition_}" if condition_ in ['ne', 'eq'] else ''
                 self.stack_size.decrease_stack(2)
-            # implement the basic if statement and push either 0 or 1
-            self.code += f" label_{l_id}_if\n\ticonst_0\n"
-            self.code += f"\tgoto label_{l_id}_end\nlabel_{l_id}_if:\n"
-            self.code += f"\ticonst_1\nlabel_{l_id}_end:\n"
+            self.emit(f"{branch} {label}\n")
+        elif isinstance(node, ir.Unary) and node.operator == '!':
+            self.debug_info(node)
+            yield Condition(node.operand, label, not jump_if)
+        elif isinstance(node, ir.Constant):
+            self.debug_info(node)
+            if (node.value == 'true') == jump_if:
+                self.emit(f"\tgoto {label}\n")
+        elif isinstance(node, ir.Inline):
+            # the value of an inlined call jumps directly
+            yield from self.gen_inline_body(node)
+            yield Condition(node.value, label, jump_if)
+        else:
+            # variables and function calls
+            yield node
+            self.emit(f"\t{'ifne' if jump_if else 'ifeq'} {label}\n")
+            self.stack_size.decrease_stack(1)
+
+    def visitVariable(self, node: ir.Variable) -> str:
+        self.debug_info(node)
+        v_type = node.type
+        v_id = node.slot
+        # if a variable is used we need to load its value
+        # the data type is needed for the code generation
+        if v_type in [ValidTypes.Integer, ValidTypes.Boolean]:
+            self.emit(f"\tiload {v_id}\n")
             self.stack_size.increase_stack(1)
-            return ValidTypes.Boolean
-        if ctx.function_call() is not None:
-            return self.visit(ctx.function_call())
-        if ctx.atom() is not None:
-            return self.visit(ctx.atom())
-
-    def visitAtom(self, ctx: CoBaParser.AtomContext) -> str:
-        self.debug_info(ctx, 'atom')
-        if ctx.expression() is not None:
-            return self.visit(ctx.expression())
-        if ctx.type_element() is not None:
-            return self.visit(ctx.type_element())
-        if ctx.IDENTIFIER() is not None:
-            self.debug_info(ctx, 'variable', False)
-            v_name = ctx.IDENTIFIER().getText()
-            v_type = self.current_function.local_variables[v_name]
-            v_id = self.variable_ids[v_name]
-            # if a variable is used we need to load its value
-            # the data type is needed for the code generation
-            if v_type in [ValidTypes.Integer, ValidTypes.Boolean]:
-                self.code += f"\tiload {v_id}\n"
-                self.stack_size.increase_stack(1)
-            elif v_type == ValidTypes.Float64:
-                self.code += f"\tdload {v_id}\n"
-                self.stack_size.increase_stack(2)
-            elif v_type == ValidTypes.String:
-                self.code += f"\taload {v_id}\n"
-                self.stack_size.increase_stack(1)
-            return v_type
+        elif v_type == ValidTypes.Float64:
+            self.emit(f"\tdload {v_id}\n")
+            self.stack_size.increase_stack(2)
+        elif v_type == ValidTypes.String:
+            self.emit(f"\taload {v_id}\n")
+            self.stack_size.increase_stack(1)
+        return v_type
 
-    def visitType_element(self, ctx: CoBaParser.Type_elementContext) -> str:
-        self.debug_info(ctx, 'type_element', False)
+    def visitConstant(self, node: ir.Constant) -> str:
+        self.debug_info(node)
         # simply push an atom on the stack
-        if ctx.INTEGER_NUMBER() is not None:
-            self.code += f"\tldc {ctx.INTEGER_NUMBER().getText()}\n"
+        if node.type == ValidTypes.Integer:
+            self.emit(f"\tldc {node.value}\n")
             self.stack_size.increase_stack(1)
-            return ValidTypes.Integer
-        if ctx.FLOAT_NUMBER() is not None:
-            self.code += f"\tldc2_w {ctx.FLOAT_NUMBER().getText()}\n"
+        elif node.type == ValidTypes.Float64:
+            self.emit(f"\tldc2_w {node.value}\n")
             self.stack_size.increase_stack(2)
-            return ValidTypes.Float64
-        if ctx.K_TRUE() is not None:
-            self.code += '\ticonst_1\n'
+        elif node.type == ValidTypes.Boolean:
+            self.emit('\ticonst_1\n' if node.value == 'true' else '\ticonst_0\n')
             self.stack_size.increase_stack(1)
-            return ValidTypes.Boolean
-        if ctx.K_FALSE() is not None:
-            self.code += '\ticonst_0\n'
-            self.stack_size.increase_stack(1)
-            return ValidTypes.Boolean
-        if ctx.STRING() is not None:
-            self.code += f"\tldc {ctx.STRING().getText()}\n"
+        elif node.type == ValidTypes.String:
+            self.emit(f"\tldc {node.value}\n")
             self.stack_size.increase_stack(1)
-            return ValidTypes.String
+        return node.type
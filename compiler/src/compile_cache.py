@@ -0,0 +1,115 @@
+"""
+define the CompileCache
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING: # the cache must not load ANTLR (fast startup)
+    from antlr4.ParserRuleContext import ParserRuleContext
+
+try:
+    from compiler import __version__
+except ModuleNotFoundError:
+    from __init__ import __version__
+
+
+def compiler_fingerprint() -> str:
+    """
+    identify the compiler by its version and the state of its source files,
+    so that cached results of an outdated compiler are never reused.
+    """
+    src_dir: Path = Path(__file__).parent
+    fingerprint: list[str] = [__version__]
+    for src_file in sorted(src_dir.parent.glob('*.py')) + sorted(src_dir.glob('*.py')):
+        f_stat = src_file.stat()
+        fingerprint.append(f"{src_file.name}:{f_stat.st_size}:{f_stat.st_mtime_ns}")
+    return '|'.join(fingerprint)
+
+
+def source_text(ctx: 'ParserRuleContext') -> str:
+    """
+    get the original source text (including whitespace and comments) of a context.
+    """
+    return ctx.start.getInputStream().getText(ctx.start.start, ctx.stop.stop)
+
+
+class CompileCache:
+    """
+    content addressed on-disk cache for compile results.
+    every entry is a json file named after its key.
+    the total size is limited, least recently used entries get evicted first.
+    """
+    DEFAULT_DIR: Path = Path.home() / '.cache' / 'coba_compiler'
+    DEFAULT_MAX_SIZE: int = 64 * 1024 * 1024
+
+    def __init__(self, cache_dir: Path = None, max_size: int = None) -> None:
+        self.cache_dir: Path = cache_dir or self.DEFAULT_DIR
+        self.max_size: int = max_size or self.DEFAULT_MAX_SIZE
+        self.fingerprint: str = compiler_fingerprint()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def key(self, *parts: str) -> str:
+        """
+        generate a key from the given parts and the compiler fingerprint.
+        """
+        sha = hashlib.sha256(self.fingerprint.encode('utf-8'))
+        for part in parts:
+            sha.update(b'\0' + str(part).encode('utf-8'))
+        return sha.hexdigest()
+
+    def get(self, key: str) -> dict:
+        """
+        get a cache entry by key (default is None).
+        """
+        entry_file: Path = self.cache_dir / f"{key}.json"
+        try:
+            with open(entry_file, 'r', encoding='utf-8') as f:
+                entry: dict = json.load(f)
+            # mark the entry as recently used
+            os.utime(entry_file)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """
+        add a cache entry and evict old entries if the cache grew too large.
+        """
+        entry_file: Path = self.cache_dir / f"{key}.json"
+        tmp_file: Path = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_file, entry_file)
+        except OSError:
+            # the cache is optional, the compilation must not fail because of it
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        delete the least recently used entries until the cache fits its size.
+        """
+        entries: list[tuple[int, int, Path]] = []
+        total_size: int = 0
+        for entry_file in self.cache_dir.glob('*.json'):
+            try:
+                f_stat = entry_file.stat()
+            except OSError:
+                continue
+            entries.append((f_stat.st_mtime_ns, f_stat.st_size, entry_file))
+            total_size += f_stat.st_size
+        entries.sort()
+        for _, f_size, entry_file in entries:
+            if total_size <= self.max_size:
+                break
+            entry_file.unlink(missing_ok=True)
+            total_size -= f_size
@@ -0,0 +1,152 @@
+"""
+define the CompileServer
+"""
+
+import asyncio
+import io
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+try:
+    from compiler.src import batch_compiler
+except ModuleNotFoundError:
+    from . import batch_compiler
+
+
+def serve_job(args: list[str], cwd: str) -> tuple[int, str, str]:
+    """
+    run the compiler with the given arguments inside a (warm) worker process.
+    the output of the compiler is captured and returned together with the exit code.
+    """
+    if batch_compiler.stups_compiler is None:
+        batch_compiler.init_worker()
+    out, err = io.StringIO(), io.StringIO()
+    # the worker process serves many clients, so its own cwd is restored afterwards
+    worker_cwd: str = os.getcwd()
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            # relative paths are relative to the client
+            os.chdir(cwd)
+            # (these would start further worker processes inside of the worker)
+            if any(arg in ['-batch', '-build', '-server', '-parallel'] for arg in args):
+                raise ValueError("'-batch', '-build', '-server' and '-parallel' are not " + \
+                    'supported by the compile server.')
+            exit_code: int = batch_compiler.stups_compiler.main(args)
+        except SystemExit as exit_:
+            # argparse exits on invalid arguments or '-h'
+            if exit_.code is None or isinstance(exit_.code, int):
+                exit_code = exit_.code or 0
+            else:
+                print(exit_.code, file=sys.stderr)
+                exit_code = 1
+        except Exception as exception:
+            # behave like the custom exception handler (ignore traceback)
+            print(exception, file=sys.stderr)
+            exit_code = 1
+        finally:
+            os.chdir(worker_cwd)
+    return exit_code, out.getvalue(), err.getvalue()
+
+
+class CompileServer:
+    """
+    persistent compile server using a unix domain socket.
+    requests are queued (bounded) and processed by a limited number of
+    worker processes, that keep the Lexer/Parser and all compiler phases loaded.
+    """
+    def __init__(self, socket_path: Path, jobs: int = None, queue_size: int = None) -> None:
+        self.socket_path: Path = socket_path
+        self.jobs: int = jobs or os.cpu_count() or 1
+        self.queue_size: int = queue_size or 64
+        self.queue: asyncio.Queue = None
+        self.executor: ProcessPoolExecutor = None
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """
+        handle a single client request: {"args": [...], "cwd": "..."}
+        """
+        try:
+            request: dict = json.loads((await reader.readline()).decode('utf-8'))
+            args, cwd = request['args'], request['cwd']
+            if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+                raise ValueError("'args' must be a list of strings.")
+            if not isinstance(cwd, str):
+                raise ValueError("'cwd' must be a string.")
+            future: asyncio.Future = asyncio.get_running_loop().create_future()
+            try:
+                self.queue.put_nowait((args, cwd, future))
+                exit_code, out, err = await future
+            except asyncio.QueueFull:
+                exit_code, out, err = 1, '', 'compile server is busy, please try again.\n'
+        except (ValueError, KeyError, TypeError) as exception:
+            exit_code, out, err = 1, '', f"invalid request: {exception}\n"
+        try:
+            writer.write(json.dumps({'exit_code': exit_code, 'stdout': out,
+                                     'stderr': err}).encode('utf-8'))
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def consume(self) -> None:
+        """
+        process the queued requests one after another.
+        (one consumer per worker process limits the concurrency)
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            args, cwd, future = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.executor, serve_job, args, cwd)
+            except Exception as exception:
+                result = (1, '', f"{exception}\n")
+            if not future.cancelled():
+                future.set_result(result)
+            self.queue.task_done()
+
+    async def serve(self) -> None:
+        """
+        start the server and serve until interrupted.
+        """
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        stop: asyncio.Event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        consumers = [asyncio.create_task(self.consume()) for _ in range(self.jobs)]
+        server = await asyncio.start_unix_server(self.handle_client, path=str(self.socket_path))
+        print(f"Status: compile server listening on {self.socket_path} " + \
+            f"({self.jobs} jobs, queue size {self.queue_size})", flush=True)
+        async with server:
+            await stop.wait()
+        for consumer in consumers:
+            consumer.cancel()
+
+    def run(self) -> int:
+        """
+        run the server (blocking).
+        """
+        if self.socket_path.exists():
+            if not self.socket_path.is_socket():
+                raise ValueError('Specified socket is not a socket.')
+            # remove a stale socket of a previous server
+            self.socket_path.unlink()
+        with ProcessPoolExecutor(max_workers=self.jobs,
+                                 initializer=batch_compiler.init_worker) as self.executor:
+            # start the workers before the first request arrives
+            for _ in self.executor.map(abs, range(self.jobs)):
+                pass
+            try:
+                asyncio.run(self.serve())
+            finally:
+                self.socket_path.unlink(missing_ok=True)
+        print('Status: compile server stopped.')
+        return 0
@@ -0,0 +1,78 @@
+"""
+define the CompileStats
+"""
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter, process_time
+
+
+class CompileStats:
+    """
+    collect the wall- and cpu time of every compiler phase as well as
+    work counters (e.g. number of tokens) of a single compilation.
+    """
+    def __init__(self, input_file: Path, mode: str) -> None:
+        self.input_file: Path = input_file
+        self.mode: str = mode
+        # phase -> {'wall': seconds, 'cpu': seconds}
+        self.phases: dict[str, dict[str, float]] = {}
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        measure the time of a phase (times of repeated phases are summed up).
+        """
+        wall_start: float = perf_counter()
+        cpu_start: float = process_time()
+        try:
+            yield
+        finally:
+            phase_times: dict[str, float] = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+            phase_times['wall'] += perf_counter() - wall_start
+            phase_times['cpu'] += process_time() - cpu_start
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        increase a work counter.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @staticmethod
+    def count_tree_nodes(tree) -> int:
+        """
+        count the nodes of a parse tree (including terminal nodes).
+        """
+        node_count: int = 0
+        nodes: list = [tree]
+        while nodes:
+            node = nodes.pop()
+            node_count += 1
+            nodes.extend(node.getChild(i) for i in range(node.getChildCount()))
+        return node_count
+
+    def to_dict(self, exit_code: int) -> dict:
+        """
+        get the statistics as a (json serializable) dictionary.
+        """
+        return {
+            'file': str(self.input_file),
+            'mode': self.mode,
+            'exit_code': exit_code,
+            'phases': self.phases,
+            'total': {
+                'wall': sum(phase_times['wall'] for phase_times in self.phases.values()),
+                'cpu': sum(phase_times['cpu'] for phase_times in self.phases.values()),
+            },
+            'counters': self.counters,
+        }
+
+    def write(self, stats_file: Path, exit_code: int) -> None:
+        """
+        append the statistics as a single json document (one line) to the stats file.
+        """
+        # a single write call, so that multiple (batch) processes can share the file
+        with open(stats_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_dict(exit_code)) + '\n')
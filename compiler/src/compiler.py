@@ -0,0 +1,453 @@
+"""
+define the Compiler
+"""
+
+import sys
+from typing import TextIO
+
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+
+try:
+    from compiler.src import ir
+    from compiler.src.CoBaLexer import CoBaLexer
+    from compiler.src.CoBaParser import CoBaParser
+    from compiler.src.compile_cache import CompileCache
+    from compiler.src.compile_stats import CompileStats
+    from compiler.src.constants import INLINE_SIZE, OPTIMIZATIONS
+    from compiler.src.error_listener import Diagnostic, ErrorListener
+    from compiler.src.graphs import CFGraph, RIGraph
+    from compiler.src.lowering import Lowering
+    from compiler.src.regex_lexer import RegexLexer
+    from compiler.src.semantic_analysis import SemanticAnalysis
+    from compiler.src.symbol_table_gen_listener import SymbolTableGenListener
+    from compiler.src.tree_walker import IterativeParseTreeWalker, recursion_limit
+    from compiler.src.type_checker import TypeChecker
+    from compiler.src.type_checker_helper import SymbolTable
+except ModuleNotFoundError:
+    from . import ir
+    from .CoBaLexer import CoBaLexer
+    from .CoBaParser import CoBaParser
+    from .compile_cache import CompileCache
+    from .compile_stats import CompileStats
+    from .constants import INLINE_SIZE, OPTIMIZATIONS
+    from .error_listener import Diagnostic, ErrorListener
+    from .graphs import CFGraph, RIGraph
+    from .lowering import Lowering
+    from .regex_lexer import RegexLexer
+    from .semantic_analysis import SemanticAnalysis
+    from .symbol_table_gen_listener import SymbolTableGenListener
+    from .tree_walker import IterativeParseTreeWalker, recursion_limit
+    from .type_checker import TypeChecker
+    from .type_checker_helper import SymbolTable
+
+# the available lexer backends
+LEXERS: list[str] = ['antlr', 'regex']
+
+
+class CompileResult:
+    """
+    define the result of a single compilation.
+    the exit code is 0 on success (1: parser-, 2: symbol table-, 3: type error)
+    """
+    def __init__(self) -> None:
+        self.exit_code: int = 0
+        self.diagnostics: list[Diagnostic] = []
+        self.symbol_table: SymbolTable = None
+        # compile
+        self.code: str = None
+        self.class_file: bytes = None
+        # liveness
+        self.control_flow_graphs: dict[str, CFGraph] = None
+        self.interference_graphs: dict[str, RIGraph] = None
+
+    @property
+    def success(self) -> bool:
+        """
+        check if all phases so far were successful.
+        """
+        return self.exit_code == 0
+
+
+class Compiler:
+    """
+    in-memory compiler, that takes source text and returns the Jasmin code,
+    diagnostics and interference graphs as python objects.
+    the Lexer and Parser are created once and reused for every compilation.
+    the lexer is either the generated CoBaLexer ('antlr') or the RegexLexer ('regex'),
+    both produce the same tokens.
+    all optimizations are applied, except the disabled_optimizations (see OPTIMIZATIONS),
+    the functions with at most inline_size operands are inlined.
+    neither the filesystem nor the global exception hook are touched
+    (unless a cache is given).
+    """
+    def __init__(self, debug: bool = False, cache: CompileCache = None,
+                 print_diagnostics: bool = False, lexer: str = 'antlr',
+                 disabled_optimizations: frozenset[str] = frozenset(),
+                 inline_size: int = INLINE_SIZE) -> None:
+        self.debug: bool = debug
+        self.cache: CompileCache = cache
+        # print the errors to stderr (like the cli) instead of collecting them
+        self.print_diagnostics: bool = print_diagnostics
+
+        if lexer not in LEXERS:
+            raise ValueError(f"Unknown lexer: '{lexer}'.")
+        self.lexer_name: str = lexer
+        for optimization in disabled_optimizations:
+            if optimization not in OPTIMIZATIONS:
+                raise ValueError(f"Unknown optimization: '{optimization}'.")
+        self.disabled_optimizations: frozenset[str] = frozenset(disabled_optimizations)
+        if inline_size < 0:
+            raise ValueError(f"Invalid inline size: '{inline_size}'.")
+        self.inline_size: int = inline_size
+        self.lexer: CoBaLexer | RegexLexer = RegexLexer() if lexer == 'regex' else \
+            CoBaLexer(InputStream(''))
+        self.token_stream: CommonTokenStream = CommonTokenStream(self.lexer)
+        self.parser: CoBaParser = CoBaParser(self.token_stream)
+        self.walker: IterativeParseTreeWalker = IterativeParseTreeWalker()
+        # number of parses in total and number of parses that needed the full LL mode
+        self.parses: int = 0
+        self.ll_fallbacks: int = 0
+        # the symbol table and the lowered functions (by position), that can be inlined
+        # (see compile_function)
+        self.inlined_symbol_table: SymbolTable = None
+        self.inlined_functions: dict[tuple[str, int, int], ir.Function] = {}
+
+    def get_diagnostics(self, result: CompileResult) -> list[Diagnostic]:
+        """
+        get the list the errors are collected in (None if the errors are printed).
+        """
+        return None if self.print_diagnostics else result.diagnostics
+
+    def reset(self, source: str, line: int = 1, column: int = 0) -> None:
+        """
+        reset the Lexer and Parser to a new source text (starting at the given position).
+        """
+        if isinstance(self.lexer, RegexLexer):
+            self.lexer.reset(source)
+            self.lexer.line, self.lexer.column = line, column
+        else:
+            self.lexer.inputStream = InputStream(source)
+            self.lexer._interp.line, self.lexer._interp.column = line, column
+        self.token_stream.setTokenSource(self.lexer)
+        self.parser.setTokenStream(self.token_stream)
+
+    def parse(self, source: str | bytes, result: CompileResult,
+              stats: CompileStats) -> CoBaParser.MainContext:
+        """
+        lex and parse the source by resetting the Lexer and Parser.
+        the fast SLL mode is tried first (bailing out on the first error),
+        only if it fails the source is parsed again in full LL mode with error reporting.
+        """
+        if isinstance(source, bytes):
+            source = source.decode('utf-8')
+        self.lexer.removeErrorListeners()
+        # lexer errors are reported, but only parser errors fail the compilation
+        self.lexer.addErrorListener(ErrorListener(self.get_diagnostics(result)))
+        self.parser.removeErrorListeners()
+        self.reset(source)
+
+        with stats.phase('lexing'):
+            self.token_stream.fill()
+        stats.count('tokens', len(self.token_stream.tokens))
+        self.parses += 1
+        # the generated Parser needs a few python frames per nesting level
+        max_depth: int = sys.getrecursionlimit() + 10 * len(self.token_stream.tokens)
+        with stats.phase('parsing'), recursion_limit(max_depth):
+            self.parser._interp.predictionMode = PredictionMode.SLL
+            self.parser._errHandler = BailErrorStrategy()
+            try:
+                return self.parser.main()
+            except ParseCancellationException:
+                pass
+        # syntax error (or SLL conflict): parse again, reporting all errors
+        self.ll_fallbacks += 1
+        stats.count('ll_fallbacks')
+        error_listener: ErrorListener = ErrorListener(self.get_diagnostics(result))
+        self.parser.addErrorListener(error_listener)
+        with stats.phase('parsing_ll'), recursion_limit(max_depth):
+            self.parser._interp.predictionMode = PredictionMode.LL
+            self.parser._errHandler = DefaultErrorStrategy()
+            self.parser.reset()
+            tree: CoBaParser.MainContext = self.parser.main()
+        if error_listener.has_errors:
+            result.exit_code = 1
+        return tree
+
+    def parse_function(self, source: str, line: int, column: int, main: bool
+                       ) -> CoBaParser.FunctionContext | CoBaParser.Main_functionContext:
+        """
+        parse the source text of a single (main-)function starting at the given position.
+        the function must be part of a program, that was already parsed successfully
+        (lexer errors are not reported again).
+        """
+        self.lexer.removeErrorListeners()
+        self.parser.removeErrorListeners()
+        self.reset(source, line, column)
+        self.token_stream.fill()
+        rule = self.parser.main_function if main else self.parser.function
+        max_depth: int = sys.getrecursionlimit() + 10 * len(self.token_stream.tokens)
+        with recursion_limit(max_depth):
+            self.parser._interp.predictionMode = PredictionMode.SLL
+            self.parser._errHandler = BailErrorStrategy()
+            try:
+                return rule()
+            except ParseCancellationException:
+                pass
+            self.parser._interp.predictionMode = PredictionMode.LL
+            self.parser._errHandler = DefaultErrorStrategy()
+            self.parser.reset()
+            return rule()
+
+    def gen_symbol_table(self, tree: CoBaParser.MainContext, result: CompileResult,
+                         stats: CompileStats) -> SymbolTable:
+        """
+        generate the symbol table of a parsed program.
+        """
+        result.symbol_table = SymbolTable()
+        symbol_table_gen_listener: SymbolTableGenListener = SymbolTableGenListener(
+            result.symbol_table, self.get_diagnostics(result))
+        with stats.phase('symbol_table'):
+            self.walker.walk(symbol_table_gen_listener, tree)
+            result.symbol_table.finalise()
+        stats.count('functions', len(result.symbol_table.functions))
+        if symbol_table_gen_listener.has_errors:
+            result.exit_code = 2
+        return result.symbol_table
+
+    def type_check(self, tree: CoBaParser.MainContext, result: CompileResult,
+                   stats: CompileStats) -> None:
+        """
+        typecheck a parsed program using its symbol table.
+        """
+        type_checker: TypeChecker = TypeChecker(result.symbol_table, self.get_diagnostics(result))
+        with stats.phase('type_checking'):
+            self.walker.walk(type_checker, tree)
+        if type_checker.has_errors:
+            result.exit_code = 3
+
+    def analyse_semantics(self, tree: CoBaParser.MainContext, result: CompileResult,
+                          stats: CompileStats) -> SymbolTable:
+        """
+        generate the symbol table and typecheck a parsed program in a single walk
+        (same symbol table, errors and exit codes as gen_symbol_table and type_check).
+        """
+        result.symbol_table = SymbolTable()
+        with stats.phase('semantic_analysis'):
+            semantic_analysis: SemanticAnalysis = SemanticAnalysis(result.symbol_table, tree)
+            self.walker.walk(semantic_analysis, tree)
+            result.symbol_table.finalise()
+        stats.count('functions', len(result.symbol_table.functions))
+        for diagnostic in semantic_analysis.diagnostics:
+            if self.print_diagnostics:
+                print(diagnostic, file=sys.stderr, flush=True)
+            else:
+                result.diagnostics.append(diagnostic)
+        result.exit_code = semantic_analysis.exit_code
+        return result.symbol_table
+
+    def lower(self, tree: CoBaParser.MainContext, result: CompileResult,
+              stats: CompileStats) -> ir.Program:
+        """
+        lower a typechecked program into the IR (used by all back-end phases).
+        """
+        with stats.phase('lowering'):
+            return Lowering(result.symbol_table, self.debug).visit(tree)
+
+    def release(self) -> None:
+        """
+        release the parse tree and the tokens of the last parse,
+        so that they can be garbage collected.
+        """
+        self.token_stream.setTokenSource(self.lexer)
+        if isinstance(self.lexer, RegexLexer):
+            self.lexer.reset('')
+        else:
+            self.lexer.inputStream = InputStream('')
+        # the prediction keeps a reference to the last predicted context (and its parents)
+        self.parser._interp._outerContext = None
+
+    def generate(self, program: ir.Program, result: CompileResult,
+                 class_name: str, stats: CompileStats, out_file: TextIO = None) -> str:
+        """
+        generate the Jasmin code of a typechecked (and lowered) program.
+        if an out_file is given, the code is written to it method by method
+        (result.code stays None) and the IR of every written method is released.
+        """
+        try: # the code generator is only imported when compiling
+            from compiler.src.code_generator import CodeGenerator
+        except ModuleNotFoundError:
+            from .code_generator import CodeGenerator
+        code_generator: CodeGenerator = CodeGenerator(result.symbol_table, class_name,
+                                                      self.debug, self.cache, out_file,
+                                                      self.disabled_optimizations,
+                                                      self.inline_size)
+        with stats.phase('code_generation'):
+            code_generator.visit(program)
+        stats.count('instructions', code_generator.count_instructions())
+        for name, amount in code_generator.optimization_counters().items():
+            stats.count(name, amount)
+        result.code = code_generator.code
+        return result.code
+
+    def compile_function(self, source: str, line: int, column: int, main: bool,
+                         symbol_table: SymbolTable, class_name: str,
+                         functions: dict[str, tuple[str, int, int]] = None
+                         ) -> tuple[list[Diagnostic], str, dict[str, int]]:
+        """
+        typecheck, lower and generate a single (main-)function of a program, whose symbol table
+        is already generated (without errors). returns the type errors, the Jasmin method
+        (None on errors) and the work counters of the optimizations.
+        the functions (name -> source text, line, column) are lowered as well,
+        if they can be inlined into the function.
+        """
+        try: # the code generator is only imported when compiling
+            from compiler.src.code_generator import CodeGenerator
+        except ModuleNotFoundError:
+            from .code_generator import CodeGenerator
+        diagnostics: list[Diagnostic] = []
+        ctx = self.parse_function(source, line, column, main)
+        type_checker: TypeChecker = TypeChecker(symbol_table, diagnostics)
+        self.walker.walk(type_checker, ctx)
+        if type_checker.has_errors:
+            return diagnostics, None, {}
+        function: ir.Function = Lowering(symbol_table, self.debug).visit(ctx)
+        code_generator: CodeGenerator = CodeGenerator(
+            symbol_table, class_name, self.debug, self.cache,
+            disabled_optimizations=self.disabled_optimizations, inline_size=self.inline_size)
+        if code_generator.inliner is not None and functions:
+            for f_name in code_generator.inliner.dependencies(function.name):
+                inlined: ir.Function = self.lower_function(*functions[f_name], symbol_table)
+                if inlined is not None:
+                    code_generator.inliner.add_function(inlined)
+        code_generator.visit(function)
+        return diagnostics, code_generator.code, code_generator.optimization_counters()
+
+    def lower_function(self, source: str, line: int, column: int,
+                       symbol_table: SymbolTable) -> ir.Function:
+        """
+        typecheck and lower a single function of a program (None on errors).
+        the functions are lowered only once per symbol table.
+        """
+        if self.inlined_symbol_table is not symbol_table:
+            self.inlined_symbol_table = symbol_table
+            self.inlined_functions = {}
+        key: tuple[str, int, int] = (source, line, column)
+        if key not in self.inlined_functions:
+            ctx = self.parse_function(source, line, column, False)
+            type_checker: TypeChecker = TypeChecker(symbol_table, [])
+            self.walker.walk(type_checker, ctx)
+            self.inlined_functions[key] = None if type_checker.has_errors else \
+                Lowering(symbol_table, self.debug).visit(ctx)
+        return self.inlined_functions[key]
+
+    def assemble(self, result: CompileResult, source_file: str,
+                 stats: CompileStats) -> bytes:
+        """
+        assemble the generated Jasmin code into a class file (without Jasmin).
+        """
+        try: # the class writer is only imported when needed
+            from compiler.src.class_writer import ClassWriter
+        except ModuleNotFoundError:
+            from .class_writer import ClassWriter
+        with stats.phase('assembling'):
+            result.class_file = ClassWriter(source_file).assemble(result.code)
+        return result.class_file
+
+    def analyse_liveness(self, program: ir.Program, result: CompileResult,
+                         stats: CompileStats) -> dict[str, RIGraph]:
+        """
+        generate the control flow graphs and register interference graphs
+        of a typechecked (and lowered) program.
+        """
+        try: # the liveness analysis is only imported when needed
+            from compiler.src.liveness_analysis import LivenessAnalysis
+        except ModuleNotFoundError:
+            from .liveness_analysis import LivenessAnalysis
+        liveness_analysis: LivenessAnalysis = LivenessAnalysis(result.symbol_table,
+                                                               self.cache, stats)
+        with stats.phase('liveness_cfg'):
+            liveness_analysis.visit(program)
+        for cf_graph in liveness_analysis.control_flow_graphs.values():
+            stats.count('cfg_nodes', len(cf_graph.nodes))
+            stats.count('cfg_edges', sum(len(n_adj) for n_adj in cf_graph.adj.values()))
+        # measures the phases 'liveness_interference' and 'liveness_coloring'
+        liveness_analysis.gen_interference_graph()
+        result.control_flow_graphs = liveness_analysis.control_flow_graphs
+        result.interference_graphs = liveness_analysis.register_interference_graphs
+        return result.interference_graphs
+
+    def check_source(self, source: str | bytes, result: CompileResult,
+                     stats: CompileStats) -> CoBaParser.MainContext:
+        """
+        run the parser and the semantic analysis (symbol table generation and type checker).
+        """
+        tree: CoBaParser.MainContext = self.parse(source, result, stats)
+        if result.success:
+            self.analyse_semantics(tree, result, stats)
+        return tree
+
+    def front_end(self, source: str | bytes, result: CompileResult,
+                  stats: CompileStats) -> ir.Program:
+        """
+        run the parser and the semantic analysis and lower the program into the IR
+        (None on errors). the parse tree is released afterwards.
+        """
+        tree: CoBaParser.MainContext = self.check_source(source, result, stats)
+        program: ir.Program = self.lower(tree, result, stats) if result.success else None
+        self.release()
+        return program
+
+    def compile_source(self, source: str | bytes, class_name: str = 'Main',
+                       stats: CompileStats = None, class_file: bool = False,
+                       jobs: int = None) -> CompileResult:
+        """
+        compile the source text into Jasmin code (result.code)
+        and optionally into a class file (result.class_file).
+        if jobs is given, the functions are typechecked and generated
+        by this number of worker processes (same result).
+        """
+        result: CompileResult = CompileResult()
+        stats = stats or CompileStats(None, 'compile')
+        if jobs is not None:
+            self.compile_parallel(source, result, class_name, stats, jobs)
+        else:
+            program: ir.Program = self.front_end(source, result, stats)
+            if result.success:
+                self.generate(program, result, class_name, stats)
+        if result.success and class_file:
+            self.assemble(result, None, stats)
+        return result
+
+    def compile_parallel(self, source: str | bytes, result: CompileResult, class_name: str,
+                         stats: CompileStats, jobs: int = None) -> str:
+        """
+        parse the source and generate its symbol table, then typecheck and generate
+        all functions in parallel (see ParallelCompiler).
+        """
+        try: # the parallel compiler is only imported when needed
+            from compiler.src.parallel_compiler import ParallelCompiler
+        except ModuleNotFoundError:
+            from .parallel_compiler import ParallelCompiler
+        tree: CoBaParser.MainContext = self.parse(source, result, stats)
+        if result.success:
+            self.gen_symbol_table(tree, result, stats)
+        if result.success:
+            ParallelCompiler(self, jobs).compile(tree, result, class_name, stats)
+        self.release()
+        return result.code
+
+    def liveness_source(self, source: str | bytes,
+                        stats: CompileStats = None) -> CompileResult:
+        """
+        generate the register interference graphs (result.interference_graphs)
+        of the source text.
+        """
+        result: CompileResult = CompileResult()
+        stats = stats or CompileStats(None, 'liveness')
+        program: ir.Program = self.front_end(source, result, stats)
+        if result.success:
+            self.analyse_liveness(program, result, stats)
+        return result
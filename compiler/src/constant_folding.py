@@ -0,0 +1,361 @@
+"""
+define the ConstantFolding
+"""
+
+import math
+from typing import Callable
+
+try:
+    from compiler.src import ir
+    from compiler.src.class_writer import parse_number
+    from compiler.src.dead_code_elimination import has_side_effects
+    from compiler.src.tree_walker import IterativeVisitor
+    from compiler.src.type_checker_helper import ValidTypes
+except ModuleNotFoundError:
+    from . import ir
+    from .class_writer import parse_number
+    from .dead_code_elimination import has_side_effects
+    from .tree_walker import IterativeVisitor
+    from .type_checker_helper import ValidTypes
+
+
+# a compile time value (None if the value is not known)
+Value = int | float | bool
+
+# comparison operator -> comparison of two values
+COMPARISONS: dict[str, Callable[[Value, Value], bool]] = {
+    '==': lambda a, b: a == b, '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b, '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b, '>=': lambda a, b: a >= b,
+}
+
+
+def to_int(value: int) -> int:
+    """
+    wrap an integer to 32 bit (like the int arithmetic of the JVM).
+    """
+    return (value + 2**31) % 2**32 - 2**31
+
+
+def integer_operation(operator: str, a: int, b: int) -> int:
+    """
+    evaluate an arithmetic operation on two Integers like the JVM
+    (None for a division by zero, which throws at runtime).
+    """
+    if operator == '+':
+        return to_int(a + b)
+    if operator == '-':
+        return to_int(a - b)
+    if operator == '*':
+        return to_int(a * b)
+    if b == 0:
+        return None
+    # idiv rounds towards zero, irem has the sign of the dividend
+    quotient: int = abs(a) // abs(b) * (1 if (a < 0) == (b < 0) else -1)
+    if operator == '/':
+        return to_int(quotient)
+    return a - b * quotient
+
+
+def double_operation(operator: str, a: float, b: float) -> float:
+    """
+    evaluate an arithmetic operation on two Float64s like the JVM (IEEE 754).
+    """
+    if operator == '+':
+        return a + b
+    if operator == '-':
+        return a - b
+    if operator == '*':
+        return a * b
+    if operator == '/':
+        if b == 0.0:
+            if a == 0.0 or math.isnan(a) or math.isnan(b):
+                return math.nan
+            return math.copysign(math.inf, a) * math.copysign(1.0, b)
+        return a / b
+    # drem is the truncating remainder (fmod)
+    if math.isnan(a) or math.isnan(b) or math.isinf(a) or b == 0.0:
+        return math.nan
+    if math.isinf(b):
+        return a
+    return math.fmod(a, b)
+
+
+def dcmpg(a: float, b: float) -> int:
+    """
+    compare two Float64s like dcmpg (1 if one of them is NaN).
+    """
+    if math.isnan(a) or math.isnan(b):
+        return 1
+    return (a > b) - (a < b)
+
+
+def evaluate_binary(node: ir.Binary, a: Value, b: Value) -> Value:
+    """
+    evaluate a binary operation on known operands (None if it can not be evaluated).
+    """
+    left_type: str = node.left.type
+    right_type: str = node.right.type
+    if ValidTypes.String in (left_type, right_type):
+        return None
+    if node.operator in ['*', '/', '%', '+', '-']:
+        if left_type == right_type == ValidTypes.Integer:
+            return integer_operation(node.operator, a, b)
+        return double_operation(node.operator, float(a), float(b))
+    if node.operator in ['&&', '||']:
+        return a and b if node.operator == '&&' else a or b
+    if ValidTypes.Float64 in (left_type, right_type):
+        # the comparisons of Float64s test the result of dcmpg
+        return COMPARISONS[node.operator](dcmpg(float(a), float(b)), 0)
+    # Integers and Booleans (0/1) are compared with if_icmp
+    return COMPARISONS[node.operator](int(a), int(b))
+
+
+def evaluate_unary(node: ir.Unary, a: Value) -> Value:
+    """
+    evaluate an unary operation on a known operand.
+    """
+    if node.operator == '!':
+        return not a
+    if node.operator == '-':
+        return to_int(-a) if node.type == ValidTypes.Integer else -a
+    return a
+
+
+def constant_value(node: ir.Constant) -> Value:
+    """
+    get the value of a constant the way it is loaded at runtime (None for Strings).
+    """
+    if node.type == ValidTypes.Integer:
+        value: int = int(node.value)
+        # larger literals are not folded
+        return value if to_int(value) == value else None
+    if node.type == ValidTypes.Float64:
+        # Jasmin loads the literal with single precision (if it is in range)
+        return parse_number(node.value)[1]
+    if node.type == ValidTypes.Boolean:
+        return node.value == 'true'
+    return None
+
+
+def constant_text(value: Value, type_: str) -> str:
+    """
+    get the literal of a value (None if Jasmin can not load the exact value).
+    """
+    if type_ == ValidTypes.Boolean:
+        return 'true' if value else 'false'
+    if type_ == ValidTypes.Integer:
+        return str(value)
+    if not math.isfinite(value):
+        return None
+    # Jasmin only parses numbers with a '.' as floating point numbers
+    mantissa, e, exponent = repr(value).partition('e')
+    text: str = (mantissa if '.' in mantissa else f"{mantissa}.0") + e + exponent
+    loaded: float = parse_number(text)[1]
+    if loaded != value or math.copysign(1.0, loaded) != math.copysign(1.0, value):
+        return None
+    return text
+
+
+def convert(value: Value, type_: str) -> Value:
+    """
+    convert a value to the type of a variable (Integers can be stored in a Float64).
+    """
+    return float(value) if type_ == ValidTypes.Float64 else value
+
+
+class ConstantFolding(IterativeVisitor):
+    """
+    evaluate the Integer, Float64 and Bool operations of a (main-)function at compile time,
+    using the types of the IR and the semantics of the JVM instructions
+    (32 bit int overflow, truncating idiv/irem, IEEE doubles and dcmpg).
+    variables, that are only assigned in their declaration, are replaced by their value.
+    if- and while-structures, whose condition is known, are replaced by the executed branch.
+    && and || short-circuit, so their right operand is dropped, if the left one decides the value.
+    the functions are changed in place, expressions are visited as (node, value) pairs.
+    the number of folded expressions, propagated variables and eliminated branches is counted.
+    """
+    def __init__(self) -> None:
+        # the known values of the variables of the current function
+        self.values: dict[str, Value] = {}
+        # variable -> number of assignements besides the declaration
+        self.assignments: dict[str, int] = {}
+        self.counters: dict[str, int] = {'folded_expressions': 0, 'propagated_variables': 0,
+                                         'eliminated_branches': 0}
+
+    def constant(self, node: ir.Node, value: Value, counter: str) -> ir.Node:
+        """
+        replace a node by the constant of its value (the node is kept if that is not possible).
+        """
+        text: str = constant_text(value, node.type)
+        if text is None:
+            return node
+        constant: ir.Constant = ir.Constant(text, node.type)
+        constant.debug = node.debug
+        self.counters[counter] += 1
+        return constant
+
+    def fold_body(self, body: list[ir.Node]):
+        """
+        fold the statements of a body in place.
+        """
+        for i, statement in enumerate(body):
+            folded = yield statement
+            # a function call can be an expression or a statement
+            body[i] = folded[0] if isinstance(statement, (ir.Call, ir.Inline)) else folded
+
+    def visitProgram(self, program: ir.Program):
+        for function in program.functions:
+            yield function
+        return program
+
+    def visitFunction(self, function: ir.Function):
+        self.assignments = {}
+        statements: list[ir.Node] = list(function.body)
+        while statements:
+            statement: ir.Node = statements.pop()
+            if isinstance(statement, ir.Assignment):
+                self.assignments[statement.name] = self.assignments.get(statement.name, 0) + \
+                    (not statement.declaration)
+            elif isinstance(statement, (ir.Block, ir.While)):
+                statements.extend(statement.body)
+            elif isinstance(statement, ir.If):
+                statements.extend(statement.then_body)
+                statements.extend(statement.else_body or [])
+        self.values = {}
+        yield from self.fold_body(function.body)
+        return function
+
+    def visitAssignment(self, node: ir.Assignment):
+        node.value, value = yield node.value
+        # (the declarations come first, so every value is known before it is used)
+        if node.declaration and value is not None and self.assignments[node.name] == 0:
+            self.values[node.name] = convert(value, node.type)
+        return node
+
+    def visitPrint(self, node: ir.Print):
+        if node.value is not None:
+            node.value = (yield node.value)[0]
+        return node
+
+    def visitReturn(self, node: ir.Return):
+        if node.value is not None:
+            node.value = (yield node.value)[0]
+        return node
+
+    def visitTailCall(self, node: ir.TailCall):
+        for i, argument in enumerate(node.arguments):
+            node.arguments[i] = (yield argument)[0]
+        return node
+
+    def visitBlock(self, node: ir.Block):
+        yield from self.fold_body(node.body)
+        return node
+
+    def visitIf(self, node: ir.If):
+        node.condition, value = yield node.condition
+        if value is None:
+            yield from self.fold_body(node.then_body)
+            if node.else_body is not None:
+                yield from self.fold_body(node.else_body)
+            return node
+        # only the executed branch is kept
+        self.counters['eliminated_branches'] += 1
+        body: list[ir.Node] = node.then_body if value else (node.else_body or [])
+        yield from self.fold_body(body)
+        return ir.Block(body)
+
+    def visitWhile(self, node: ir.While):
+        node.condition, value = yield node.condition
+        if value is False:
+            self.counters['eliminated_branches'] += 1
+            return ir.Block([])
+        yield from self.fold_body(node.body)
+        return node
+
+    def visitCall(self, node: ir.Call):
+        for i, argument in enumerate(node.arguments):
+            node.arguments[i] = (yield argument)[0]
+        return node, None
+
+    def visitInline(self, node: ir.Inline):
+        # the body is straight-line code, so the values of its variables are known
+        # from their last store (the variables are only used inside of the inlined call).
+        # the stores of propagated values are removed
+        stored: list[str] = []
+        parameters: list[ir.Variable] = []
+        arguments: list[ir.Node] = []
+        for parameter, argument in zip(node.parameters, node.arguments):
+            argument, value = yield argument
+            stored.append(parameter.name)
+            if not self.propagate(parameter, argument, value):
+                parameters.append(parameter)
+                arguments.append(argument)
+        node.parameters, node.arguments = parameters, arguments
+        body: list[ir.Node] = []
+        for statement in node.body:
+            if isinstance(statement, ir.Assignment):
+                statement.value, value = yield statement.value
+                stored.append(statement.name)
+                if self.propagate(statement, statement.value, value):
+                    continue
+            else:
+                folded = yield statement
+                statement = folded[0] if isinstance(statement, (ir.Call, ir.Inline)) else folded
+            body.append(statement)
+        node.body = body
+        value: Value = None
+        if node.value is not None:
+            node.value, value = yield node.value
+        for v_name in stored:
+            self.values.pop(v_name, None)
+        if value is None or has_side_effects(node):
+            return node, None
+        # the whole call is replaced, if it only computes its value
+        return self.constant(node, value, 'folded_expressions'), value
+
+    def propagate(self, variable: ir.Variable | ir.Assignment, expression: ir.Node,
+                  value: Value) -> bool:
+        """
+        set the known value of a variable of an inlined call after a store
+        and return if the store can be removed (every use is replaced by the constant).
+        """
+        if value is None:
+            self.values.pop(variable.name, None)
+            return False
+        self.values[variable.name] = convert(value, variable.type)
+        return constant_text(self.values[variable.name], variable.type) is not None and \
+            not has_side_effects(expression)
+
+    def visitConstant(self, node: ir.Constant):
+        return node, constant_value(node)
+
+    def visitVariable(self, node: ir.Variable):
+        value: Value = self.values.get(node.name)
+        if value is None:
+            return node, None
+        return self.constant(node, value, 'propagated_variables'), value
+
+    def visitUnary(self, node: ir.Unary):
+        node.operand, value = yield node.operand
+        if value is None:
+            return node, None
+        value = evaluate_unary(node, value)
+        return self.constant(node, value, 'folded_expressions'), value
+
+    def visitBinary(self, node: ir.Binary):
+        node.left, left = yield node.left
+        if node.operator in ['&&', '||'] and left is not None:
+            # the right operand is only evaluated, if the left one does not decide the value
+            if left == (node.operator == '||'):
+                return self.constant(node, left, 'folded_expressions'), left
+            self.counters['folded_expressions'] += 1
+            node.right, right = yield node.right
+            return node.right, right
+        node.right, right = yield node.right
+        if left is None or right is None:
+            return node, None
+        value: Value = evaluate_binary(node, left, right)
+        if value is None:
+            return node, None
+        return self.constant(node, value, 'folded_expressions'), value
@@ -0,0 +1,10 @@
+"""
+define the constants shared by the compiler and the console menu
+(without importing any compiler phase, so that the console menu starts fast)
+"""
+
+# the optimizations, that can be disabled
+OPTIMIZATIONS: list[str] = ['inlining', 'tail_call_elimination', 'constant_folding',
+                             'dead_code_elimination', 'slot_allocation', 'peephole']
+# the default size limit of the inlined functions (number of operands)
+INLINE_SIZE: int = 16
@@ -0,0 +1,201 @@
+"""
+define the DeadCodeElimination
+"""
+
+try:
+    from compiler.src import ir
+    from compiler.src.graphs import CFGraph
+    from compiler.src.liveness_analysis import LivenessAnalysis
+    from compiler.src.tree_walker import IterativeVisitor
+    from compiler.src.type_checker_helper import ValidTypes, SymbolTable
+except ModuleNotFoundError:
+    from . import ir
+    from .graphs import CFGraph
+    from .liveness_analysis import LivenessAnalysis
+    from .tree_walker import IterativeVisitor
+    from .type_checker_helper import ValidTypes, SymbolTable
+
+
+def has_side_effects(node: ir.Node) -> bool:
+    """
+    check if an expression may have side effects, i.e. it contains a function call
+    or an Integer division (or remainder), that may throw (the divisor is not a constant != 0).
+    """
+    nodes: list[ir.Node] = [node]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, ir.Call):
+            return True
+        if isinstance(node, ir.Binary):
+            if node.operator in ['/', '%'] and node.type == ValidTypes.Integer and \
+                not (isinstance(node.right, ir.Constant) and int(node.right.value) != 0):
+                return True
+            nodes.append(node.left)
+            nodes.append(node.right)
+        elif isinstance(node, ir.Unary):
+            nodes.append(node.operand)
+        elif isinstance(node, ir.Inline):
+            # only the stores of an inlined call have no side effects
+            if not all(isinstance(statement, ir.Assignment) for statement in node.body):
+                return True
+            nodes.extend(node.arguments)
+            nodes.extend(statement.value for statement in node.body)
+            if node.value is not None:
+                nodes.append(node.value)
+    return False
+
+
+def returned_store(body: list[ir.Node], value: ir.Node) -> ir.Assignment:
+    """
+    get the last statement of a body, if it only stores the value, that is returned right after
+    (x = e; return x), so that the expression can be returned directly (None otherwise).
+    """
+    if body and isinstance(value, ir.Variable) and isinstance(body[-1], ir.Assignment) and \
+        body[-1].name == value.name and body[-1].value.type == body[-1].type:
+        return body[-1]
+    return None
+
+
+def statement_bodies(function: ir.Function) -> list[list[ir.Node]]:
+    """
+    get every body (list of statements) of a function, including the nested ones.
+    """
+    bodies: list[list[ir.Node]] = [function.body]
+    i: int = 0
+    while i < len(bodies):
+        for statement in bodies[i]:
+            if isinstance(statement, (ir.Block, ir.While)):
+                bodies.append(statement.body)
+            elif isinstance(statement, ir.If):
+                bodies.append(statement.then_body)
+                if statement.else_body is not None:
+                    bodies.append(statement.else_body)
+        i += 1
+    return bodies
+
+
+class DeadCodeElimination(IterativeVisitor):
+    """
+    remove the dead code of a (main-)function (in place):
+    the statements after a return statement (or a structure, whose branches all return)
+    and the stores (and declarations) of variables, that are not live after the store,
+    using the control flow graph of the liveness analysis.
+    a store of the variable, that is returned right after, is replaced by returning its expression.
+    stores of expressions, that may have side effects (function calls, Integer divisions), are kept.
+    removing a store may make other stores dead, so the liveness is recomputed
+    (without the removed stores) until no more stores are removed.
+    statements are visited to remove the unreachable code, they return if the control flow continues.
+    the removed statements and variables are counted per method and in total.
+    """
+    def __init__(self, symbol_table: SymbolTable) -> None:
+        self.symbol_table: SymbolTable = symbol_table
+        # method -> (number of unreachable statements, variables of the dead stores)
+        self.eliminated: dict[str, tuple[int, list[str]]] = {}
+        self.unreachable_statements: int = 0
+        self.counters: dict[str, int] = {'unreachable_statements': 0, 'dead_stores': 0}
+
+    def eliminate(self, function: ir.Function) -> CFGraph:
+        """
+        remove the dead code of a function and return the control flow graph of the result.
+        """
+        self.unreachable_statements = 0
+        self.visit(function)
+        dead_stores: list[str] = []
+        for body in statement_bodies(function):
+            if not body or not isinstance(body[-1], ir.Return):
+                continue
+            store: ir.Assignment = returned_store(body[:-1], body[-1].value)
+            if store is not None:
+                body[-1].value = store.value
+                del body[-2]
+                dead_stores.append(store.name)
+        liveness_analysis: LivenessAnalysis = LivenessAnalysis(self.symbol_table)
+        liveness_analysis.visit(function)
+        cf_graph: CFGraph = liveness_analysis.control_flow_graphs[function.name]
+        assignment_nodes: list[tuple[ir.Assignment, int]] = liveness_analysis.assignment_nodes
+        if function.inlined_variables:
+            # the stores inside of inlined calls are kept
+            statements: set[int] = {id(statement) for body in statement_bodies(function)
+                                    for statement in body}
+            assignment_nodes = [(assignment, node_id) for assignment, node_id in assignment_nodes
+                                if id(assignment) in statements]
+        dead: set[int] = set()
+        while True:
+            cf_graph.interferences = {}
+            cf_graph.gen_interference_sets()
+            live_assignment_nodes: list[tuple[ir.Assignment, int]] = []
+            for assignment, node_id in assignment_nodes:
+                live_out: set[str] = set()
+                for successor in cf_graph.adj[node_id]:
+                    live_out.update(cf_graph.interferences.get(successor, ()))
+                if node_id in cf_graph.interferences and assignment.name not in live_out and \
+                    not has_side_effects(assignment.value):
+                    # the store (without function calls) is the only content of its node
+                    cf_graph.nodes[node_id].ins.clear()
+                    cf_graph.nodes[node_id].outs.clear()
+                    dead.add(id(assignment))
+                    dead_stores.append(assignment.name)
+                else:
+                    live_assignment_nodes.append((assignment, node_id))
+            if len(live_assignment_nodes) == len(assignment_nodes):
+                break
+            assignment_nodes = live_assignment_nodes
+        if dead:
+            for body in statement_bodies(function):
+                body[:] = [statement for statement in body if id(statement) not in dead]
+        self.eliminated[function.name] = (self.unreachable_statements, dead_stores)
+        self.counters['unreachable_statements'] += self.unreachable_statements
+        self.counters['dead_stores'] += len(dead_stores)
+        return cf_graph
+
+    def visit_body(self, body: list[ir.Node]):
+        """
+        visit every statement and remove the statements after the end of the control flow.
+        """
+        for i, statement in enumerate(body):
+            if (yield statement) is False:
+                self.unreachable_statements += len(body) - i - 1
+                del body[i + 1:]
+                return False
+        return True
+
+    def visitFunction(self, function: ir.Function):
+        yield from self.visit_body(function.body)
+        function.has_return = bool(function.body) and \
+            isinstance(function.body[-1], (ir.Return, ir.TailCall))
+
+    def visitReturn(self, node: ir.Return) -> bool:
+        # control flow always stops
+        return False
+
+    def visitTailCall(self, node: ir.TailCall) -> bool:
+        # control flow always stops (the function starts again)
+        return False
+
+    def visitCall(self, node: ir.Call) -> bool:
+        return True
+
+    def visitInline(self, node: ir.Inline) -> bool:
+        return True
+
+    def visitAssignment(self, node: ir.Assignment) -> bool:
+        return True
+
+    def visitPrint(self, node: ir.Print) -> bool:
+        return True
+
+    def visitBlock(self, node: ir.Block):
+        return (yield from self.visit_body(node.body))
+
+    def visitIf(self, node: ir.If):
+        complete_then: bool = yield from self.visit_body(node.then_body)
+        complete_else: bool = True
+        if node.else_body is not None:
+            complete_else = yield from self.visit_body(node.else_body)
+        # the control flow continues if at least one branch continues
+        return complete_then or complete_else
+
+    def visitWhile(self, node: ir.While):
+        yield from self.visit_body(node.body)
+        # the condition may be false
+        return True
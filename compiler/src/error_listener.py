@@ -4,14 +4,36 @@ define the ErrorListener
 
 from antlr4.error.ErrorListener import ConsoleErrorListener
 
+
+class Diagnostic:
+    """
+    define a single error message of the compiler.
+    """
+    def __init__(self, line: int, column: int, message: str) -> None:
+        self.line: int = line
+        self.column: int = column
+        self.message: str = message
+
+    def __str__(self) -> str:
+        return f"line {self.line}:{self.column} {self.message}"
+
+    def __repr__(self) -> str:
+        return f"Diagnostic({self.line}, {self.column}, {self.message!r})"
+
+
 class ErrorListener(ConsoleErrorListener):
     """
-    default ConsoleErrorListener but saves the occurence of an error
+    default ConsoleErrorListener but saves the occurence of an error.
+    the errors are collected instead of printed, if a list of diagnostics is given.
     """
-    def __init__(self):
+    def __init__(self, diagnostics: list[Diagnostic] = None):
         super().__init__()
         self.has_errors = False
+        self.diagnostics: list[Diagnostic] = diagnostics
 
     def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
         self.has_errors = True
+        if self.diagnostics is not None:
+            self.diagnostics.append(Diagnostic(line, column, msg))
+            return
         super().syntaxError(recognizer, offendingSymbol, line, column, msg, e)
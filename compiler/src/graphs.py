@@ -2,7 +2,7 @@
 define a Graph for Liveness Analysis
 """
 
-from copy import deepcopy
+from collections.abc import Iterator
 from itertools import product
 
 class CFNode:
@@ -41,6 +41,8 @@ class RIGraph:
         self.adj: dict[str, set[str]] = {node: set() for node in self.nodes}
         self.colors: dict[str, int] = {node: -1 for node in self.nodes}
         self.min_registers = 0
+        # number of visited nodes of the search algorithms (for statistics)
+        self.search_nodes: int = 0
         # connect every node with every other node in all given sets
         for i_set in interference_sets:
             if len(i_set) == 1:
@@ -51,11 +53,32 @@ class RIGraph:
                         self.adj[node_a].add(node_b)
         self.brute_force_chromatic_number()
 
+    def to_dict(self) -> dict:
+        """
+        serialize the graph (e.g. for caching).
+        """
+        return {'nodes': self.nodes, 'adj': {node: sorted(adj) for node, adj in self.adj.items()},
+                'colors': self.colors, 'min_registers': self.min_registers}
+
+    @classmethod
+    def from_dict(cls, ri_dict: dict) -> 'RIGraph':
+        """
+        deserialize a graph without recalculating the coloring.
+        """
+        ri_graph: RIGraph = cls.__new__(cls)
+        ri_graph.nodes = ri_dict['nodes']
+        ri_graph.adj = {node: set(adj) for node, adj in ri_dict['adj'].items()}
+        ri_graph.colors = ri_dict['colors']
+        ri_graph.min_registers = ri_dict['min_registers']
+        ri_graph.search_nodes = 0
+        return ri_graph
+
     def bron_kerbosch(self, R: set[str], P: set[str], X: set[str], cliques: list[set[str]]) -> None:
         """
         bron kerbosch maximal cliques algorithm.
         https://en.wikipedia.org/wiki/Bron%E2%80%93Kerbosch_algorithm#With_pivoting
         """
+        self.search_nodes += 1
         if not P and not X:
             cliques.append(R)
             return
@@ -106,6 +129,7 @@ class RIGraph:
             if chrom_num > 7:
                 break
             for color_assignment in product(range(chrom_num), repeat=len(self.nodes)):
+                self.search_nodes += 1
                 coloring = dict(zip(self.nodes, color_assignment))
                 if is_valid_coloring(coloring):
                     best_coloring = coloring.copy()
@@ -141,6 +165,8 @@ class CFGraph:
         self.nodes: list[CFNode] = []
         self.adj: dict[int, set[int]] = {}
         self.interferences: dict[int, set[str]] = {}
+        # number of iterations until the fix point was reached (for statistics)
+        self.iterations: int = 0
 
     def add_node(self, node: CFNode) -> int:
         """
@@ -162,6 +188,7 @@ class CFGraph:
         """
         traverse the control flow graph using dfs and update register
         interference sets.
+        an explicit stack is used, so that long programs do not raise a RecursionError.
         """
         if node_id not in self.interferences:
             self.interferences[node_id] = set()
@@ -169,41 +196,43 @@ class CFGraph:
             return self.interferences[node_id]
 
         visited.add(node_id)
-        interference_set = set()
-
-        for neighbor_id in self.adj[node_id]:
-            neighbor_interference = self.dfs(neighbor_id, visited)
-            interference_set.update(neighbor_interference)
-
-        node = self.nodes[node_id]
-        for variable in node.ins:
-            interference_set.discard(variable)
-        interference_set.update(node.outs)
-        self.interferences[node_id].update(interference_set.copy())
-
-        return interference_set
-
-    def _interferences_equal(self, dict_a: dict[int, set[str]],
-                             dict_b: dict[int, set[str]]) -> bool:
-        """
-        check if two dictionaries have the same values.
-        """
-        if set(dict_a.keys()) != set(dict_b.keys()):
-            return False
-        for key in dict_a:
-            if dict_a[key] != dict_b[key]:
-                return False
-        return True
+        # (node id, remaining neighbors, interference set) of every unfinished node
+        stack: list[tuple[int, Iterator[int], set[str]]] = [
+            (node_id, iter(self.adj[node_id]), set())]
+        while True:
+            node_id, neighbors, interference_set = stack[-1]
+            neighbor_id: int = next(neighbors, None)
+            if neighbor_id is not None:
+                if neighbor_id not in self.interferences:
+                    self.interferences[neighbor_id] = set()
+                if neighbor_id in visited:
+                    interference_set.update(self.interferences[neighbor_id])
+                else:
+                    visited.add(neighbor_id)
+                    stack.append((neighbor_id, iter(self.adj[neighbor_id]), set()))
+                continue
+            # all neighbors are done
+            stack.pop()
+            node = self.nodes[node_id]
+            for variable in node.ins:
+                interference_set.discard(variable)
+            interference_set.update(node.outs)
+            self.interferences[node_id].update(interference_set)
+            if not stack:
+                return interference_set
+            stack[-1][2].update(interference_set)
 
     def gen_interference_sets(self) -> list[set[str]]:
         """
         traverse the control flow graph using dfs and update register
         interference sets, until no changes were made.
+        the sets only grow, so they are unchanged if their number and total size are unchanged.
         """
-        interferences: dict[int, set[str]] = {None: None}
-        while not self._interferences_equal(self.interferences, interferences):
-            interferences: dict[int, set[str]] = deepcopy(self.interferences)
+        size: tuple[int, int] = None
+        while size != (len(self.interferences), sum(map(len, self.interferences.values()))):
+            size = (len(self.interferences), sum(map(len, self.interferences.values())))
             self.dfs(0, set())
+            self.iterations += 1
         return [s for s in self.interferences.values() if s]
 
     def __str__(self) -> str:
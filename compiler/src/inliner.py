@@ -0,0 +1,374 @@
+"""
+define the Inliner
+"""
+
+try:
+    from compiler.src import ir
+    from compiler.src.constants import INLINE_SIZE
+    from compiler.src.dead_code_elimination import returned_store
+    from compiler.src.slot_allocation import variable_width
+    from compiler.src.tree_walker import IterativeVisitor
+    from compiler.src.type_checker_helper import SymbolTable, FunctionSymbol
+except ModuleNotFoundError:
+    from . import ir
+    from .constants import INLINE_SIZE
+    from .dead_code_elimination import returned_store
+    from .slot_allocation import variable_width
+    from .tree_walker import IterativeVisitor
+    from .type_checker_helper import SymbolTable, FunctionSymbol
+
+# the statements of an inlined function besides the final return statement
+STRAIGHT_LINE_STATEMENTS: tuple[type, ...] = (ir.Assignment, ir.Print, ir.Call)
+
+
+def recursive_functions(symbol_table: SymbolTable) -> set[str]:
+    """
+    get the functions, that can call themselves (directly or through other functions,
+    including main), using the strongly connected components of the call graph (tarjan).
+    an explicit stack is used, so that long call chains do not raise a RecursionError.
+    """
+    functions: dict[str, FunctionSymbol] = symbol_table.functions
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    recursive: set[str] = set()
+    for root in functions:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        # (function, remaining callees) of every unfinished function
+        work: list[tuple[str, iter]] = [(root, iter(functions[root].calls))]
+        while work:
+            f_name, callees = work[-1]
+            callee: str = next(callees, None)
+            if callee is not None:
+                if callee not in functions:
+                    continue
+                if callee not in index:
+                    index[callee] = low[callee] = len(index)
+                    stack.append(callee)
+                    on_stack.add(callee)
+                    work.append((callee, iter(functions[callee].calls)))
+                elif callee in on_stack:
+                    low[f_name] = min(low[f_name], index[callee])
+                continue
+            work.pop()
+            if work:
+                low[work[-1][0]] = min(low[work[-1][0]], low[f_name])
+            if low[f_name] != index[f_name]:
+                continue
+            component: list[str] = []
+            while not component or component[-1] != f_name:
+                component.append(stack.pop())
+                on_stack.discard(component[-1])
+            if len(component) > 1 or f_name in functions[f_name].calls:
+                recursive.update(component)
+    return recursive
+
+
+class TreeCopy(IterativeVisitor):
+    """
+    copy the IR of the straight-line statements of a function (without the debug info).
+    if a base slot is given, the variables are moved into the slots of the caller
+    (the slots are shifted by the base and every variable is named by its slot and type,
+    the names are added to the given variables).
+    the loads of the substituted variables are replaced by the loads of other variables.
+    """
+    def __init__(self, base: int = None, variables: dict[str, str] = None,
+                 substitutes: dict[str, ir.Variable] = None) -> None:
+        self.base: int = base
+        self.variables: dict[str, str] = variables
+        self.substitutes: dict[str, ir.Variable] = substitutes or {}
+
+    def variable(self, name: str, v_type: str, slot: int) -> tuple[str, int]:
+        """
+        get the name and slot of a (copied) variable.
+        """
+        if self.base is None:
+            return name, slot
+        slot += self.base
+        name = f"inlined_{slot}_{v_type}"
+        self.variables[name] = v_type
+        return name, slot
+
+    def visitConstant(self, node: ir.Constant) -> ir.Constant:
+        return ir.Constant(node.value, node.type)
+
+    def visitVariable(self, node: ir.Variable) -> ir.Variable:
+        if node.name in self.substitutes:
+            node = self.substitutes[node.name]
+            return ir.Variable(node.name, node.type, node.slot)
+        name, slot = self.variable(node.name, node.type, node.slot)
+        return ir.Variable(name, node.type, slot)
+
+    def visitUnary(self, node: ir.Unary):
+        return ir.Unary(node.operator, (yield node.operand), node.type)
+
+    def visitBinary(self, node: ir.Binary):
+        left: ir.Node = yield node.left
+        return ir.Binary(node.operator, left, (yield node.right), node.type)
+
+    def visitCall(self, node: ir.Call):
+        arguments: list[ir.Node] = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+        return ir.Call(node.function, arguments)
+
+    def visitInline(self, node: ir.Inline):
+        parameters: list[ir.Variable] = []
+        for parameter in node.parameters:
+            parameters.append((yield parameter))
+        arguments: list[ir.Node] = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+        body: list[ir.Node] = []
+        for statement in node.body:
+            body.append((yield statement))
+        value: ir.Node = None
+        if node.value is not None:
+            value = yield node.value
+        return ir.Inline(node.function, parameters, arguments, body, value)
+
+    def visitAssignment(self, node: ir.Assignment):
+        name, slot = self.variable(node.name, node.type, node.slot)
+        return ir.Assignment(name, node.type, slot, (yield node.value), node.declaration)
+
+    def visitPrint(self, node: ir.Print):
+        return ir.Print(None if node.value is None else (yield node.value))
+
+    def visitReturn(self, node: ir.Return):
+        return ir.Return(None if node.value is None else (yield node.value))
+
+
+class Inliner(IterativeVisitor):
+    """
+    replace the calls of small functions by their body (see ir.Inline).
+    the call graph is built from the call sites in the symbol table.
+    a function is inlined, if it is not recursive (see recursive_functions),
+    its size (number of operands, including the inlined calls) is at most max_size
+    and its body only consists of straight-line statements and a final return statement.
+    the variables of an inlined call get fresh slots after the variables of the caller and of
+    all previously inlined calls, including the calls inlined into its arguments
+    (respecting the width of Float64s), so no two inlined calls share a variable
+    (the slot allocation shares the slots of the variables, that do not interfere).
+    the IR of the inlinable functions must be added first (see add_function).
+    statements are visited to replace their calls (in place), every visit returns the new node.
+    the number of inlined calls is counted.
+    """
+    def __init__(self, symbol_table: SymbolTable, max_size: int = INLINE_SIZE) -> None:
+        self.symbol_table: SymbolTable = symbol_table
+        self.max_size: int = max_size
+        # function -> size including the inlined calls (of every inlinable function)
+        self.sizes: dict[str, int] = {}
+        self.gen_sizes(recursive_functions(symbol_table))
+        # the copied IR of the added inlinable functions
+        self.functions: dict[str, ir.Function] = {}
+        # function -> (parameters, body, value, frame size) using the slots of the function
+        self.templates: dict[str, tuple[list[ir.Variable], list[ir.Node], ir.Node, int]] = {}
+        # the number of used slots (the first free slot) and the inlined variables
+        # of the function, that is currently inlined into
+        self.frame_size: int = 0
+        self.variables: dict[str, str] = {}
+        # the statement, that is currently visited
+        self.statement: ir.Node = None
+        self.counters: dict[str, int] = {'inlined_calls': 0}
+
+    def gen_sizes(self, recursive: set[str]) -> None:
+        """
+        calculate the sizes of the inlinable functions (the callees first).
+        """
+        functions: dict[str, FunctionSymbol] = self.symbol_table.functions
+        sizes: dict[str, int] = {}
+        for root in functions:
+            if root in sizes or root in recursive or root == 'main':
+                continue
+            # every function is finished after its (non recursive) callees
+            work: list[tuple[str, iter]] = [(root, iter(functions[root].calls))]
+            while work:
+                f_name, callees = work[-1]
+                callee: str = next(callees, None)
+                if callee is not None:
+                    if callee in functions and callee not in sizes and \
+                        callee not in recursive and callee != 'main':
+                        work.append((callee, iter(functions[callee].calls)))
+                    continue
+                work.pop()
+                sizes[f_name] = functions[f_name].size + sum(
+                    count * self.sizes[callee] for callee, count in functions[f_name].calls.items()
+                    if callee in self.sizes)
+                if sizes[f_name] <= self.max_size:
+                    self.sizes[f_name] = sizes[f_name]
+
+    def dependencies(self, f_name: str) -> list[str]:
+        """
+        get the inlinable functions, that can be inlined into a function (transitively).
+        """
+        functions: dict[str, FunctionSymbol] = self.symbol_table.functions
+        found: dict[str, None] = {}
+        todo: list[str] = [f_name]
+        while todo:
+            for callee in functions[todo.pop()].calls:
+                if callee in self.sizes and callee not in found:
+                    found[callee] = None
+                    todo.append(callee)
+        return sorted(found)
+
+    def add_function(self, function: ir.Function) -> None:
+        """
+        add (a copy of) the IR of a function, if it can be inlined.
+        """
+        if function.name not in self.sizes:
+            return
+        body: list[ir.Node] = function.body
+        if function.has_return:
+            body = body[:-1]
+        if not all(isinstance(statement, STRAIGHT_LINE_STATEMENTS) for statement in body):
+            return
+        copy: TreeCopy = TreeCopy()
+        self.functions[function.name] = ir.Function(
+            function.symbol, [copy.visit(statement) for statement in function.body],
+            function.has_return, function.locals_size, [], function.source,
+            function.line, function.column)
+
+    def template(self, f_name: str) -> tuple[list[ir.Variable], list[ir.Node], ir.Node, int]:
+        """
+        get the inlined body of a function (its calls are inlined as well),
+        None if the function can not be inlined.
+        """
+        if f_name in self.templates or f_name not in self.functions:
+            return self.templates.get(f_name)
+        function: ir.Function = self.functions[f_name]
+        # (the copy of the function is only used for the template)
+        body: list[ir.Node] = function.body
+        value: ir.Node = None
+        if function.has_return:
+            value = body.pop().value
+        # (x = e; return x -> e)
+        if returned_store(body, value) is not None:
+            value = body.pop().value
+        # (only the calls inlined into a method are counted)
+        state: tuple = (self.frame_size, self.variables, self.statement,
+                        self.counters['inlined_calls'])
+        self.frame_size = function.locals_size
+        self.variables = {}
+        for i, statement in enumerate(body):
+            self.statement = statement
+            body[i] = self.visit(statement)
+        if value is not None:
+            self.statement = None
+            value = self.visit(value)
+        frame_size: int = self.frame_size
+        self.frame_size, self.variables, self.statement, self.counters['inlined_calls'] = state
+        # the parameters are the first local variables
+        parameters: list[ir.Variable] = []
+        slot: int = 0
+        for v_name, v_type in function.symbol.parameters.items():
+            parameters.append(ir.Variable(v_name, v_type, slot))
+            slot += variable_width(v_type)
+        self.templates[f_name] = (parameters, body, value, frame_size)
+        return self.templates[f_name]
+
+    def inline(self, function: ir.Function) -> int:
+        """
+        inline the calls of a function (in place) and return the number of inlined calls.
+        """
+        inlined_calls: int = self.counters['inlined_calls']
+        self.frame_size = function.locals_size
+        self.variables = function.inlined_variables
+        for i, statement in enumerate(function.body):
+            self.statement = statement
+            function.body[i] = self.visit(statement)
+        function.locals_size = self.frame_size
+        return self.counters['inlined_calls'] - inlined_calls
+
+    def visit_body(self, body: list[ir.Node]):
+        """
+        replace the calls of every statement of a body.
+        """
+        for i, statement in enumerate(body):
+            self.statement = statement
+            body[i] = yield statement
+
+    def visitAssignment(self, node: ir.Assignment):
+        node.value = yield node.value
+        return node
+
+    def visitPrint(self, node: ir.Print):
+        if node.value is not None:
+            node.value = yield node.value
+        return node
+
+    def visitReturn(self, node: ir.Return):
+        if node.value is not None:
+            node.value = yield node.value
+        return node
+
+    def visitBlock(self, node: ir.Block):
+        yield from self.visit_body(node.body)
+        return node
+
+    def visitIf(self, node: ir.If):
+        node.condition = yield node.condition
+        yield from self.visit_body(node.then_body)
+        if node.else_body is not None:
+            yield from self.visit_body(node.else_body)
+        return node
+
+    def visitWhile(self, node: ir.While):
+        node.condition = yield node.condition
+        yield from self.visit_body(node.body)
+        return node
+
+    def visitCall(self, node: ir.Call):
+        statement: bool = node is self.statement
+        for i, argument in enumerate(node.arguments):
+            node.arguments[i] = yield argument
+        # the value of a call statement is not used (only calls of Void functions are inlined)
+        if statement and node.type is not None:
+            return node
+        template = self.template(node.function.f_name) if node.function.f_name in self.sizes \
+            else None
+        if template is None:
+            return node
+        parameters, body, value, frame_size = template
+        # a parameter, that is not assigned, is replaced by its argument, if the argument
+        # is a variable (the inlined call does not store the variables of the caller)
+        assigned: set[str] = {statement.name for statement in body
+                              if isinstance(statement, ir.Assignment)}
+        substitutes: dict[str, ir.Variable] = {}
+        arguments: list[ir.Node] = []
+        for parameter, argument in zip(parameters, node.arguments):
+            if isinstance(argument, ir.Variable) and parameter.name not in assigned:
+                substitutes[parameter.name] = argument
+            else:
+                arguments.append(argument)
+        # (after the slots of the calls inlined into the arguments)
+        base: int = self.frame_size
+        copy: TreeCopy = TreeCopy(base, self.variables, substitutes)
+        inline: ir.Inline = ir.Inline(
+            node.function, [copy.visit(parameter) for parameter in parameters
+                            if parameter.name not in substitutes], arguments,
+            [copy.visit(statement) for statement in body],
+            None if value is None else copy.visit(value))
+        inline.debug = node.debug
+        self.frame_size = base + frame_size
+        self.counters['inlined_calls'] += 1
+        return inline
+
+    def visitUnary(self, node: ir.Unary):
+        node.operand = yield node.operand
+        return node
+
+    def visitBinary(self, node: ir.Binary):
+        node.left = yield node.left
+        node.right = yield node.right
+        return node
+
+    def visitVariable(self, node: ir.Variable) -> ir.Variable:
+        return node
+
+    def visitConstant(self, node: ir.Constant) -> ir.Constant:
+        return node
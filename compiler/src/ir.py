@@ -0,0 +1,292 @@
+"""
+define the IR (compact intermediate representation of a typechecked program)
+"""
+
+try:
+    from compiler.src.type_checker_helper import FunctionSymbol
+except ModuleNotFoundError:
+    from .type_checker_helper import FunctionSymbol
+
+
+class Node:
+    """
+    base class of all IR nodes.
+    the debug lines (only in debug mode) precede the code of the node.
+    """
+    __slots__ = ('debug',)
+
+    def __init__(self) -> None:
+        self.debug: str = None
+
+
+# --- Expressions ---
+
+class Constant(Node):
+    """
+    define a constant (the value is its source text, e.g. '1.5', '"text"', 'true')
+    """
+    __slots__ = ('value', 'type')
+
+    def __init__(self, value: str, type_: str) -> None:
+        super().__init__()
+        self.value: str = value
+        self.type: str = type_
+
+    def accept(self, visitor):
+        return visitor.visitConstant(self)
+
+
+class Variable(Node):
+    """
+    define a loaded local variable (or parameter) and its slot
+    """
+    __slots__ = ('name', 'type', 'slot')
+
+    def __init__(self, name: str, type_: str, slot: int) -> None:
+        super().__init__()
+        self.name: str = name
+        self.type: str = type_
+        self.slot: int = slot
+
+    def accept(self, visitor):
+        return visitor.visitVariable(self)
+
+
+class Unary(Node):
+    """
+    define an unary operation ('+', '-', '!')
+    """
+    __slots__ = ('operator', 'operand', 'type')
+
+    def __init__(self, operator: str, operand: Node, type_: str) -> None:
+        super().__init__()
+        self.operator: str = operator
+        self.operand: Node = operand
+        self.type: str = type_
+
+    def accept(self, visitor):
+        return visitor.visitUnary(self)
+
+
+class Binary(Node):
+    """
+    define a binary operation (arithmetic, comparison or boolean)
+    """
+    __slots__ = ('operator', 'left', 'right', 'type')
+
+    def __init__(self, operator: str, left: Node, right: Node, type_: str) -> None:
+        super().__init__()
+        self.operator: str = operator
+        self.left: Node = left
+        self.right: Node = right
+        self.type: str = type_
+
+    def accept(self, visitor):
+        return visitor.visitBinary(self)
+
+
+class Call(Node):
+    """
+    define a function call (expression or statement)
+    """
+    __slots__ = ('function', 'arguments')
+
+    def __init__(self, function: FunctionSymbol, arguments: list[Node]) -> None:
+        super().__init__()
+        self.function: FunctionSymbol = function
+        self.arguments: list[Node] = arguments
+
+    @property
+    def type(self) -> str:
+        return self.function.f_type
+
+    def accept(self, visitor):
+        return visitor.visitCall(self)
+
+
+class Inline(Node):
+    """
+    define an inlined function call (expression or statement):
+    the arguments are evaluated and stored into the parameters (in fresh slots of the caller),
+    then the body (straight-line statements) is executed and the value (optional) is loaded
+    """
+    __slots__ = ('function', 'parameters', 'arguments', 'body', 'value')
+
+    def __init__(self, function: FunctionSymbol, parameters: list[Variable],
+                 arguments: list[Node], body: list[Node], value: Node) -> None:
+        super().__init__()
+        self.function: FunctionSymbol = function
+        self.parameters: list[Variable] = parameters
+        self.arguments: list[Node] = arguments
+        self.body: list[Node] = body
+        self.value: Node = value
+
+    @property
+    def type(self) -> str:
+        return self.function.f_type
+
+    def accept(self, visitor):
+        return visitor.visitInline(self)
+
+
+# --- Statements ---
+
+class Assignment(Node):
+    """
+    define a declaration or assignement of a local variable
+    """
+    __slots__ = ('name', 'type', 'slot', 'value', 'declaration')
+
+    def __init__(self, name: str, type_: str, slot: int, value: Node,
+                 declaration: bool) -> None:
+        super().__init__()
+        self.name: str = name
+        self.type: str = type_
+        self.slot: int = slot
+        self.value: Node = value
+        self.declaration: bool = declaration
+
+    def accept(self, visitor):
+        return visitor.visitAssignment(self)
+
+
+class Print(Node):
+    """
+    define a println statement (the value is optional)
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Node) -> None:
+        super().__init__()
+        self.value: Node = value
+
+    def accept(self, visitor):
+        return visitor.visitPrint(self)
+
+
+class Return(Node):
+    """
+    define a return statement (the value is optional)
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Node) -> None:
+        super().__init__()
+        self.value: Node = value
+
+    def accept(self, visitor):
+        return visitor.visitReturn(self)
+
+
+class TailCall(Node):
+    """
+    define a call of the current function in tail position (replaces the return statement):
+    the arguments are evaluated, stored into the parameters and the function starts again
+    """
+    __slots__ = ('function', 'parameters', 'arguments')
+
+    def __init__(self, function: FunctionSymbol, parameters: list[Variable],
+                 arguments: list[Node]) -> None:
+        super().__init__()
+        self.function: FunctionSymbol = function
+        self.parameters: list[Variable] = parameters
+        self.arguments: list[Node] = arguments
+
+    def accept(self, visitor):
+        return visitor.visitTailCall(self)
+
+
+class Block(Node):
+    """
+    define a begin-end block
+    """
+    __slots__ = ('body',)
+
+    def __init__(self, body: list[Node]) -> None:
+        super().__init__()
+        self.body: list[Node] = body
+
+    def accept(self, visitor):
+        return visitor.visitBlock(self)
+
+
+class If(Node):
+    """
+    define an if structure (the else branch is optional)
+    """
+    __slots__ = ('condition', 'then_body', 'else_body')
+
+    def __init__(self, condition: Node, then_body: list[Node], else_body: list[Node]) -> None:
+        super().__init__()
+        self.condition: Node = condition
+        self.then_body: list[Node] = then_body
+        self.else_body: list[Node] = else_body
+
+    def accept(self, visitor):
+        return visitor.visitIf(self)
+
+
+class While(Node):
+    """
+    define a while structure
+    """
+    __slots__ = ('condition', 'body')
+
+    def __init__(self, condition: Node, body: list[Node]) -> None:
+        super().__init__()
+        self.condition: Node = condition
+        self.body: list[Node] = body
+
+    def accept(self, visitor):
+        return visitor.visitWhile(self)
+
+
+# --- Functions ---
+
+class Function(Node):
+    """
+    define a (main-)function.
+    the body contains the declarations, the instructions and the final return statement.
+    the source text and position identify the function in the compile cache.
+    """
+    __slots__ = ('symbol', 'body', 'has_return', 'locals_size', 'calls',
+                 'source', 'line', 'column', 'inlined_variables')
+
+    def __init__(self, symbol: FunctionSymbol, body: list[Node], has_return: bool,
+                 locals_size: int, calls: list[FunctionSymbol], source: str,
+                 line: int, column: int) -> None:
+        super().__init__()
+        self.symbol: FunctionSymbol = symbol
+        self.body: list[Node] = body
+        # True if the body ends with a return statement
+        self.has_return: bool = has_return
+        # number of local variable slots ('.limit locals')
+        self.locals_size: int = locals_size
+        # the called functions (without main)
+        self.calls: list[FunctionSymbol] = calls
+        self.source: str = source
+        self.line: int = line
+        self.column: int = column
+        # the variables of the inlined calls (besides the local variables of the symbol)
+        self.inlined_variables: dict[str, str] = {}
+
+    @property
+    def name(self) -> str:
+        return self.symbol.f_name
+
+    def accept(self, visitor):
+        return visitor.visitFunction(self)
+
+
+class Program(Node):
+    """
+    define the entire program (all functions in order of their definition)
+    """
+    __slots__ = ('functions',)
+
+    def __init__(self, functions: list[Function]) -> None:
+        super().__init__()
+        self.functions: list[Function] = functions
+
+    def accept(self, visitor):
+        return visitor.visitProgram(self)
@@ -4,27 +4,38 @@ calculate the chromatic number
 """
 
 try:
-    from compiler.src.CoBaParser import CoBaParser
-    from compiler.src.CoBaParserVisitor import CoBaParserVisitor
+    from compiler.src import ir
+    from compiler.src.compile_cache import CompileCache
+    from compiler.src.compile_stats import CompileStats
     from compiler.src.graphs import CFNode, CFGraph, RIGraph
+    from compiler.src.tree_walker import IterativeVisitor
     from compiler.src.type_checker_helper import SymbolTable
 except ModuleNotFoundError:
-    from .CoBaParser import CoBaParser
-    from .CoBaParserVisitor import CoBaParserVisitor
+    from . import ir
+    from .compile_cache import CompileCache
+    from .compile_stats import CompileStats
     from .graphs import CFNode, CFGraph, RIGraph
+    from .tree_walker import IterativeVisitor
     from .type_checker_helper import SymbolTable
 
 
-class LivenessAnalysis(CoBaParserVisitor):
+class LivenessAnalysis(IterativeVisitor):
     """
     analyse liveness by constructing a controlflowgraph and
-    a register interferencegraph and calculate its chromatic value
+    a register interferencegraph (of the IR) and calculate its chromatic value.
+    children are visited by yielding them (see IterativeVisitor).
     """
-    def __init__(self, symbol_table: SymbolTable) -> None:
+    def __init__(self, symbol_table: SymbolTable, cache: CompileCache = None,
+                 stats: CompileStats = None) -> None:
         self.symbol_table: SymbolTable = symbol_table
+        self.cache: CompileCache = cache
+        self.stats: CompileStats = stats or CompileStats(None, 'liveness')
         self.current_graph: CFGraph = None
         self.control_flow_graphs: dict[str, CFGraph] = {}
+        self.functions: dict[str, ir.Function] = {}
         self.register_interference_graphs: dict[str, RIGraph] = {}
+        # every assignment and its control flow node (e.g. to find dead stores)
+        self.assignment_nodes: list[tuple[ir.Assignment, int]] = []
         self.node_anchor_id: int = -1
 
     def gen_interference_graph(self) -> None:
@@ -32,51 +43,60 @@ class LivenessAnalysis(CoBaParserVisitor):
         generate the register interference graphs for each function
         """
         for f_name, cf_graph in self.control_flow_graphs.items():
-            ri_graph = RIGraph([*self.symbol_table.get_function(f_name).local_variables.keys()],
-                               cf_graph.gen_interference_sets())
+            cache_key: str = None
+            if self.cache is not None:
+                # the graph only depends on the function itself
+                cache_key = self.cache.key('liveness', self.functions[f_name].source)
+                cache_entry: dict = self.cache.get(cache_key)
+                if cache_entry is not None:
+                    self.register_interference_graphs[f_name] = RIGraph.from_dict(cache_entry)
+                    continue
+            with self.stats.phase('liveness_interference'):
+                interference_sets: list[set[str]] = cf_graph.gen_interference_sets()
+            self.stats.count('liveness_iterations', cf_graph.iterations)
+            with self.stats.phase('liveness_coloring'):
+                ri_graph = RIGraph([*self.symbol_table.get_function(f_name).local_variables.keys()],
+                                   interference_sets)
+            self.stats.count('coloring_search_nodes', ri_graph.search_nodes)
             self.register_interference_graphs[f_name] = ri_graph
+            if cache_key is not None:
+                self.cache.put(cache_key, ri_graph.to_dict())
 
-    def visitMain_function_header(self, ctx:CoBaParser.Main_function_headerContext) -> None:
-        # create a new control flow graph since a new function starts
-        self.current_graph = CFGraph()
-        self.control_flow_graphs[ctx.K_MAIN().getText()] = self.current_graph
-
-        node: CFNode = CFNode()
-        self.node_anchor_id = self.current_graph.add_node(node)
+    def visitProgram(self, program: ir.Program):
+        for function in program.functions:
+            yield function
 
-    def visitFunction_header(self, ctx: CoBaParser.Function_headerContext) -> None:
+    def visitFunction(self, function: ir.Function):
         # create a new control flow graph since a new function starts
-        f_name: str = ctx.IDENTIFIER().getText()
         self.current_graph = CFGraph()
-        self.control_flow_graphs[f_name] = self.current_graph
+        self.control_flow_graphs[function.name] = self.current_graph
+        self.functions[function.name] = function
 
         node: CFNode = CFNode()
         # in contrast to the main function this function may contain parameters
         # that used to store values in
-        # we just use the symbol table instead of iterating over the parameters
-        for param in self.symbol_table.get_function(f_name).parameters.keys():
+        for param in function.symbol.parameters.keys():
             node.add_in(param)
         self.node_anchor_id = self.current_graph.add_node(node)
-
-    def visitFunction_body(self, ctx: CoBaParser.Function_bodyContext) -> None:
-        # visit every declaration of the function body
-        for declaration in ctx.declaration():
-            self.visit(declaration)
-        # visit every instruction of the function body
+        # visit every statement of the function body
         # the flow may end if a return is used
-        for instruction in ctx.instruction():
-            if self.visit(instruction) is False:
-                return
-        # visit the optional final return statement
-        if ctx.return_statement() is not None:
-            self.visit(ctx.return_statement())
+        yield from self.visit_body(function.body)
 
-    def visitReturn_statement(self, ctx: CoBaParser.Return_statementContext) -> bool:
+    def visit_body(self, body: list[ir.Node]):
+        """
+        visit every statement and return indicator if the control flow continues
+        """
+        for statement in body:
+            if (yield statement) is False:
+                return False
+        return True
+
+    def visitReturn(self, node_ir: ir.Return) -> bool:
         # create a control flow node for a return statement
         node: CFNode = CFNode()
         # every variable used in the return expression is loaded
-        if ctx.expression() is not None:
-            for variable in self.visit(ctx.expression()):
+        if node_ir.value is not None:
+            for variable in (yield node_ir.value):
                 node.add_out(variable)
 
         node_id: int = self.current_graph.add_node(node)
@@ -86,87 +106,95 @@ class LivenessAnalysis(CoBaParserVisitor):
         # control flow always stops
         return False
 
-    def visitFunction_call(self, ctx: CoBaParser.Function_callContext) -> bool:
+    def visitTailCall(self, node_ir: ir.TailCall):
+        # create a control flow node for a tail call,
+        # the arguments are loaded and then stored into the parameters
+        node: CFNode = CFNode()
+        for argument in node_ir.arguments:
+            for v_in in (yield argument):
+                node.add_out(v_in)
+        for parameter in node_ir.parameters:
+            node.add_in(parameter.name)
+
+        node_id: int = self.current_graph.add_node(node)
+        self.current_graph.add_edge(self.node_anchor_id, node_id)
+        self.node_anchor_id = node_id
+        # control flow always stops (the function starts again with the stored parameters,
+        # like with the parameters of the first node)
+        return False
+
+    def visitCall(self, node_ir: ir.Call) -> list[str]:
         # create a control flow node for the function call.
         # the variables that are loaded are the arguments passed in
         # arguments may contain instructions
         node: CFNode = CFNode()
-        if ctx.function_argument() is not None:
-            for v_in in self.visit(ctx.function_argument()):
+        for argument in node_ir.arguments:
+            for v_in in (yield argument):
                 node.add_out(v_in)
 
         node_id: int = self.current_graph.add_node(node)
         self.current_graph.add_edge(self.node_anchor_id, node_id)
         # append the new node and make it the anchor for following nodes
         self.node_anchor_id = node_id
-        # control flow always continues
-        return True
-
-    def visitFunction_argument(self, ctx: CoBaParser.Function_argumentContext) -> list[str]:
-        # return the used variables that need to be loaded for the function call
-        # iterate over all arguments
-        used_vars: list[str] = self.visit(ctx.expression())
-        if ctx.function_argument() is not None:
-            used_vars += self.visit(ctx.function_argument())
-        return used_vars
+        # function calls are their own nodes, an expression containing
+        # the call does not load any variables of it (control flow always continues)
+        return []
 
-    def visitDeclaration(self, ctx: CoBaParser.DeclarationContext) -> bool:
-        # create a control flow node for a declaration
+    def visitInline(self, node_ir: ir.Inline):
+        # create a control flow node for the parameters of the inlined call.
+        # the arguments are loaded and stored into the parameters
         node: CFNode = CFNode()
-        # the variable that is used for storage is the identifier
-        node.add_in(ctx.IDENTIFIER().getText())
-        # the expression contains every variable that gets loaded
-        for v_in in self.visit(ctx.expression()):
-            node.add_out(v_in)
-
+        for argument in node_ir.arguments:
+            for v_in in (yield argument):
+                node.add_out(v_in)
+        for parameter in node_ir.parameters:
+            node.add_in(parameter.name)
         node_id: int = self.current_graph.add_node(node)
         self.current_graph.add_edge(self.node_anchor_id, node_id)
-        # append the new node and make it the anchor for following nodes
         self.node_anchor_id = node_id
-        # control flow always continues
-        return True
-
-    def visitInstruction(self, ctx:CoBaParser.InstructionContext) -> bool:
-        # pass on the control flow indicator
-        return self.visit(ctx.assignement() or ctx.block_structure() or ctx.control_structure() or \
-            ctx.print_() or ctx.function_call() or ctx.return_statement())
+        # the body only contains straight-line statements
+        for statement in node_ir.body:
+            yield statement
+        if node_ir.value is not None:
+            # the value is loaded at the end of the inlined call (before the variables
+            # of the call are reused), so it gets its own node as well
+            node = CFNode()
+            for variable in (yield node_ir.value):
+                node.add_out(variable)
+            node_id = self.current_graph.add_node(node)
+            self.current_graph.add_edge(self.node_anchor_id, node_id)
+            self.node_anchor_id = node_id
+        # (control flow always continues)
+        return []
 
-    def visitAssignement(self, ctx: CoBaParser.AssignementContext) -> bool:
-        # create a control flow node for an assignement
+    def visitAssignment(self, node_ir: ir.Assignment) -> bool:
+        # create a control flow node for a declaration or assignement
         node: CFNode = CFNode()
         # the variable that is used for storage is the identifier
-        node.add_in(ctx.IDENTIFIER().getText())
+        node.add_in(node_ir.name)
         # the expression contains every variable that gets loaded
-        for v_in in self.visit(ctx.expression()):
+        for v_in in (yield node_ir.value):
             node.add_out(v_in)
 
         node_id: int = self.current_graph.add_node(node)
         self.current_graph.add_edge(self.node_anchor_id, node_id)
+        self.assignment_nodes.append((node_ir, node_id))
         # append the new node and make it the anchor for following nodes
         self.node_anchor_id = node_id
         # control flow always continues
         return True
 
-    def visitBlock_structure(self, ctx: CoBaParser.Block_structureContext) -> bool:
+    def visitBlock(self, node_ir: ir.Block) -> bool:
         # visit every instruction
         # the entire control flow may end here if a return statement is used
-        for instruction in ctx.instruction():
-            if self.visit(instruction) is False:
-                return False
-        return True
-
-    def visitControl_structure(self, ctx:CoBaParser.Control_structureContext) -> bool:
-        if ctx.if_structure() is not None:
-            return self.visit(ctx.if_structure())
-        if ctx.while_structure() is not None:
-            return self.visit(ctx.while_structure())
+        return (yield from self.visit_body(node_ir.body))
 
-    def visitPrint(self, ctx: CoBaParser.PrintContext) -> bool:
+    def visitPrint(self, node_ir: ir.Print) -> bool:
         # create a control flow node for a print statement
         node: CFNode = CFNode()
         # the optional expression contains every variable that gets loaded
-        if ctx.expression() is not None:
-            for variable in self.visit(ctx.expression()):
+        if node_ir.value is not None:
+            for variable in (yield node_ir.value):
                 node.add_out(variable)
 
         node_id: int = self.current_graph.add_node(node)
@@ -176,24 +204,24 @@ class LivenessAnalysis(CoBaParserVisitor):
         # control flow always continues
         return True
 
-    def visitIf_structure(self, ctx: CoBaParser.If_structureContext) -> bool:
+    def visitIf(self, node_ir: ir.If) -> bool:
         # create a control flow node for the start of an if structure
         node_s: CFNode = CFNode()
         # the boolsch statement in the if header contains every loaded variable
-        for variable in self.visit(ctx.bool_expression()):
+        for variable in (yield node_ir.condition):
             node_s.add_out(variable)
         node_id_s: int = self.current_graph.add_node(node_s)
         self.current_graph.add_edge(self.node_anchor_id, node_id_s)
         # append the new node and make it the anchor for following nodes
         self.node_anchor_id = node_id_s
 
-        complete_then = self.visit(ctx.then_branch())
+        complete_then = yield from self.visit_body(node_ir.then_body)
         complete_else = True
         # temporarily save the last then-branch node
         then_id: int = self.node_anchor_id
         self.node_anchor_id = node_id_s
-        if ctx.else_branch() is not None:
-            complete_else = self.visit(ctx.else_branch())
+        if node_ir.else_body is not None:
+            complete_else = yield from self.visit_body(node_ir.else_body)
         if complete_then or complete_else:
             # create a control flow node for the end of an if structure
             node_e: CFNode = CFNode()
@@ -210,65 +238,41 @@ class LivenessAnalysis(CoBaParserVisitor):
         # if both branches end the control flow then the entire structure ends it
         return False
 
-    def visitThen_branch(self, ctx: CoBaParser.Then_branchContext) -> bool:
-        # visit every instruction and return indicator if the control flow ends
-        for instruction in ctx.instruction():
-            if self.visit(instruction) is False:
-                return False
-        return True
-
-    def visitElse_branch(self, ctx: CoBaParser.Else_branchContext) -> bool:
-        # visit every instruction and return indicator if the control flow continues
-        for instruction in ctx.instruction():
-            if self.visit(instruction) is False:
-                return False
-        return True
-
-    def visitWhile_structure(self, ctx: CoBaParser.While_structureContext) -> bool:
+    def visitWhile(self, node_ir: ir.While) -> bool:
+        # the loop starts with the first node of the header
+        # (the function calls in the header are their own nodes)
+        node_id_h: int = len(self.current_graph.nodes)
         # create a control flow node for the start of a while structure
         node_s: CFNode = CFNode()
         # the boolsch statement in the while header contains every loaded variable
-        for variable in self.visit(ctx.bool_expression()):
+        for variable in (yield node_ir.condition):
             node_s.add_out(variable)
         node_id_s: int = self.current_graph.add_node(node_s)
         self.current_graph.add_edge(self.node_anchor_id, node_id_s)
         # append the new node and make it the anchor for following nodes
         self.node_anchor_id = node_id_s
-        for instruction in ctx.instruction():
-            if self.visit(instruction) is False:
-                break
-        else:
+        if (yield from self.visit_body(node_ir.body)):
             # connect the last while body node to the while header node
-            self.current_graph.add_edge(self.node_anchor_id, node_id_s)
+            self.current_graph.add_edge(self.node_anchor_id, node_id_h)
         # for future nodes the anchor is the while header again
         self.node_anchor_id = node_id_s
         # control flow always continues
         return True
 
-    def visitBool_expression(self, ctx:CoBaParser.Bool_expressionContext) -> list[str]:
-        return self.visit(ctx.expression())
+    def visitUnary(self, node_ir: ir.Unary) -> list[str]:
+        return (yield node_ir.operand)
 
-    def visitExpression(self, ctx: CoBaParser.ExpressionContext) -> list[str]:
+    def visitBinary(self, node_ir: ir.Binary) -> list[str]:
         # collect every variable used inside the expression
-        used_vars: list[str] = []
-        if ctx.LEFT is not None:
-            used_vars += self.visit(ctx.LEFT)
-        if ctx.RIGHT is not None:
-            used_vars += self.visit(ctx.RIGHT)
-        if ctx.function_call() is not None:
-            # function calls are their own nodes
-            self.visit(ctx.function_call())
-        if ctx.atom() is not None:
-            used_vars += self.visit(ctx.atom())
-
+        # the list of the left operand is extended (copying it would be quadratic)
+        used_vars: list[str] = yield node_ir.left
+        used_vars += yield node_ir.right
         return used_vars
 
-    def visitAtom(self, ctx: CoBaParser.AtomContext) -> list[str]:
-        if ctx.expression() is not None:
-            # the atom may be an expression in parantheses
-            return self.visit(ctx.expression())
-        if ctx.IDENTIFIER() is not None:
-            # simply return the found variable when a variable was used
-            return [ctx.IDENTIFIER().getText()]
+    def visitVariable(self, node_ir: ir.Variable) -> list[str]:
+        # simply return the found variable when a variable was used
+        return [node_ir.name]
+
+    def visitConstant(self, node_ir: ir.Constant) -> list[str]:
         # constant atoms are irrelevant
         return []
@@ -0,0 +1,231 @@
+"""
+define the Lowering (parse tree -> IR)
+"""
+
+from antlr4.ParserRuleContext import ParserRuleContext
+
+try:
+    from compiler.src import ir
+    from compiler.src.CoBaParser import CoBaParser
+    from compiler.src.CoBaParserVisitor import CoBaParserVisitor
+    from compiler.src.compile_cache import source_text
+    from compiler.src.tree_walker import IterativeVisitor, release_tree, tree_text
+    from compiler.src.type_checker_helper import ValidTypes, SymbolTable, FunctionSymbol
+except ModuleNotFoundError:
+    from . import ir
+    from .CoBaParser import CoBaParser
+    from .CoBaParserVisitor import CoBaParserVisitor
+    from .compile_cache import source_text
+    from .tree_walker import IterativeVisitor, release_tree, tree_text
+    from .type_checker_helper import ValidTypes, SymbolTable, FunctionSymbol
+
+
+def debug_line(ctx: ParserRuleContext, info: str, ctx_text: bool = True) -> str:
+    """
+    generate a line of additional debug info for the generated output
+    """
+    line = f"; DEBUG: {ctx.start.line}:{ctx.start.column}"
+    line += f"-{ctx.stop.line}:{ctx.stop.column}"
+    if info:
+        line += f"; {info}"
+    if ctx_text:
+        line += f"; txt = {tree_text(ctx)}"
+    return line + '\n'
+
+
+class Lowering(IterativeVisitor, CoBaParserVisitor):
+    """
+    lower a typechecked parse tree into the IR.
+    every expression is annotated with its resolved type and every variable with its slot,
+    so that the back-end phases do not need the parse tree (or the symbol table lookups).
+    every function is released from the parse tree as soon as it is lowered,
+    so the parse tree is consumed by the lowering.
+    children are visited by yielding them (see IterativeVisitor).
+    """
+    def __init__(self, symbol_table: SymbolTable, debug: bool = False) -> None:
+        self.symbol_table: SymbolTable = symbol_table
+        self.debug: bool = debug
+        self.current_function: FunctionSymbol = None
+        self.variable_ids: dict[str, int] = {}
+        # the called functions of the current function (in order of their first call)
+        self.calls: dict[str, FunctionSymbol] = {}
+
+    def set_debug(self, node: ir.Node, ctx: ParserRuleContext, info: str,
+                  ctx_text: bool = True) -> ir.Node:
+        """
+        prepend the debug info of a context to the node (in debug mode).
+        """
+        if self.debug:
+            node.debug = debug_line(ctx, info, ctx_text) + (node.debug or '')
+        return node
+
+    def set_var_ids(self, f_vars: dict[str, str]) -> int:
+        """
+        assign each local variable a distinguishable number/id
+        """
+        self.variable_ids = {}
+        c_id: int = 0
+        for v_name, v_type in f_vars.items():
+            self.variable_ids[v_name] = c_id
+            # float64 needs two variable spaces
+            c_id += 1 + (v_type == ValidTypes.Float64)
+        # return number of variables to generate '.limit locals'
+        return c_id
+
+    def visitMain(self, ctx: CoBaParser.MainContext):
+        functions: list[ir.Function] = []
+        structure: CoBaParser.StructureContext = ctx.structure()
+        for i, child in enumerate(structure.children):
+            if isinstance(child, (CoBaParser.FunctionContext, CoBaParser.Main_functionContext)):
+                functions.append((yield child))
+                # the parse tree of the function is not needed anymore
+                release_tree(child)
+                structure.children[i] = None
+        return ir.Program(functions)
+
+    def visit_function(self, ctx: ParserRuleContext, f_name: str,
+                       body_ctx: CoBaParser.Function_bodyContext):
+        """
+        lower a (main-)function.
+        """
+        self.current_function = self.symbol_table.get_function(f_name)
+        locals_size: int = self.set_var_ids(self.current_function.local_variables)
+        self.calls = {}
+        body: list[ir.Node] = []
+        for declaration in body_ctx.declaration():
+            body.append((yield declaration))
+        for instruction in body_ctx.instruction():
+            body.append((yield instruction))
+        if body_ctx.return_statement() is not None:
+            body.append((yield body_ctx.return_statement()))
+        return ir.Function(self.current_function, body, body_ctx.return_statement() is not None,
+                           locals_size, [*self.calls.values()], source_text(ctx),
+                           ctx.start.line, ctx.start.column)
+
+    def visitMain_function(self, ctx: CoBaParser.Main_functionContext):
+        return (yield from self.visit_function(ctx, ctx.main_function_header().K_MAIN().getText(),
+                                               ctx.function_body()))
+
+    def visitFunction(self, ctx: CoBaParser.FunctionContext):
+        return (yield from self.visit_function(ctx, ctx.function_header().IDENTIFIER().getText(),
+                                               ctx.function_body()))
+
+    def visitReturn_statement(self, ctx: CoBaParser.Return_statementContext):
+        value: ir.Node = None
+        if ctx.expression() is not None:
+            value = yield ctx.expression()
+        return self.set_debug(ir.Return(value), ctx, 'return')
+
+    def visitFunction_call(self, ctx: CoBaParser.Function_callContext):
+        f_table: FunctionSymbol = self.symbol_table.get_function(
+            (ctx.IDENTIFIER() or ctx.K_MAIN()).getText())
+        if ctx.IDENTIFIER() is not None:
+            self.calls.setdefault(f_table.f_name, f_table)
+        arguments: list[ir.Node] = []
+        current_argument = ctx.function_argument()
+        while current_argument is not None:
+            arguments.append((yield current_argument.expression()))
+            current_argument = current_argument.function_argument()
+        return self.set_debug(ir.Call(f_table, arguments), ctx, 'function_call')
+
+    def visitDeclaration(self, ctx: CoBaParser.DeclarationContext):
+        return self.set_debug((yield from self.visit_assignment(ctx, True)), ctx, 'declaration')
+
+    def visitAssignement(self, ctx: CoBaParser.AssignementContext):
+        return self.set_debug((yield from self.visit_assignment(ctx, False)), ctx, 'assignement')
+
+    def visit_assignment(self, ctx: ParserRuleContext, declaration: bool):
+        """
+        lower a declaration or assignement.
+        """
+        value: ir.Node = yield ctx.expression()
+        v_name: str = ctx.IDENTIFIER().getText()
+        return ir.Assignment(v_name, self.current_function.local_variables[v_name],
+                             self.variable_ids[v_name], value, declaration)
+
+    def visitInstruction(self, ctx: CoBaParser.InstructionContext):
+        return (yield ctx.assignement() or ctx.block_structure() or ctx.control_structure() or \
+            ctx.print_() or ctx.function_call() or ctx.return_statement())
+
+    def visitBlock_structure(self, ctx: CoBaParser.Block_structureContext):
+        body: list[ir.Node] = []
+        for instruction in ctx.instruction():
+            body.append((yield instruction))
+        return ir.Block(body)
+
+    def visitControl_structure(self, ctx: CoBaParser.Control_structureContext):
+        return (yield ctx.if_structure() or ctx.while_structure())
+
+    def visitPrint(self, ctx: CoBaParser.PrintContext):
+        value: ir.Node = None
+        if ctx.expression() is not None:
+            value = yield ctx.expression()
+        return self.set_debug(ir.Print(value), ctx, 'println')
+
+    def visitIf_structure(self, ctx: CoBaParser.If_structureContext):
+        condition: ir.Node = yield ctx.bool_expression().expression()
+        then_body: list[ir.Node] = []
+        for instruction in ctx.then_branch().instruction():
+            then_body.append((yield instruction))
+        else_body: list[ir.Node] = None
+        if ctx.else_branch() is not None:
+            else_body = []
+            for instruction in ctx.else_branch().instruction():
+                else_body.append((yield instruction))
+        return ir.If(condition, then_body, else_body)
+
+    def visitWhile_structure(self, ctx: CoBaParser.While_structureContext):
+        condition: ir.Node = yield ctx.bool_expression().expression()
+        body: list[ir.Node] = []
+        for instruction in ctx.instruction():
+            body.append((yield instruction))
+        return ir.While(condition, body)
+
+    def visitExpression(self, ctx: CoBaParser.ExpressionContext):
+        if ctx.UNARY is not None:
+            operand: ir.Node = yield ctx.RIGHT
+            # unary + and - keep the type, ! only works for Booleans
+            e_type: str = ValidTypes.Boolean if ctx.UNARY.text == '!' else operand.type
+            node: ir.Node = ir.Unary(ctx.UNARY.text, operand, e_type)
+        elif ctx.LEFT is not None:
+            left: ir.Node = yield ctx.LEFT
+            right: ir.Node = yield ctx.RIGHT
+            operator: str = ctx.getChild(1).getText()
+            # if one operand is a Float the result will always be a Float aswell
+            e_type: str = left.type
+            if ValidTypes.Float64 in (left.type, right.type) and \
+                ValidTypes.Integer in (left.type, right.type):
+                e_type = ValidTypes.Float64
+            if operator not in ['*', '/', '%', '+', '-']:
+                # comparisons and boolean operations
+                e_type = ValidTypes.Boolean
+            node = ir.Binary(operator, left, right, e_type)
+        elif ctx.function_call() is not None:
+            node = yield ctx.function_call()
+        else:
+            node = yield ctx.atom()
+        return self.set_debug(node, ctx, 'expression')
+
+    def visitAtom(self, ctx: CoBaParser.AtomContext):
+        if ctx.expression() is not None:
+            node: ir.Node = yield ctx.expression()
+        elif ctx.type_element() is not None:
+            node = yield ctx.type_element()
+        else:
+            v_name: str = ctx.IDENTIFIER().getText()
+            node = ir.Variable(v_name, self.current_function.local_variables[v_name],
+                               self.variable_ids[v_name])
+            self.set_debug(node, ctx, 'variable', False)
+        return self.set_debug(node, ctx, 'atom')
+
+    def visitType_element(self, ctx: CoBaParser.Type_elementContext):
+        if ctx.INTEGER_NUMBER() is not None:
+            e_type: str = ValidTypes.Integer
+        elif ctx.FLOAT_NUMBER() is not None:
+            e_type = ValidTypes.Float64
+        elif ctx.STRING() is not None:
+            e_type = ValidTypes.String
+        else:
+            e_type = ValidTypes.Boolean
+        return self.set_debug(ir.Constant(ctx.getChild(0).getText(), e_type), ctx,
+                              'type_element', False)
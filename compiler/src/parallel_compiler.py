@@ -0,0 +1,125 @@
+"""
+define the ParallelCompiler
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import TextIO
+
+try:
+    from compiler.src.CoBaLexer import CoBaLexer
+    from compiler.src.CoBaParser import CoBaParser
+    from compiler.src.code_generator import CodeGenerator
+    from compiler.src.compile_cache import CompileCache, source_text
+    from compiler.src.compile_stats import CompileStats
+    from compiler.src.compiler import Compiler, CompileResult
+    from compiler.src.error_listener import Diagnostic
+    from compiler.src.parser_state import ParserState
+    from compiler.src.type_checker_helper import SymbolTable
+except ModuleNotFoundError:
+    from .CoBaLexer import CoBaLexer
+    from .CoBaParser import CoBaParser
+    from .code_generator import CodeGenerator
+    from .compile_cache import CompileCache, source_text
+    from .compile_stats import CompileStats
+    from .compiler import Compiler, CompileResult
+    from .error_listener import Diagnostic
+    from .parser_state import ParserState
+    from .type_checker_helper import SymbolTable
+
+# the compiler, symbol table, class name and functions of the current worker process
+worker_compiler: Compiler = None
+worker_symbol_table: SymbolTable = None
+worker_class_name: str = None
+worker_functions: dict[str, tuple[str, int, int]] = None
+
+
+def init_worker(debug: bool, cache: CompileCache, lexer: str,
+                disabled_optimizations: frozenset[str], inline_size: int,
+                symbol_table: SymbolTable, class_name: str,
+                functions: dict[str, tuple[str, int, int]]) -> None:
+    """
+    create the compiler (and receive the symbol table) once per worker process.
+    """
+    global worker_compiler, worker_symbol_table, worker_class_name, worker_functions
+    if cache is not None:
+        # reuse the ATN and DFA states of previous runs (read only)
+        ParserState(CoBaLexer, CoBaParser, cache.cache_dir).load()
+    worker_compiler = Compiler(debug, cache, lexer=lexer,
+                               disabled_optimizations=disabled_optimizations,
+                               inline_size=inline_size)
+    worker_symbol_table = symbol_table
+    worker_class_name = class_name
+    worker_functions = functions
+
+
+def compile_function_job(source: str, line: int, column: int,
+                         main: bool) -> tuple[list[Diagnostic], str, dict[str, int]]:
+    """
+    typecheck and generate a single (main-)function inside a worker process.
+    """
+    return worker_compiler.compile_function(source, line, column, main, worker_symbol_table,
+                                            worker_class_name, worker_functions)
+
+
+class ParallelCompiler:
+    """
+    typecheck and generate the functions of a single program using a pool of worker processes.
+    every worker parses the source text of its functions again and generates each method
+    in isolation (the functions, that are inlined into it, are parsed by the worker as well).
+    the methods and the type errors are merged in source order,
+    therefore the result is the same as compiling serially.
+    if an out_file is given, the methods are written to it (in order) as soon as they arrive.
+    """
+    def __init__(self, compiler: Compiler, jobs: int = None) -> None:
+        self.compiler: Compiler = compiler
+        self.jobs: int = jobs or os.cpu_count() or 1
+
+    def compile(self, tree: CoBaParser.MainContext, result: CompileResult,
+                class_name: str, stats: CompileStats, out_file: TextIO = None) -> str:
+        """
+        typecheck and generate a parsed program with a symbol table (without errors).
+        """
+        # (source text, line, column, main) of every function in source order
+        functions: list[tuple[str, int, int, bool]] = []
+        # name -> (source text, line, column) of every function besides main (see Inliner)
+        inlinable: dict[str, tuple[str, int, int]] = {}
+        for ctx in tree.structure().getChildren():
+            if isinstance(ctx, CoBaParser.FunctionContext):
+                position: tuple[str, int, int] = (source_text(ctx), ctx.start.line,
+                                                  ctx.start.column)
+                inlinable[ctx.function_header().IDENTIFIER().getText()] = position
+                functions.append((*position, False))
+            elif isinstance(ctx, CoBaParser.Main_functionContext):
+                functions.append((source_text(ctx), ctx.start.line, ctx.start.column, True))
+        jobs: int = min(self.jobs, len(functions))
+        stats.count('jobs', jobs)
+        code_generator: CodeGenerator = CodeGenerator(result.symbol_table, class_name,
+                                                      self.compiler.debug, out_file=out_file)
+        code_generator.add_method(code_generator.gen_class_header())
+        with stats.phase('parallel_functions'), ProcessPoolExecutor(
+            max_workers=jobs, initializer=init_worker,
+            initargs=(self.compiler.debug, self.compiler.cache, self.compiler.lexer_name,
+                      self.compiler.disabled_optimizations, self.compiler.inline_size,
+                      result.symbol_table, class_name, inlinable)) as executor:
+            # map keeps the order of the functions
+            for diagnostics, method, counters in executor.map(
+                compile_function_job, *zip(*functions),
+                chunksize=max(1, len(functions) // (4 * jobs))):
+                for diagnostic in diagnostics:
+                    if self.compiler.print_diagnostics:
+                        print(diagnostic, file=sys.stderr, flush=True)
+                    else:
+                        result.diagnostics.append(diagnostic)
+                    result.exit_code = 3
+                # the remaining methods are only generated to report all type errors
+                if result.success:
+                    code_generator.add_method(method)
+                for name, amount in counters.items():
+                    stats.count(name, amount)
+        if not result.success:
+            return None
+        stats.count('instructions', code_generator.count_instructions())
+        result.code = code_generator.code
+        return result.code
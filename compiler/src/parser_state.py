@@ -0,0 +1,137 @@
+"""
+define the ParserState
+"""
+
+import hashlib
+import os
+import pickle
+import stat
+import sys
+from pathlib import Path
+from antlr4.PredictionContext import PredictionContext
+from antlr4.RuleContext import RuleContext
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.SemanticContext import SemanticContext
+
+# the ANTLR runtime compares these objects by identity,
+# therefore they are pickled by reference and not by value.
+RUNTIME_SINGLETONS: dict[str, object] = {
+    'ATNSimulator.ERROR': ATNSimulator.ERROR,
+    'LexerATNSimulator.ERROR': LexerATNSimulator.ERROR,
+    'PredictionContext.EMPTY': PredictionContext.EMPTY,
+    'RuleContext.EMPTY': RuleContext.EMPTY,
+    'SemanticContext.NONE': SemanticContext.NONE,
+}
+
+
+def is_private(f_stat: os.stat_result) -> bool:
+    """
+    check if a file/directory belongs to the current user and can not be written by anyone else
+    (unpickling a file, that someone else could have written, executes their code).
+    """
+    if not hasattr(os, 'getuid'): # no POSIX permissions (the user profile is private)
+        return True
+    return f_stat.st_uid == os.getuid() and not f_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+class StatePickler(pickle.Pickler):
+    """
+    pickler that keeps the singletons of the ANTLR runtime.
+    """
+    singleton_ids: dict[int, str] = {id(obj): name for name, obj in RUNTIME_SINGLETONS.items()}
+
+    def persistent_id(self, obj) -> str:
+        return self.singleton_ids.get(id(obj))
+
+
+class StateUnpickler(pickle.Unpickler):
+    """
+    unpickler that restores the singletons of the ANTLR runtime.
+    """
+    def persistent_load(self, pid: str):
+        try:
+            return RUNTIME_SINGLETONS[pid]
+        except KeyError as exception:
+            raise pickle.UnpicklingError(f"unknown persistent id: {pid}") from exception
+
+
+class ParserState:
+    """
+    persist the deserialized ATN and the DFA states of the generated Lexer and
+    Parser across runs. the DFA states are otherwise rebuilt from scratch
+    by every process during the first parse (full ATN simulation).
+    the state is kept in a directory, that only the user can access, and is only
+    loaded if nobody else could have written it.
+    """
+    def __init__(self, lexer_class: type, parser_class: type, state_dir: Path) -> None:
+        self.lexer_class: type = lexer_class
+        self.parser_class: type = parser_class
+        self.state_file: Path = state_dir / 'parser_state' / \
+            f"parser_state_{self.fingerprint()}.pickle"
+        self.dfa_states: int = 0
+
+    def fingerprint(self) -> str:
+        """
+        identify the generated Lexer/Parser and the runtime, the pickled state
+        is only compatible with exactly these.
+        """
+        sha = hashlib.sha256(sys.version.encode('utf-8'))
+        for recognizer in (self.lexer_class, self.parser_class):
+            module_file: Path = Path(sys.modules[recognizer.__module__].__file__)
+            f_stat = module_file.stat()
+            sha.update(f"{module_file.name}:{f_stat.st_size}:{f_stat.st_mtime_ns}".encode('utf-8'))
+        return sha.hexdigest()[:16]
+
+    def count_dfa_states(self) -> int:
+        """
+        count the DFA states of the Lexer and Parser.
+        """
+        return sum(len(dfa._states) for recognizer in (self.lexer_class, self.parser_class)
+                   for dfa in recognizer.decisionsToDFA)
+
+    def load(self) -> bool:
+        """
+        replace the ATN and DFA of the Lexer/Parser with the persisted state.
+        must be called before the Lexer/Parser are instanciated.
+        """
+        try:
+            with open(self.state_file, 'rb') as f:
+                if not is_private(os.stat(self.state_file.parent)) or \
+                    not is_private(os.fstat(f.fileno())):
+                    raise PermissionError(f"unsafe permissions: {self.state_file}")
+                lexer_state, parser_state = StateUnpickler(f).load()
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            self.dfa_states = self.count_dfa_states()
+            return False
+        self.lexer_class.atn, self.lexer_class.decisionsToDFA = lexer_state
+        (self.parser_class.atn, self.parser_class.decisionsToDFA,
+         self.parser_class.sharedContextCache) = parser_state
+        self.dfa_states = self.count_dfa_states()
+        return True
+
+    def save(self) -> bool:
+        """
+        persist the current state, but only if new DFA states were added.
+        """
+        dfa_states: int = self.count_dfa_states()
+        if dfa_states <= self.dfa_states:
+            return False
+        lexer_state = (self.lexer_class.atn, self.lexer_class.decisionsToDFA)
+        parser_state = (self.parser_class.atn, self.parser_class.decisionsToDFA,
+                        self.parser_class.sharedContextCache)
+        tmp_file: Path = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.state_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # (mkdir does not change the mode of an existing directory)
+            os.chmod(self.state_file.parent, 0o700)
+            with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600),
+                           'wb') as f:
+                StatePickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump((lexer_state, parser_state))
+            os.replace(tmp_file, self.state_file)
+        except (OSError, pickle.PicklingError, RecursionError):
+            # the state is optional, the compilation must not fail because of it
+            tmp_file.unlink(missing_ok=True)
+            return False
+        self.dfa_states = dfa_states
+        return True
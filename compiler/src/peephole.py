@@ -0,0 +1,392 @@
+"""
+define the PeepholeOptimizer
+"""
+
+import math
+import re
+from typing import Callable
+
+
+# condition of a branch instruction -> negated condition
+NEGATED_CONDITIONS: dict[str, str] = {'eq': 'ne', 'ne': 'eq', 'lt': 'ge', 'ge': 'lt',
+                                      'gt': 'le', 'le': 'gt'}
+# instruction -> (popped, pushed) stack slots
+# (branches, invocations and returns are handled in stack_effect)
+STACK_EFFECTS: dict[str, tuple[int, int]] = {
+    'iconst_m1': (0, 1), 'iconst_0': (0, 1), 'iconst_1': (0, 1), 'iconst_2': (0, 1),
+    'iconst_3': (0, 1), 'iconst_4': (0, 1), 'iconst_5': (0, 1), 'bipush': (0, 1),
+    'sipush': (0, 1), 'ldc': (0, 1), 'ldc2_w': (0, 2), 'dconst_0': (0, 2), 'dconst_1': (0, 2),
+    'iload': (0, 1), 'aload': (0, 1), 'dload': (0, 2), 'istore': (1, 0), 'astore': (1, 0),
+    'dstore': (2, 0), 'getstatic': (0, 1), 'anewarray': (1, 1), 'goto': (0, 0),
+    'iadd': (2, 1), 'isub': (2, 1), 'imul': (2, 1), 'idiv': (2, 1), 'irem': (2, 1),
+    'iand': (2, 1), 'ior': (2, 1), 'ixor': (2, 1), 'ineg': (1, 1),
+    'dadd': (4, 2), 'dsub': (4, 2), 'dmul': (4, 2), 'ddiv': (4, 2), 'drem': (4, 2),
+    'dneg': (2, 2), 'dcmpg': (4, 1), 'dcmpl': (4, 1), 'i2d': (1, 2), 'd2i': (2, 1),
+    'pop': (1, 0), 'pop2': (2, 0), 'dup': (1, 2), 'dup2': (2, 4), 'swap': (2, 2),
+    'dup_x1': (2, 3), 'dup2_x1': (3, 5), 'dup2_x2': (4, 6),
+    'ireturn': (1, 0), 'areturn': (1, 0), 'dreturn': (2, 0), 'return': (0, 0),
+}
+STACK_EFFECTS.update({f"if{condition}": (1, 0) for condition in NEGATED_CONDITIONS})
+STACK_EFFECTS.update({f"if_{kind}cmp{condition}": (2, 0) for kind in 'ia'
+                      for condition in NEGATED_CONDITIONS})
+# the instructions jumping to a label
+JUMP_INSTRUCTIONS: set[str] = {'goto', *(opcode for opcode in STACK_EFFECTS
+                                          if opcode.startswith('if'))}
+# the label of every jump in a method
+JUMP_TARGET_PATTERN: re.Pattern = re.compile(r'^\t(?:goto|if\w*) (\S+)$', re.MULTILINE)
+# type of a field/method descriptor -> stack slots
+DESCRIPTOR_WIDTHS: dict[str, int] = {'V': 0, 'D': 2, 'J': 2}
+# type prefix of a load/store instruction -> dup instruction of the same width
+DUP_INSTRUCTIONS: dict[str, str] = {'i': 'dup', 'a': 'dup', 'd': 'dup2'}
+
+
+def code_lines(code: list[str]) -> list[str]:
+    """
+    split the code (whole lines, each ending with a newline) into single lines (without newlines).
+    """
+    return ''.join(code).split('\n')[:-1]
+
+
+def split_line(line: str) -> tuple[str, str]:
+    """
+    split an instruction line into its opcode and its argument ('' if there is none).
+    """
+    opcode, _, argument = line.strip().partition(' ')
+    return opcode, argument
+
+
+def is_instruction(line: str) -> bool:
+    """
+    check if a line is an instruction (not a label, directive, comment or empty line).
+    """
+    return line.startswith('\t') and not line.startswith('\t.')
+
+
+def label_name(line: str) -> str:
+    """
+    get the name of a label line (None if the line is not a label).
+    """
+    if line.endswith(':') and line[0] not in '\t;':
+        return line[:-1]
+    return None
+
+
+def is_code(line: str) -> bool:
+    """
+    check if a line is an instruction or a label (not a directive, comment or empty line).
+    """
+    return is_instruction(line) or label_name(line) is not None
+
+
+def is_branch(opcode: str) -> bool:
+    """
+    check if an opcode is a conditional branch (ifeq, if_icmplt, if_acmpne, ...).
+    """
+    return opcode.startswith('if') and opcode[-2:] in NEGATED_CONDITIONS
+
+
+def is_unconditional(opcode: str) -> bool:
+    """
+    check if an opcode never continues with the next line (goto, ireturn, return, ...).
+    """
+    return opcode == 'goto' or opcode.endswith('return')
+
+
+def ends_unreachable(lines: list[str]) -> bool:
+    """
+    check if the last instruction/label of the lines is a goto or return,
+    so that the following instructions are unreachable (up to the next label).
+    """
+    for line in reversed(lines):
+        if is_instruction(line):
+            return is_unconditional(line[1:].partition(' ')[0])
+        if label_name(line) is not None:
+            return False
+    return False
+
+
+def negate_branch(opcode: str) -> str:
+    """
+    get the conditional branch with the negated condition.
+    """
+    return opcode[:-2] + NEGATED_CONDITIONS[opcode[-2:]]
+
+
+def jump_targets(lines: list[str]) -> list[str]:
+    """
+    get the labels the (conditional) jumps of the lines refer to.
+    """
+    return [argument for opcode, _, argument in (line[1:].partition(' ') for line in lines)
+            if opcode in JUMP_INSTRUCTIONS]
+
+
+def descriptor_width(descriptor: str) -> tuple[int, int]:
+    """
+    get the stack slots of the arguments and of the return value of a method descriptor.
+    """
+    arguments, _, return_type = descriptor[descriptor.index('(') + 1:].partition(')')
+    width: int = 0
+    i: int = 0
+    while i < len(arguments):
+        while arguments[i] == '[':
+            i += 1
+        if arguments[i] == 'L':
+            i = arguments.index(';', i)
+        width += DESCRIPTOR_WIDTHS.get(arguments[i], 1)
+        i += 1
+    return width, DESCRIPTOR_WIDTHS.get(return_type[0], 1)
+
+
+def stack_effect(opcode: str, argument: str) -> tuple[int, int]:
+    """
+    get the popped and pushed stack slots of an instruction.
+    """
+    if opcode.startswith('invoke'):
+        argument_width, return_width = descriptor_width(argument)
+        # the instance methods pop their object aswell
+        return argument_width + (opcode != 'invokestatic'), return_width
+    return STACK_EFFECTS[opcode]
+
+
+def max_stack_size(code: list[str]) -> int:
+    """
+    compute the '.limit stack' of the (generated) code of a method.
+    the instructions are followed from the start of the method (a jump continues at its label
+    with the stack height of the jump), so unreachable code is never counted.
+    """
+    lines: list[str] = [line for line in code_lines(code) if is_code(line)]
+    labels: dict[str, int] = {label_name(line): i for i, line in enumerate(lines)
+                              if not is_instruction(line)}
+    visited: set[int] = set()
+    max_size: int = 0
+    # (index of the next line, stack height in front of it)
+    pending: list[tuple[int, int]] = [(0, 0)]
+    while pending:
+        i, stack_size = pending.pop()
+        while i < len(lines) and i not in visited:
+            visited.add(i)
+            line: str = lines[i]
+            i += 1
+            if not is_instruction(line):
+                continue
+            opcode, _, argument = line[1:].partition(' ')
+            popped, pushed = STACK_EFFECTS.get(opcode) or stack_effect(opcode, argument)
+            stack_size -= popped
+            if opcode in JUMP_INSTRUCTIONS:
+                pending.append((labels[argument], stack_size))
+            stack_size += pushed
+            max_size = max(max_size, stack_size)
+            if is_unconditional(opcode):
+                break
+    return max_size
+
+
+# --- Rules ---
+# every rule gets the last instructions/labels (without comments and empty lines) and the
+# number of references of every label. it returns the replacing lines (None if it does not match).
+
+def rule_constants(window: list[str], references: dict[str, int]) -> list[str]:
+    # ldc 3 -> iconst_3, ldc 100 -> bipush 100, ldc2_w 1.0 -> dconst_1
+    opcode, argument = split_line(window[0])
+    if opcode == 'ldc':
+        try:
+            value: int = int(argument)
+        except ValueError: # String constant
+            return None
+        if -1 <= value <= 5:
+            return [f"\ticonst_{value}".replace('-', 'm')]
+        if -128 <= value <= 127:
+            return [f"\tbipush {value}"]
+        if -32768 <= value <= 32767:
+            return [f"\tsipush {value}"]
+    elif opcode == 'ldc2_w':
+        try:
+            value: float = float(argument)
+        except ValueError:
+            return None
+        # -0.0 is a different constant
+        if value == 0.0 and math.copysign(1.0, value) > 0:
+            return ['\tdconst_0']
+        if value == 1.0:
+            return ['\tdconst_1']
+    return None
+
+
+def rule_store_load(window: list[str], references: dict[str, int]) -> list[str]:
+    # istore 1, iload 1 -> dup, istore 1
+    store, store_slot = split_line(window[0])
+    load, load_slot = split_line(window[1])
+    if store[1:] == 'store' and load == store[0] + 'load' and store_slot == load_slot:
+        return [f"\t{DUP_INSTRUCTIONS[store[0]]}", window[0]]
+    return None
+
+
+def rule_negation(window: list[str], references: dict[str, int]) -> list[str]:
+    # iconst_1, ixor, ifne L -> ifeq L
+    opcode, argument = split_line(window[2])
+    if window[0] == '\ticonst_1' and window[1] == '\tixor' and opcode in ['ifne', 'ifeq']:
+        return [f"\t{negate_branch(opcode)} {argument}"]
+    return None
+
+
+def rule_constant_branch(window: list[str], references: dict[str, int]) -> list[str]:
+    # iconst_1, ifne L -> goto L, iconst_1, ifeq L -> (nothing)
+    branch, target = split_line(window[1])
+    if window[0] not in ['\ticonst_0', '\ticonst_1'] or branch not in ['ifne', 'ifeq']:
+        return None
+    if (window[0] == '\ticonst_1') == (branch == 'ifne'):
+        return [f"\tgoto {target}"]
+    return []
+
+
+def rule_boolean_branch(window: list[str], references: dict[str, int]) -> list[str]:
+    # if_icmplt A, iconst_0, goto B, A:, iconst_1, B:, ifne L -> if_icmplt L
+    # (the boolean is only computed to be tested right away)
+    branch, label_true = split_line(window[0])
+    goto, label_end = split_line(window[2])
+    consumer, target = split_line(window[6])
+    if not (is_branch(branch) and window[1] == '\ticonst_0' and goto == 'goto' and \
+        window[3] == f"{label_true}:" and window[4] == '\ticonst_1' and \
+        window[5] == f"{label_end}:" and consumer in ['ifne', 'ifeq']):
+        return None
+    # both labels must not be jumped to from anywhere else
+    if references[label_true] != 1 or references[label_end] != 1:
+        return None
+    if consumer == 'ifeq':
+        branch = negate_branch(branch)
+    return [f"\t{branch} {target}"]
+
+
+def rule_branch_over_goto(window: list[str], references: dict[str, int]) -> list[str]:
+    # ifne A, goto B, A: -> ifeq B, A:
+    branch, label = split_line(window[0])
+    goto, target = split_line(window[1])
+    if is_branch(branch) and goto == 'goto' and window[2] == f"{label}:":
+        return [f"\t{negate_branch(branch)} {target}", window[2]]
+    return None
+
+
+def rule_goto_next(window: list[str], references: dict[str, int]) -> list[str]:
+    # goto A, A: -> A:
+    goto, label = split_line(window[0])
+    if goto == 'goto' and window[1] == f"{label}:":
+        return [window[1]]
+    return None
+
+
+def rule_unused_label(window: list[str], references: dict[str, int]) -> list[str]:
+    # A: -> (nothing) if nothing jumps to A
+    name: str = label_name(window[0])
+    if name is not None and references.get(name, 0) == 0:
+        return []
+    return None
+
+
+# name -> (number of instructions/labels, opcodes of the last instruction (':' for labels), rule)
+RULES: dict[str, tuple[int, tuple[str, ...], Callable[[list[str], dict[str, int]], list[str]]]] = {
+    'constants': (1, ('ldc', 'ldc2_w'), rule_constants),
+    'store_load': (2, ('iload', 'dload', 'aload'), rule_store_load),
+    'negation': (3, ('ifne', 'ifeq'), rule_negation),
+    'constant_branch': (2, ('ifne', 'ifeq'), rule_constant_branch),
+    'boolean_branch': (7, ('ifne', 'ifeq'), rule_boolean_branch),
+    'branch_over_goto': (3, (':',), rule_branch_over_goto),
+    'goto_next': (2, (':',), rule_goto_next),
+    'unused_label': (1, (':',), rule_unused_label),
+}
+# opcode of the last instruction (':' for labels) -> rules, that may match
+TRIGGERED_RULES: dict[str, list[tuple[str, int, Callable]]] = {}
+for rule_name, (rule_length, triggers, rule_function) in RULES.items():
+    for trigger in triggers:
+        TRIGGERED_RULES.setdefault(trigger, []).append((rule_name, rule_length, rule_function))
+# opcode of the last instruction (':' for labels) -> the longest window of its rules
+TRIGGER_LENGTHS: dict[str, int] = {trigger: max(length for _, length, _ in rules)
+                                   for trigger, rules in TRIGGERED_RULES.items()}
+# the beginnings of all instruction lines, that trigger a rule
+TRIGGER_PREFIXES: tuple[str, ...] = tuple(f"\t{trigger} " for trigger in TRIGGERED_RULES
+                                          if trigger != ':')
+
+
+class PeepholeOptimizer:
+    """
+    optimize the generated code of a method by replacing instruction patterns (see RULES).
+    the lines are processed in a single pass, every line (that triggers a rule) is matched
+    against the last instructions/labels. replaced lines are processed again, so that the rules
+    can be applied to the result of other rules (e.g. negation -> boolean_branch).
+    comments and empty lines in between are kept (in front of the replacement).
+    the instructions after a goto or return are removed up to the next label, that is
+    jumped to (unreachable code).
+    the number of applications of every rule (and of removed unreachable instructions)
+    is counted in hits.
+    """
+    def __init__(self) -> None:
+        self.hits: dict[str, int] = {name: 0 for name in [*RULES, 'unreachable']}
+
+    def optimize(self, code: list[str]) -> list[str]:
+        """
+        optimize the code (whole lines) of a method body.
+        """
+        text: str = ''.join(code)
+        references: dict[str, int] = {}
+        for target in JUMP_TARGET_PATTERN.findall(text):
+            references[target] = references.get(target, 0) + 1
+        output: list[str] = []
+        # the last instruction was a goto or return
+        unreachable: bool = False
+        for line in text.split('\n')[:-1]:
+            if unreachable and is_instruction(line):
+                self.hits['unreachable'] += 1
+                for target in jump_targets([line]):
+                    references[target] -= 1
+                continue
+            # most lines do not trigger any rule
+            if line.startswith(TRIGGER_PREFIXES) or line.endswith(':'):
+                self.add_line(line, output, references)
+                # (a label, that is not jumped to, is removed)
+                unreachable = ends_unreachable(output)
+            else:
+                output.append(line)
+                if is_instruction(line):
+                    unreachable = is_unconditional(line[1:].partition(' ')[0])
+        return [line + '\n' for line in output]
+
+    def add_line(self, line: str, output: list[str], references: dict[str, int]) -> None:
+        """
+        add a line to the output and apply the rules it triggers (also to the replacements).
+        """
+        pending: list[str] = [line]
+        while pending:
+            line = pending.pop()
+            output.append(line)
+            if is_instruction(line):
+                trigger: str = line[1:].partition(' ')[0]
+            elif label_name(line) is not None:
+                trigger = ':'
+            else:
+                continue
+            if trigger not in TRIGGERED_RULES:
+                continue
+            # the positions of the last instructions/labels (the last one first)
+            positions: list[int] = [len(output)-1]
+            i: int = positions[0]
+            while len(positions) < TRIGGER_LENGTHS[trigger] and i > 0:
+                i -= 1
+                if is_code(output[i]):
+                    positions.append(i)
+            for name, length, rule in TRIGGERED_RULES[trigger]:
+                if len(positions) < length:
+                    continue
+                start: int = positions[length-1]
+                window: list[str] = [output[i] for i in reversed(positions[:length])]
+                replacement: list[str] = rule(window, references)
+                if replacement is None:
+                    continue
+                self.hits[name] += 1
+                for target in jump_targets(window):
+                    references[target] -= 1
+                for target in jump_targets(replacement):
+                    references[target] = references.get(target, 0) + 1
+                others: list[str] = [line for line in output[start:] if not is_code(line)]
+                del output[start:]
+                output.extend(others)
+                pending.extend(reversed(replacement))
+                break
@@ -0,0 +1,132 @@
+"""
+define the RegexLexer
+"""
+
+import re
+
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.InputStream import InputStream
+from antlr4.Lexer import Lexer
+from antlr4.Token import CommonToken, Token
+
+try:
+    from compiler.src.CoBaLexer import CoBaLexer
+except ModuleNotFoundError:
+    from .CoBaLexer import CoBaLexer
+
+
+# the alternatives are ordered, so that the first match is always the longest match
+# of the generated CoBaLexer (see CoBaLexer.g4).
+# the end of a (nested, non-greedy) block comment is determined by the ATN of the CoBaLexer.
+TOKEN_PATTERN: re.Pattern = re.compile(r'''
+     (?P<NEWLINE>\r?\n)
+    |(?P<WHITESPACE>[ \t\f]+)
+    |(?P<BLOCK_COMMENT>\#=)
+    |(?P<LINE_COMMENT>\#(?:[^=][^\r\n]*)?)
+    |(?P<STRING>"[^"\r\n]*")
+    |(?P<FLOAT_NUMBER>(?:[1-9][0-9]*|0+)\.(?:[1-9][0-9]*|0+))
+    |(?P<INTEGER_NUMBER>[1-9][0-9]*|0+)
+    |(?P<IDENTIFIER>[a-zA-Z_$][a-zA-Z_$0-9]*)
+    |(?P<LITERAL>::|==|<=|>=|!=|&&|\|\||[(),=+\-*/%<>!])
+    |(?P<ERROR_TOKEN>.)
+''', re.VERBOSE | re.DOTALL)
+
+# keywords and operators -> token type
+LITERAL_TYPES: dict[str, int] = {literal[1:-1]: token_type for token_type, literal in
+                                 enumerate(CoBaLexer.literalNames) if literal != '<INVALID>'}
+TOKEN_TYPES: dict[str, int] = {name: getattr(CoBaLexer, name) for name in
+                               ['NEWLINE', 'STRING', 'FLOAT_NUMBER', 'INTEGER_NUMBER',
+                                'IDENTIFIER', 'ERROR_TOKEN']}
+# the skipped tokens (CoBaLexer: -> skip)
+SKIPPED: set[str] = {'WHITESPACE', 'BLOCK_COMMENT', 'LINE_COMMENT'}
+
+
+class RegexLexer:
+    """
+    lexer using a single compiled regular expression over the entire source text.
+    produces the same tokens (types, positions and text) as the generated CoBaLexer,
+    and can be used as the token source of the CoBaParser.
+    every character is matched by a rule (ERROR_TOKEN), so there are no lexer errors.
+    """
+    def __init__(self, source: str = '') -> None:
+        self._factory: CommonTokenFactory = CommonTokenFactory.DEFAULT
+        # the lexer is also the (char) input stream of its tokens (see Token.getInputStream)
+        self._token_source: tuple = (self, self)
+        self.reset(source)
+
+    def reset(self, source: str) -> None:
+        """
+        start lexing a new source text.
+        """
+        self.source: str = source
+        self.size: int = len(source)
+        self.position: int = 0
+        self.line: int = 1
+        self.column: int = 0
+        # the CoBaLexer is only created for the first block comment
+        self.block_lexer: CoBaLexer = None
+
+    def block_comment_end(self, position: int) -> int:
+        """
+        get the end of the comment starting with '#=' at the given position.
+        """
+        if self.block_lexer is None:
+            self.block_lexer = CoBaLexer(InputStream(self.source))
+        stream: InputStream = self.block_lexer.inputStream
+        stream.seek(position)
+        self.block_lexer._interp.match(stream, Lexer.DEFAULT_MODE)
+        return stream.index
+
+    def getText(self, start: int, stop: int) -> str:
+        """
+        get the source text between two char indices (inclusive).
+        """
+        return self.source[start:stop+1]
+
+    def getSourceName(self) -> str:
+        return '<unknown>'
+
+    def removeErrorListeners(self) -> None:
+        pass
+
+    def addErrorListener(self, listener) -> None:
+        pass
+
+    def nextToken(self) -> Token:
+        """
+        return the next (not skipped) token, or the EOF token at the end of the source.
+        """
+        source: str = self.source
+        position: int = self.position
+        match_ = TOKEN_PATTERN.match
+        while position < self.size:
+            match: re.Match = match_(source, position)
+            kind: str = match.lastgroup
+            end: int = match.end() if kind != 'BLOCK_COMMENT' else \
+                self.block_comment_end(position)
+            if kind not in SKIPPED:
+                token: CommonToken = CommonToken(self._token_source,
+                                                 LITERAL_TYPES.get(match.group(), TOKEN_TYPES.get(kind)) \
+                                                     if kind in ('LITERAL', 'IDENTIFIER') else \
+                                                         TOKEN_TYPES[kind],
+                                                 Token.DEFAULT_CHANNEL, position, end-1)
+                token.text = match.group()
+            else:
+                token = None
+            # update the position of the next token (only newlines and comments span lines)
+            if kind == 'NEWLINE':
+                self.line += 1
+                self.column = 0
+            elif kind in SKIPPED and source.count('\n', position, end):
+                self.line += source.count('\n', position, end)
+                self.column = end - source.rindex('\n', position, end) - 1
+            else:
+                self.column += end - position
+            position = end
+            if token is not None:
+                self.position = position
+                return token
+        self.position = position
+        eof: CommonToken = CommonToken(self._token_source, Token.EOF, Token.DEFAULT_CHANNEL,
+                                       position, position-1)
+        return eof
@@ -0,0 +1,119 @@
+"""
+define the SemanticAnalysis
+"""
+
+try:
+    from compiler.src.CoBaParser import CoBaParser
+    from compiler.src.CoBaParserListener import CoBaParserListener
+    from compiler.src.error_listener import Diagnostic
+    from compiler.src.symbol_table_gen_listener import SymbolTableGenListener
+    from compiler.src.type_checker import TypeChecker
+    from compiler.src.type_checker_helper import SymbolTable
+except ModuleNotFoundError:
+    from .CoBaParser import CoBaParser
+    from .CoBaParserListener import CoBaParserListener
+    from .error_listener import Diagnostic
+    from .symbol_table_gen_listener import SymbolTableGenListener
+    from .type_checker import TypeChecker
+    from .type_checker_helper import SymbolTable
+
+
+def scan_signatures(tree: CoBaParser.MainContext) -> SymbolTable:
+    """
+    collect the signatures (return and parameter types) of all functions,
+    by only visiting the function headers.
+    """
+    signatures: SymbolTable = SymbolTable()
+    # the errors are reported by the SemanticAnalysis itself
+    scanner: SymbolTableGenListener = SymbolTableGenListener(signatures, [])
+    for function in tree.structure().getChildren():
+        if isinstance(function, CoBaParser.FunctionContext):
+            scanner.exitFunction_header(function.function_header())
+        elif isinstance(function, CoBaParser.Main_functionContext):
+            scanner.exitMain_function_header(function.main_function_header())
+    signatures.finalise()
+    return signatures
+
+
+class SemanticAnalysis(CoBaParserListener):
+    """
+    Listener for:
+    - Creating the Symbol Table (like the SymbolTableGenListener)
+    - Type Checking (like the TypeChecker)
+    in a single walk of the parse tree.
+    the signatures of all functions are scanned beforehand, so that calls of
+    functions defined later on can be checked.
+    type errors are only reported if the symbol table has no errors.
+    """
+    def __init__(self, symbol_table: SymbolTable, tree: CoBaParser.MainContext) -> None:
+        self.symbol_table_errors: list[Diagnostic] = []
+        self.type_errors: list[Diagnostic] = []
+        self.symbol_table_gen: SymbolTableGenListener = SymbolTableGenListener(
+            symbol_table, self.symbol_table_errors)
+        self.type_checker: TypeChecker = TypeChecker(symbol_table, self.type_errors,
+                                                     scan_signatures(tree))
+
+    @property
+    def diagnostics(self) -> list[Diagnostic]:
+        """
+        get the reported errors (in the order of the separate passes).
+        """
+        return self.symbol_table_errors or self.type_errors
+
+    @property
+    def exit_code(self) -> int:
+        """
+        get the exit code (0: success, 2: symbol table-, 3: type error).
+        """
+        if self.symbol_table_gen.has_errors:
+            return 2
+        return 3 if self.type_checker.has_errors else 0
+
+    def exitMain_function_header(self, ctx: CoBaParser.Main_function_headerContext) -> None:
+        self.symbol_table_gen.exitMain_function_header(ctx)
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitMain_function_header(ctx)
+
+    def exitFunction_header(self, ctx: CoBaParser.Function_headerContext) -> None:
+        self.symbol_table_gen.exitFunction_header(ctx)
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitFunction_header(ctx)
+
+    def exitFunction_body(self, ctx: CoBaParser.Function_bodyContext) -> None:
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitFunction_body(ctx)
+
+    def exitReturn_statement(self, ctx: CoBaParser.Return_statementContext) -> None:
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitReturn_statement(ctx)
+
+    def exitFunction_call(self, ctx: CoBaParser.Function_callContext) -> None:
+        self.symbol_table_gen.exitFunction_call(ctx)
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitFunction_call(ctx)
+
+    def exitDeclaration(self, ctx: CoBaParser.DeclarationContext) -> None:
+        self.symbol_table_gen.exitDeclaration(ctx)
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitDeclaration(ctx)
+
+    def exitAssignement(self, ctx: CoBaParser.AssignementContext) -> None:
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitAssignement(ctx)
+
+    def exitBool_expression(self, ctx: CoBaParser.Bool_expressionContext) -> None:
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitBool_expression(ctx)
+
+    def exitExpression(self, ctx: CoBaParser.ExpressionContext) -> None:
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitExpression(ctx)
+
+    def exitAtom(self, ctx: CoBaParser.AtomContext) -> None:
+        self.symbol_table_gen.exitAtom(ctx)
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitAtom(ctx)
+
+    def exitType_element(self, ctx: CoBaParser.Type_elementContext) -> None:
+        if not self.symbol_table_gen.has_errors:
+            self.type_checker.exitType_element(ctx)
@@ -0,0 +1,154 @@
+"""
+define the SlotAllocation
+"""
+
+try:
+    from compiler.src import ir
+    from compiler.src.graphs import CFGraph
+    from compiler.src.liveness_analysis import LivenessAnalysis
+    from compiler.src.type_checker_helper import ValidTypes, SymbolTable
+except ModuleNotFoundError:
+    from . import ir
+    from .graphs import CFGraph
+    from .liveness_analysis import LivenessAnalysis
+    from .type_checker_helper import ValidTypes, SymbolTable
+
+
+def variable_width(v_type: str) -> int:
+    """
+    get the number of slots of a variable (a Float64 needs two adjacent slots).
+    """
+    return 1 + (v_type == ValidTypes.Float64)
+
+
+def interference_graph(cf_graph: CFGraph) -> dict[str, set[str]]:
+    """
+    get the variables, that are live at the same time as each variable.
+    a stored variable also interferes with everything, that is live after the store
+    (even if the stored value is never used, it must not overwrite a live variable).
+    """
+    interference_sets: list[set[str]] = cf_graph.gen_interference_sets()
+    live_sets: set[frozenset[str]] = set(map(frozenset, interference_sets))
+    for node_id, node in enumerate(cf_graph.nodes):
+        if node.ins:
+            live_out: set[str] = set()
+            for successor in cf_graph.adj[node_id]:
+                live_out.update(cf_graph.interferences.get(successor, ()))
+            live_sets.add(frozenset(live_out | node.ins))
+    adj: dict[str, set[str]] = {}
+    for live_set in live_sets:
+        for variable in live_set:
+            adj.setdefault(variable, set()).update(live_set)
+    for variable, neighbors in adj.items():
+        neighbors.discard(variable)
+    return adj
+
+
+def rewrite_slots(function: ir.Function, slots: dict[str, int]) -> None:
+    """
+    set the slot of every variable load and store of a function.
+    an explicit stack is used, so that deeply nested functions do not raise a RecursionError.
+    """
+    nodes: list[ir.Node] = list(function.body)
+    while nodes:
+        node: ir.Node = nodes.pop()
+        # (ordered by frequency)
+        node_type: type = type(node)
+        if node_type is ir.Binary:
+            nodes.append(node.left)
+            nodes.append(node.right)
+        elif node_type is ir.Variable:
+            node.slot = slots[node.name]
+        elif node_type is ir.Assignment:
+            node.slot = slots[node.name]
+            nodes.append(node.value)
+        elif node_type in (ir.Print, ir.Return):
+            if node.value is not None:
+                nodes.append(node.value)
+        elif node_type in (ir.Block, ir.While):
+            nodes.extend(node.body)
+            if node_type is ir.While:
+                nodes.append(node.condition)
+        elif node_type is ir.If:
+            nodes.append(node.condition)
+            nodes.extend(node.then_body)
+            nodes.extend(node.else_body or [])
+        elif node_type is ir.Unary:
+            nodes.append(node.operand)
+        elif node_type is ir.Call:
+            nodes.extend(node.arguments)
+        elif node_type in (ir.Inline, ir.TailCall):
+            for parameter in node.parameters:
+                parameter.slot = slots[parameter.name]
+            nodes.extend(node.arguments)
+            if node_type is ir.Inline:
+                nodes.extend(node.body)
+                if node.value is not None:
+                    nodes.append(node.value)
+
+
+class SlotAllocation:
+    """
+    assign the local variables of a (main-)function to JVM slots using the liveness analysis,
+    variables that are never live at the same time share their slots.
+    the parameters keep their slots (and the String[] of main keeps slot 0),
+    every other variable (including the variables of the inlined calls)
+    gets the lowest free slot(s) not used by an interfering variable.
+    the number of saved slots ('.limit locals') is counted per method and in total.
+    """
+    def __init__(self, symbol_table: SymbolTable) -> None:
+        self.symbol_table: SymbolTable = symbol_table
+        # method -> (locals without, locals with the allocation)
+        self.locals_sizes: dict[str, tuple[int, int]] = {}
+        self.counters: dict[str, int] = {'locals_saved': 0}
+
+    def allocate(self, function: ir.Function, cf_graph: CFGraph = None) -> int:
+        """
+        allocate the slots of a function (in place) and return its new '.limit locals'.
+        the control flow graph of the function is only built, if it is not given.
+        """
+        if cf_graph is None:
+            liveness_analysis: LivenessAnalysis = LivenessAnalysis(self.symbol_table)
+            liveness_analysis.visit(function)
+            cf_graph = liveness_analysis.control_flow_graphs[function.name]
+        adj: dict[str, set[str]] = interference_graph(cf_graph)
+
+        # variable -> (first slot, width) of the already allocated variables
+        allocated: dict[str, tuple[int, int]] = {}
+        reserved: list[tuple[int, int]] = []
+        slot: int = 0
+        for v_name, v_type in function.symbol.local_variables.items():
+            if v_name is None:
+                # the String[] of main is never overwritten
+                reserved.append((slot, 1))
+            elif v_name in function.symbol.parameters:
+                allocated[v_name] = (slot, variable_width(v_type))
+            else:
+                continue
+            slot += variable_width(v_type)
+        for v_name, v_type in [*function.symbol.local_variables.items(),
+                               *function.inlined_variables.items()]:
+            if v_name is None or v_name in allocated:
+                continue
+            if v_name not in adj and v_name in function.inlined_variables:
+                # the store was removed (see ConstantFolding)
+                continue
+            width: int = variable_width(v_type)
+            used: list[tuple[int, int]] = reserved + [allocated[neighbor]
+                                                      for neighbor in adj.get(v_name, ())
+                                                      if neighbor in allocated]
+            slot = 0
+            # the lowest slot(s) not overlapping any used slot
+            for used_slot, used_width in sorted(used):
+                if slot + width <= used_slot:
+                    break
+                slot = max(slot, used_slot + used_width)
+            allocated[v_name] = (slot, width)
+
+        rewrite_slots(function, {v_name: slot for v_name, (slot, _) in allocated.items()})
+        locals_size: int = max((slot + width for slot, width in [*allocated.values(), *reserved]),
+                               default=0)
+        self.locals_sizes[function.name] = (function.locals_size, locals_size)
+        self.counters['locals_saved'] += function.locals_size - locals_size
+        function.locals_size = locals_size
+        return locals_size
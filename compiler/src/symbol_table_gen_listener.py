@@ -8,11 +8,13 @@ from antlr4.ParserRuleContext import ParserRuleContext
 try:
     from compiler.src.CoBaParser import CoBaParser
     from compiler.src.CoBaParserListener import CoBaParserListener
-    from compiler.src.type_checker_helper import SymbolTable
+    from compiler.src.error_listener import Diagnostic
+    from compiler.src.type_checker_helper import SymbolTable, FunctionSymbol
 except ModuleNotFoundError:
     from .CoBaParser import CoBaParser
     from .CoBaParserListener import CoBaParserListener
-    from .type_checker_helper import SymbolTable
+    from .error_listener import Diagnostic
+    from .type_checker_helper import SymbolTable, FunctionSymbol
 
 
 class SymbolTableGenListener(CoBaParserListener):
@@ -21,19 +23,26 @@ class SymbolTableGenListener(CoBaParserListener):
     - Creating a Symbol Table of
     - - Functions
     - - Local Variables (including Parameters)
+    - - Function Calls and the size of every Function
     """
-    def __init__(self, symbol_table: SymbolTable) -> None:
+    def __init__(self, symbol_table: SymbolTable, diagnostics: list[Diagnostic] = None) -> None:
         self.symbol_table: SymbolTable = symbol_table
+        # errors are collected instead of printed, if a list is given
+        self.diagnostics: list[Diagnostic] = diagnostics
         self.current_function: str = None
         self.has_errors: bool = False
 
     def err_print(self, ctx: ParserRuleContext, *args, **kwargs) -> None:
         """
-        print to stderr.
+        print to stderr (or collect the error).
         """
+        self.has_errors = True
+        if self.diagnostics is not None:
+            self.diagnostics.append(Diagnostic(ctx.start.line, ctx.start.column,
+                                               ' '.join(map(str, args))))
+            return
         print(f"line {ctx.start.line}:{ctx.start.column} ", end='', file=sys.stderr, **kwargs)
         print(*args, file=sys.stderr, flush=True, **kwargs)
-        self.has_errors = True
 
     def exitMain_function_header(self, ctx: CoBaParser.Main_function_headerContext) -> None:
         f_name: str = ctx.K_MAIN().getText()
@@ -76,7 +85,15 @@ class SymbolTableGenListener(CoBaParserListener):
             self.err_print(ctx, 'duplicate variable name: ' + \
                 f"'{v_name}' in scope '{self.current_function}'")
 
+    def exitFunction_call(self, ctx: CoBaParser.Function_callContext) -> None:
+        f_name: str = (ctx.IDENTIFIER() or ctx.K_MAIN()).getText()
+        f_symbol: FunctionSymbol = self.symbol_table.get_function(self.current_function)
+        f_symbol.calls[f_name] = f_symbol.calls.get(f_name, 0) + 1
+        f_symbol.size += 1
+
     def exitAtom(self, ctx: CoBaParser.AtomContext) -> None:
+        if ctx.expression() is None:
+            self.symbol_table.get_function(self.current_function).size += 1
         if ctx.IDENTIFIER() is not None:
             # only variables are important atoms here
             # throw an error if the variable is not yet known
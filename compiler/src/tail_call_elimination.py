@@ -0,0 +1,82 @@
+"""
+define the TailCallElimination
+"""
+
+try:
+    from compiler.src import ir
+    from compiler.src.dead_code_elimination import statement_bodies
+    from compiler.src.slot_allocation import variable_width
+except ModuleNotFoundError:
+    from . import ir
+    from .dead_code_elimination import statement_bodies
+    from .slot_allocation import variable_width
+
+
+class TailCallElimination:
+    """
+    replace the calls of a (main-)function to itself in tail position by an ir.TailCall
+    (in place), so that the recursion does not need a JVM frame per call:
+    every 'return f(...)' of the function f and, if f is a Void function, a call of f
+    that is the last executed statement.
+    the arguments are evaluated (onto the stack) before the parameters are stored,
+    then the method jumps back to its start.
+    the number of replaced calls is counted per method and in total.
+    """
+    def __init__(self) -> None:
+        # method -> number of tail calls
+        self.tail_calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {'tail_calls': 0}
+
+    def eliminate(self, function: ir.Function) -> int:
+        """
+        replace the tail calls of a function and return their number.
+        """
+        tail_calls: int = 0
+        for body in statement_bodies(function):
+            for i, statement in enumerate(body):
+                if isinstance(statement, ir.Return) and \
+                    self.is_self_call(function, statement.value):
+                    body[i] = self.tail_call(function, statement.value, statement)
+                    tail_calls += 1
+        # the last statements of a Void function (the function returns afterwards)
+        bodies: list[list[ir.Node]] = [function.body] if function.symbol.f_type is None else []
+        while bodies:
+            body: list[ir.Node] = bodies.pop()
+            if not body:
+                continue
+            statement: ir.Node = body[-1]
+            if self.is_self_call(function, statement):
+                body[-1] = self.tail_call(function, statement, statement)
+                tail_calls += 1
+            elif isinstance(statement, ir.Block):
+                bodies.append(statement.body)
+            elif isinstance(statement, ir.If):
+                bodies.append(statement.then_body)
+                if statement.else_body is not None:
+                    bodies.append(statement.else_body)
+        if function.body and isinstance(function.body[-1], ir.TailCall):
+            # the function does not need a final return
+            function.has_return = True
+        self.tail_calls[function.name] = tail_calls
+        self.counters['tail_calls'] += tail_calls
+        return tail_calls
+
+    def is_self_call(self, function: ir.Function, node: ir.Node) -> bool:
+        """
+        check if a node is a call of the function itself.
+        """
+        return isinstance(node, ir.Call) and node.function is function.symbol
+
+    def tail_call(self, function: ir.Function, call: ir.Call, statement: ir.Node) -> ir.TailCall:
+        """
+        create the tail call of a call (with the debug info of the replaced statement).
+        """
+        # the parameters are the first local variables
+        parameters: list[ir.Variable] = []
+        slot: int = 0
+        for v_name, v_type in function.symbol.parameters.items():
+            parameters.append(ir.Variable(v_name, v_type, slot))
+            slot += variable_width(v_type)
+        tail_call: ir.TailCall = ir.TailCall(call.function, parameters, call.arguments)
+        tail_call.debug = statement.debug
+        return tail_call
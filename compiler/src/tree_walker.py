@@ -0,0 +1,113 @@
+"""
+define the IterativeParseTreeWalker and IterativeVisitor
+"""
+
+import sys
+from contextlib import contextmanager
+from types import GeneratorType
+
+from antlr4.tree.Tree import ErrorNode, ParseTree, ParseTreeListener, ParseTreeVisitor, \
+    ParseTreeWalker, TerminalNode
+
+
+class IterativeParseTreeWalker(ParseTreeWalker):
+    """
+    walk a parse tree using an explicit stack (instead of one python frame per tree level),
+    so that deeply nested programs do not raise a RecursionError.
+    """
+    def walk(self, listener: ParseTreeListener, t: ParseTree) -> None:
+        # (node, True) marks the exit of a rule after all its children were walked
+        stack: list[tuple[ParseTree, bool]] = [(t, False)]
+        while stack:
+            node, exit_rule = stack.pop()
+            if exit_rule:
+                self.exitRule(listener, node)
+            elif isinstance(node, ErrorNode):
+                listener.visitErrorNode(node)
+            elif isinstance(node, TerminalNode):
+                listener.visitTerminal(node)
+            else:
+                self.enterRule(listener, node)
+                stack.append((node, True))
+                if node.children:
+                    stack.extend((child, False) for child in reversed(node.children))
+
+
+class IterativeVisitor(ParseTreeVisitor):
+    """
+    visit a parse tree using an explicit stack of generators.
+    visit-methods request the result of a child by yielding it: 'result = yield ctx.child()'
+    (instead of calling 'result = self.visit(ctx.child())'), methods without yield
+    simply return their result.
+    """
+    def visit(self, tree: ParseTree):
+        result = None
+        stack: list[GeneratorType] = []
+        node: ParseTree = tree
+        while True:
+            if node is not None:
+                frame = node.accept(self)
+                node = None
+                if isinstance(frame, GeneratorType):
+                    stack.append(frame)
+                    result = None
+                else:
+                    result = frame
+            if not stack:
+                return result
+            try:
+                # resume the parent with the result of the child, until it requests the next child
+                node = stack[-1].send(result)
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+
+    def visitChildren(self, node: ParseTree):
+        result = self.defaultResult()
+        for child in node.getChildren():
+            if not self.shouldVisitNextChild(node, result):
+                return result
+            child_result = yield child
+            result = self.aggregateResult(result, child_result)
+        return result
+
+
+def tree_text(tree: ParseTree) -> str:
+    """
+    get the text of a parse tree (like tree.getText(), but without recursion).
+    """
+    texts: list[str] = []
+    nodes: list[ParseTree] = [tree]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, TerminalNode):
+            texts.append(node.getText())
+        elif node.children:
+            nodes.extend(reversed(node.children))
+    return ''.join(texts)
+
+
+def release_tree(tree: ParseTree) -> None:
+    """
+    break the parent references of a (sub-)tree, so that it is freed by reference counting
+    as soon as it is not referenced anymore (instead of waiting for the cyclic garbage collector).
+    """
+    nodes: list[ParseTree] = [tree]
+    while nodes:
+        node = nodes.pop()
+        node.parentCtx = None
+        if not isinstance(node, TerminalNode) and node.children:
+            nodes.extend(node.children)
+
+
+@contextmanager
+def recursion_limit(limit: int):
+    """
+    temporarily raise the recursion limit (the generated Parser is recursive).
+    """
+    old_limit: int = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, limit))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(old_limit)
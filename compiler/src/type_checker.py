@@ -7,10 +7,12 @@ from antlr4.ParserRuleContext import ParserRuleContext
 try:
     from compiler.src.CoBaParser import CoBaParser
     from compiler.src.CoBaParserListener import CoBaParserListener
+    from compiler.src.error_listener import Diagnostic
     from compiler.src.type_checker_helper import ValidTypes, SymbolTable, FunctionSymbol
 except ModuleNotFoundError:
     from .CoBaParser import CoBaParser
     from .CoBaParserListener import CoBaParserListener
+    from .error_listener import Diagnostic
     from .type_checker_helper import ValidTypes, SymbolTable, FunctionSymbol
 
 
@@ -46,27 +48,40 @@ class TypeChecker(CoBaParserListener):
     - Assignements
     - Function return types
     """
-    def __init__(self, symbol_table: SymbolTable) -> None:
+    def __init__(self, symbol_table: SymbolTable, diagnostics: list[Diagnostic] = None,
+                 signatures: SymbolTable = None) -> None:
         self.symbol_table: SymbolTable = symbol_table
+        # the called functions are looked up in the signatures (default is the symbol table)
+        self.signatures: SymbolTable = signatures or symbol_table
+        # errors are collected instead of printed, if a list is given
+        self.diagnostics: list[Diagnostic] = diagnostics
         self.type_stack: TypeStack = TypeStack()
         self.current_function: FunctionSymbol = None
         self.has_errors: bool = False
 
     def err_print(self, ctx: ParserRuleContext, *args, **kwargs) -> None:
         """
-        print to stderr.
+        print to stderr (or collect the error).
         """
+        self.has_errors = True
+        if self.diagnostics is not None:
+            self.diagnostics.append(Diagnostic(ctx.start.line, ctx.start.column,
+                                               ' '.join(map(str, args))))
+            return
         print(f"line {ctx.start.line}:{ctx.start.column} ", end='', file=sys.stderr, **kwargs)
         print(*args, file=sys.stderr, flush=True, **kwargs)
-        self.has_errors = True
 
     def exitMain_function_header(self, ctx: CoBaParser.Main_function_headerContext) -> None:
         f_name: str = ctx.K_MAIN().getText()
         self.current_function = self.symbol_table.get_function(f_name)
+        self.type_stack = TypeStack()
 
     def exitFunction_header(self, ctx: CoBaParser.Function_headerContext) -> None:
         f_name: str = ctx.IDENTIFIER().getText()
         self.current_function = self.symbol_table.get_function(f_name)
+        # every function is checked on its own (types left by erroneous
+        # or called expressions of the previous function are dropped)
+        self.type_stack = TypeStack()
 
     def exitFunction_body(self, ctx: CoBaParser.Function_bodyContext) -> None:
         # check that the function has a return statement if its return type is not Void
@@ -87,20 +102,23 @@ class TypeChecker(CoBaParserListener):
     def exitFunction_call(self, ctx: CoBaParser.Function_callContext) -> None:
         f_name: str = (ctx.IDENTIFIER() or ctx.K_MAIN()).getText()
 
-        f_table: FunctionSymbol = self.symbol_table.get_function(f_name)
+        f_table: FunctionSymbol = self.signatures.get_function(f_name)
         if f_table is None:
             return self.err_print(ctx, f"unknown function called: '{f_name}'.")
 
+        parameter_types: tuple[str, ...] = f_table.signature.parameter_types
         argument_type_list: list[str] = []
         current_argument = ctx.function_argument()
         while current_argument is not None:
-            argument_type_list.insert(0, self.type_stack.pop())
+            argument_type_list.append(self.type_stack.pop())
             current_argument = current_argument.function_argument()
+        # the arguments were popped from the stack in reverse order
+        argument_type_list.reverse()
 
         # check that the given amount of arguments fits inside the parameter list of the function
-        if len(argument_type_list) > len(f_table.parameters):
+        if len(argument_type_list) > len(parameter_types):
             return self.err_print(ctx, f"too many arguments provided at function call: '{f_name}'.")
-        if len(argument_type_list) < len(f_table.parameters):
+        if len(argument_type_list) < len(parameter_types):
             return self.err_print(ctx, f"too few arguments provided at function call: '{f_name}'.")
 
         current_argument_count: int = 0
@@ -108,7 +126,7 @@ class TypeChecker(CoBaParserListener):
         # check for each argument if the type is compatible with the expected parameter type
         while current_argument is not None:
             a_type: str = argument_type_list[current_argument_count]
-            p_type: str = [*f_table.parameters.values()][current_argument_count]
+            p_type: str = parameter_types[current_argument_count]
             if p_type != a_type:
                 self.err_print(current_argument, f"wrong argument type: '{a_type}', " + \
                     f"expected: '{p_type}'.")
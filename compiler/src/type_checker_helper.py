@@ -2,6 +2,9 @@
 defines helpful utility for the typechecker/code-generator.
 """
 
+from typing import NamedTuple
+
+
 class ValidTypes:
     """
     define all valid types (like 'type_spec' in the Parser-Grammar)
@@ -12,6 +15,53 @@ class ValidTypes:
     String : str = 'String'
 
 
+# type -> JVM type descriptor (None is the return type of void functions)
+JVM_DESCRIPTORS: dict[str, str] = {
+    ValidTypes.Integer: 'I',
+    ValidTypes.Boolean: 'I',
+    ValidTypes.Float64: 'D',
+    ValidTypes.String: 'Ljava/lang/String;',
+    None: 'V',
+}
+# type -> number of occupied stack entries (and local variable slots)
+JVM_WIDTHS: dict[str, int] = {
+    ValidTypes.Integer: 1,
+    ValidTypes.Boolean: 1,
+    ValidTypes.Float64: 2,
+    ValidTypes.String: 1,
+    None: 0,
+}
+
+
+class FunctionSignature(NamedTuple):
+    """
+    define the (immutable) signature of a function
+    """
+    parameter_types: tuple[str, ...]
+    return_type: str
+    # the JVM method descriptor, e.g. '(ID)Ljava/lang/String;'
+    descriptor: str
+    # the stack entries taken by the arguments and pushed by the return value
+    argument_width: int
+    return_width: int
+
+    @classmethod
+    def of(cls, f_symbol: 'FunctionSymbol') -> 'FunctionSignature':
+        """
+        compute the signature of a function
+        """
+        parameter_types: tuple[str, ...] = tuple(f_symbol.parameters.values())
+        if f_symbol.f_name == 'main':
+            # the main method always takes the (unused) command line arguments
+            descriptor: str = '([Ljava/lang/String;)V'
+        else:
+            descriptor = '(' + ''.join(JVM_DESCRIPTORS[p_type] for p_type in parameter_types) + \
+                ')' + JVM_DESCRIPTORS[f_symbol.f_type]
+        return cls(parameter_types, f_symbol.f_type, descriptor,
+                   sum(JVM_WIDTHS[p_type] for p_type in parameter_types),
+                   JVM_WIDTHS[f_symbol.f_type])
+
+
 class FunctionSymbol:
     """
     define a function
@@ -22,6 +72,20 @@ class FunctionSymbol:
         # dictionaries are since Python >= 3.6 in order (important)
         self.parameters: dict[str, str] = {}
         self.local_variables: dict[str, str] = {}
+        # called function -> number of call sites (the call graph)
+        self.calls: dict[str, int] = {}
+        # number of operands (constants, variables and function calls) of the body
+        self.size: int = 0
+        self._signature: FunctionSignature = None
+
+    @property
+    def signature(self) -> FunctionSignature:
+        """
+        get the signature (computed once, see SymbolTable.finalise)
+        """
+        if self._signature is None:
+            self._signature = FunctionSignature.of(self)
+        return self._signature
 
     def add_parameter(self, p_name: str, p_type: str) -> bool:
         """
@@ -30,6 +94,7 @@ class FunctionSymbol:
         if p_name in self.parameters:
             return False
         self.parameters[p_name] = p_type
+        self._signature = None
         return self.add_local_variable(p_name, p_type)
 
     def add_local_variable(self, v_name: str, v_type: str) -> bool:
@@ -71,6 +136,13 @@ class SymbolTable:
         self.functions[f_name] = FunctionSymbol(f_name, f_type)
         return True
 
+    def finalise(self) -> None:
+        """
+        precompute the signatures of all functions (once all function headers are added)
+        """
+        for f_symbol in self.functions.values():
+            _ = f_symbol.signature
+
     def get_function(self, f_name: str) -> FunctionSymbol:
         """
         get a function by name
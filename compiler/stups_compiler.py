@@ -4,29 +4,46 @@ java -jar ./antlr-4.13.1-complete.jar -Dlanguage=Python3 ./compiler/grammar/CoBa
 python ./compiler/stups_compiler.py -compile test.jl
 """
 
+import os
 import sys
-from antlr4 import FileStream, CommonTokenStream, ParseTreeWalker
+from importlib import import_module
+from pathlib import Path
+from types import ModuleType
+from typing import IO
 
+# only lightweight modules are imported on startup,
+# the phases (and ANTLR) are imported when they are actually needed
 try: # package import (python -m compiler ...)
-    from compiler.src.CoBaLexer import CoBaLexer
-    from compiler.src.CoBaParser import CoBaParser
-    from compiler.src.arg_parser import ArgParser
-    from compiler.src.code_generator import CodeGenerator
-    from compiler.src.error_listener import ErrorListener
-    from compiler.src.liveness_analysis import LivenessAnalysis
-    from compiler.src.symbol_table_gen_listener import SymbolTableGenListener
-    from compiler.src.type_checker import TypeChecker
-    from compiler.src.type_checker_helper import SymbolTable
+    from compiler.src.arg_parser import ArgParser, CompileOptions
+    from compiler.src.compile_cache import CompileCache
+    from compiler.src.compile_stats import CompileStats
 except ModuleNotFoundError: # default import (python ./compiler/main.py ...)
-    from src.CoBaLexer import CoBaLexer
-    from src.CoBaParser import CoBaParser
-    from src.code_generator import CodeGenerator
-    from src.arg_parser import ArgParser
-    from src.error_listener import ErrorListener
-    from src.liveness_analysis import LivenessAnalysis
-    from src.symbol_table_gen_listener import SymbolTableGenListener
-    from src.type_checker import TypeChecker
-    from src.type_checker_helper import SymbolTable
+    from src.arg_parser import ArgParser, CompileOptions
+    from src.compile_cache import CompileCache
+    from src.compile_stats import CompileStats
+
+
+def import_src(module_name: str) -> ModuleType:
+    """
+    lazily import a module of the compiler (package import or default import).
+    """
+    try: # package import (python -m compiler ...)
+        return import_module(f"compiler.src.{module_name}")
+    except ModuleNotFoundError as exception: # default import (python ./compiler/main.py ...)
+        if exception.name not in ['compiler', 'compiler.src']:
+            raise
+        return import_module(f"src.{module_name}")
+
+
+def preload() -> None:
+    """
+    import all compiler phases (and therefor the generated Lexer and Parser) at once.
+    used by long-living worker processes.
+    """
+    for module_name in ['CoBaLexer', 'CoBaParser', 'error_listener', 'symbol_table_gen_listener',
+                        'type_checker', 'type_checker_helper', 'code_generator',
+                        'liveness_analysis', 'parser_state', 'compiler', 'class_writer']:
+        import_src(module_name)
 
 
 def exception_handler(exception_type: type, exception, traceback,
@@ -40,8 +57,6 @@ def exception_handler(exception_type: type, exception, traceback,
     except Exception:
         debug_hook(exception_type, exception, traceback)
 
-sys.excepthook = exception_handler
-
 
 def status_print(msg: str, *args, **kwargs) -> None:
     """
@@ -66,70 +81,249 @@ def debug_print(out, desc: str = '') -> None:
     print('====================\x1b[0m\n')
 
 
-def main() -> int:
+class AtomicOutput:
     """
-    main method - implements compiler
+    write an output file through a temporary file, which only replaces the output file
+    once the writing is finished (a failed compilation never leaves a truncated file).
     """
-    arg_parser: ArgParser = ArgParser()
-    arg_parser.parse()
-    status_print('reading file', arg_parser.input_file)
+    def __init__(self, output_file: Path, binary: bool = False) -> None:
+        self.output_file: Path = output_file
+        self.tmp_file: Path = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+        self.binary: bool = binary
+        self.file: IO = None
+        self.discarded: bool = False
+
+    def discard(self) -> None:
+        """
+        do not replace the output file (the temporary file is deleted).
+        """
+        self.discarded = True
+
+    def __enter__(self) -> 'AtomicOutput':
+        self.file = open(self.tmp_file, 'wb') if self.binary else \
+            open(self.tmp_file, 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, exception_type: type, exception, traceback) -> None:
+        self.file.close()
+        if exception_type is None and not self.discarded:
+            os.replace(self.tmp_file, self.output_file)
+        else:
+            self.tmp_file.unlink(missing_ok=True)
+
+
+def write_output(input_file: Path, output_file: Path, code: str,
+                 options: CompileOptions, stats: CompileStats) -> None:
+    """
+    write the generated Jasmin code (or the assembled class file).
+    """
+    status_print('writing file', output_file)
+    if not options.class_file:
+        with stats.phase('writing'), AtomicOutput(output_file) as output:
+            output.file.write(code)
+        return
+    ClassWriter: type = import_src('class_writer').ClassWriter
+    with stats.phase('assembling'):
+        class_file: bytes = ClassWriter(input_file.name).assemble(code)
+    with stats.phase('writing'), AtomicOutput(output_file, binary=True) as output:
+        output.file.write(class_file)
+
+
+def compile_file(input_file: Path, output_file: Path, options: CompileOptions) -> int:
+    """
+    run the compiler on a single file.
+    returns the exit code (1: parser-, 2: symbol table-, 3: type error)
+    """
+    stats: CompileStats = CompileStats(input_file, 'compile' if options.compile else 'liveness')
+    exit_code: int = 1
+    try:
+        exit_code = run_phases(input_file, output_file, options, stats)
+    finally:
+        if options.stats_file is not None:
+            stats.write(options.stats_file, exit_code)
+    return exit_code
+
+
+def run_phases(input_file: Path, output_file: Path, options: CompileOptions,
+               stats: CompileStats) -> int:
+    """
+    run all compiler phases and measure them.
+    """
+    status_print('reading file', input_file)
+    with stats.phase('reading'):
+        source: str = input_file.read_bytes().decode('utf-8')
+    stats.count('characters', len(source))
+
+    cache: CompileCache = CompileCache() if options.use_cache else None
+    cache_key: str = None
+    # the debug information can only be shown when actually compiling
+    if cache is not None and not options.debug:
+        with stats.phase('cache'):
+            cache_key = cache.key('file', options.compile,
+                                  output_file.stem if options.compile else '',
+                                  ','.join(sorted(options.disabled_optimizations)),
+                                  options.inline_size, source)
+            cache_entry: dict = cache.get(cache_key)
+        if cache_entry is not None:
+            stats.count('cache_hits', cache.hits)
+            status_print('using cached result.')
+            if options.compile:
+                write_output(input_file, output_file, cache_entry['code'], options, stats)
+                status_print('generating successful.')
+            else:
+                status_print('liveness result:')
+                print(cache_entry['liveness'], end='')
+            return 0
+
+    with stats.phase('importing'):
+        compiler_module: ModuleType = import_src('compiler')
+        Compiler: type = compiler_module.Compiler
+        CompileResult: type = compiler_module.CompileResult
+    parser_state = None
+    if cache is not None:
+        # reuse the ATN and DFA states of previous runs
+        with stats.phase('parser_state'):
+            parser_state = import_src('parser_state').ParserState(
+                import_src('CoBaLexer').CoBaLexer, import_src('CoBaParser').CoBaParser,
+                cache.cache_dir)
+            parser_state.load()
+
+    compiler: Compiler = Compiler(options.debug, cache, print_diagnostics=True,
+                                  lexer=options.lexer,
+                                  disabled_optimizations=options.disabled_optimizations,
+                                  inline_size=options.inline_size)
+    result: CompileResult = CompileResult()
 
     status_print('parsing...')
-    error_listener: ErrorListener = ErrorListener()
-    input_stream: FileStream = FileStream(arg_parser.input_file, encoding='utf-8')
-    lexer: CoBaLexer = CoBaLexer(input_stream)
-    stream: CommonTokenStream = CommonTokenStream(lexer)
-    parser: CoBaParser = CoBaParser(stream)
-    parser.removeErrorListeners()
-    parser.addErrorListener(error_listener)
-
-    tree: CoBaParser.MainContext = parser.main()
-    if error_listener.has_errors:
-        return 1
+    tree = compiler.parse(source, result, stats)
+    if options.stats_file is not None:
+        stats.count('parse_tree_nodes', stats.count_tree_nodes(tree))
+    if parser_state is not None:
+        with stats.phase('parser_state'):
+            parser_state.save()
+    if not result.success:
+        return result.exit_code
     status_print('parsing successful.')
 
     status_print('typechecking...')
-    symbol_table: SymbolTable = SymbolTable()
-    symbol_table_gen_listener: SymbolTableGenListener = SymbolTableGenListener(symbol_table)
-    type_checker: TypeChecker = TypeChecker(symbol_table)
-    walker: ParseTreeWalker = ParseTreeWalker()
-
-    walker.walk(symbol_table_gen_listener, tree)
-    if arg_parser.debug:
-        debug_print(symbol_table.functions, 'Symbol Table')
-    if symbol_table_gen_listener.has_errors:
-        return 2
-    walker.walk(type_checker, tree)
-    if type_checker.has_errors:
-        return 3
-    status_print('typechecking successful.')
-
-    if arg_parser.compile:
+    if options.compile and options.parallel_jobs is not None:
+        # only the symbol table is generated here,
+        # the functions are typechecked and generated by the worker processes
+        compiler.gen_symbol_table(tree, result, stats)
+        if options.debug:
+            debug_print(result.symbol_table.functions, 'Symbol Table')
+        if result.success:
+            ParallelCompiler: type = import_src('parallel_compiler').ParallelCompiler
+            parallel_compiler = ParallelCompiler(compiler, options.parallel_jobs)
+            if options.stream:
+                with AtomicOutput(output_file) as output:
+                    parallel_compiler.compile(tree, result, output_file.stem, stats, output.file)
+                    if not result.success:
+                        output.discard()
+            else:
+                parallel_compiler.compile(tree, result, output_file.stem, stats)
+        del tree
+        compiler.release()
+        if not result.success:
+            return result.exit_code
+        status_print('typechecking successful.')
         status_print('generating...')
-        code_generator: CodeGenerator = CodeGenerator(symbol_table,
-                                                    arg_parser.output_file.stem,
-                                                    arg_parser.debug)
-        code_generator.visit(tree)
-        status_print('writing file', arg_parser.output_file)
-        code_generator.generate(arg_parser.output_file)
+    else:
+        if options.debug:
+            # the symbol table is shown before the type checker runs
+            compiler.gen_symbol_table(tree, result, stats)
+            debug_print(result.symbol_table.functions, 'Symbol Table')
+            if result.success:
+                compiler.type_check(tree, result, stats)
+        else:
+            compiler.analyse_semantics(tree, result, stats)
+        if not result.success:
+            return result.exit_code
+        status_print('typechecking successful.')
+
+        program = compiler.lower(tree, result, stats)
+        # the back-end phases only use the IR, the parse tree can be garbage collected
+        del tree
+        compiler.release()
+        if options.compile:
+            status_print('generating...')
+            if options.stream:
+                # every method is written as soon as it is generated
+                status_print('writing file', output_file)
+                with AtomicOutput(output_file) as output:
+                    compiler.generate(program, result, output_file.stem, stats, output.file)
+            else:
+                compiler.generate(program, result, output_file.stem, stats)
+
+    if options.compile:
+        if not options.stream:
+            write_output(input_file, output_file, result.code, options, stats)
+        elif options.parallel_jobs is not None:
+            status_print('writing file', output_file)
         status_print('generating successful.')
+        # the streamed code is not kept in memory (only the methods are cached)
+        if cache_key is not None and not options.stream:
+            with stats.phase('cache'):
+                cache.put(cache_key, {'code': result.code})
     else:
         status_print('liveness...')
-        liveness_analysis: LivenessAnalysis = LivenessAnalysis(symbol_table)
-        liveness_analysis.visit(tree)
-        liveness_analysis.gen_interference_graph()
+        compiler.analyse_liveness(program, result, stats)
         status_print('liveness result:')
-        if arg_parser.debug:
-            debug_print(liveness_analysis.control_flow_graphs,
+        if options.debug:
+            debug_print(result.control_flow_graphs,
                         'Control Flow Graphs')
-        for f_name, ri_graph in liveness_analysis.register_interference_graphs.items():
-            print('\nFunction:', f_name)
-            print('Registers:', ri_graph.min_registers)
-            print(ri_graph)
+        liveness_result: str = ''
+        for f_name, ri_graph in result.interference_graphs.items():
+            liveness_result += f"\nFunction: {f_name}\n"
+            liveness_result += f"Registers: {ri_graph.min_registers}\n"
+            liveness_result += f"{ri_graph}\n"
+        print(liveness_result, end='')
+        if cache_key is not None:
+            with stats.phase('cache'):
+                cache.put(cache_key, {'liveness': liveness_result})
 
+    if cache is not None:
+        stats.count('cache_hits', cache.hits)
+        stats.count('cache_misses', cache.misses)
     return 0
 
 
+def main(args: list[str] = None) -> int:
+    """
+    main method - implements compiler
+    """
+    # only the cli hides the traceback (the Compiler can be used as a library)
+    sys.excepthook = exception_handler
+    arg_parser: ArgParser = ArgParser()
+    arg_parser.parse(args)
+
+    if arg_parser.server is not None:
+        CompileServer: type = import_src('compile_server').CompileServer
+        compile_server: CompileServer = CompileServer(arg_parser.server,
+                                                      arg_parser.jobs,
+                                                      arg_parser.queue_size)
+        return compile_server.run()
+
+    if arg_parser.build:
+        BuildCompiler: type = import_src('build_compiler').BuildCompiler
+        build_compiler: BuildCompiler = BuildCompiler(arg_parser.input_files,
+                                                      arg_parser.output_file,
+                                                      arg_parser.get_options(),
+                                                      arg_parser.jobs)
+        return build_compiler.run()
+
+    if arg_parser.batch:
+        BatchCompiler: type = import_src('batch_compiler').BatchCompiler
+        batch_compiler: BatchCompiler = BatchCompiler(arg_parser.input_files,
+                                                      arg_parser.output_file,
+                                                      arg_parser.get_options(),
+                                                      arg_parser.jobs)
+        return batch_compiler.run()
+
+    return compile_file(arg_parser.input_file, arg_parser.output_file,
+                        arg_parser.get_options())
+
+
 if __name__ == '__main__':
     sys.exit(main())
 